@@ -19,9 +19,10 @@ import json
 import csv
 import requests
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 
+from service_runtime import ServiceHandler, ServiceServer
+
 # Config
 MANUAL_HUNTER_URL = "http://localhost:8090/ask"
 LOG_FILE = Path("/root/jarvis-workspace/projects/shoptalk/alarm_log.csv")
@@ -181,7 +182,7 @@ def triage_alarm(alarm: str, equipment: str, note: str) -> dict:
         "timestamp": datetime.now().isoformat()
     }
 
-class TriageHandler(BaseHTTPRequestHandler):
+class TriageHandler(ServiceHandler):
     def do_POST(self):
         if self.path == "/triage":
             content_length = int(self.headers.get('Content-Length', 0))
@@ -248,7 +249,7 @@ class TriageHandler(BaseHTTPRequestHandler):
 
 if __name__ == "__main__":
     port = 8091
-    server = HTTPServer(('0.0.0.0', port), TriageHandler)
+    server = ServiceServer(('0.0.0.0', port), TriageHandler)
     print(f"🚨 Alarm Triage Service running on http://localhost:{port}")
     print(f"Test: curl http://localhost:{port}/triage -d '{{\"alarm\": \"F0001\", \"equipment\": \"Siemens V20\", \"note\": \"drive won't start\"}}'")
     server.serve_forever()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Code Index - Persistent incremental file analysis for the Cartographer
+
+Keeps one analysis per .py file on disk, keyed by path and validated by
+(mtime, size, content hash):
+
+- stat unchanged -> cached analysis, file not even opened
+- stat changed, hash unchanged (touch, checkout) -> cached analysis
+- content changed -> re-analyzed (with the hash already computed); many
+  dirty files go to a long-lived forkserver process pool
+
+So /scan after the first run, and every /map the Conductor sends after a
+/scan, costs one stat() per file instead of a read + md5 + ast.parse.
+
+5-Second Test:
+python3 code_index.py /root/jarvis-workspace/sandbox/working/shoptalk
+"""
+
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from state_store import atomic_write_json
+
+# Bump when the analysis format changes: drops every cached entry
+INDEX_VERSION = 1
+
+# Fewer dirty files than this are analyzed in-process (pool startup isn't free)
+PARALLEL_MIN_FILES = 8
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+def python_files(root: Path) -> List[Path]:
+    """All .py files under root, skipping __pycache__."""
+    return [p for p in root.rglob("*.py") if "__pycache__" not in p.parts]
+
+
+class CodeIndex:
+    """
+    On-disk index of per-file analyses.
+
+    analyze must be a module-level function ((path, content md5) -> dict) so
+    it can run in worker processes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        analyze: Callable[[Path, Optional[str]], dict],
+        workers: Optional[int] = None
+    ):
+        self.path = Path(path)
+        self.analyze = analyze
+        self.workers = workers or os.cpu_count() or 2
+        self._lock = threading.RLock()
+        self._files: Dict[str, dict] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self._files = data.get("files", {})
+            except ValueError:
+                pass  # Corrupt index: rebuilt on the next scan
+
+    def _save(self) -> None:
+        atomic_write_json(self.path, {"version": INDEX_VERSION, "files": self._files})
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Worker pool, started on first use and kept for later scans.
+
+        Scans run on ServiceServer request threads, and fork() from a
+        threaded process can copy a held lock into the child, so workers
+        come from a forkserver (spawn where that's unavailable).
+        """
+        with self._lock:
+            if self._pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                atexit.register(self.close)
+            return self._pool
+
+    def _analyze_all(self, dirty: List[Tuple[Path, Optional[str]]]) -> List[dict]:
+        if len(dirty) < PARALLEL_MIN_FILES or self.workers < 2:
+            return [self.analyze(p, digest) for p, digest in dirty]
+        paths, digests = zip(*dirty)
+        return list(self._get_pool().map(self.analyze, paths, digests, chunksize=4))
+
+    def close(self) -> None:
+        """Shut down the worker pool (registered with atexit on first use)."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def scan(self, root: Path) -> Tuple[List[Tuple[Path, dict]], dict]:
+        """
+        Bring the index up to date for every .py file under root.
+
+        Returns:
+            ([(path, analysis), ...] in path order, stats)
+        """
+        root = Path(root)
+        started = time.perf_counter()
+        stats = {"files": 0, "cached": 0, "rehashed": 0, "analyzed": 0, "removed": 0}
+
+        with self._lock:
+            present = {}
+            dirty: List[Tuple[Path, dict]] = []
+
+            for file_path in sorted(python_files(root)):
+                key = str(file_path)
+                try:
+                    st = file_path.stat()
+                except FileNotFoundError:
+                    continue
+                stamp = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+                present[key] = file_path
+                entry = self._files.get(key)
+
+                if entry and entry["mtime_ns"] == stamp["mtime_ns"] and entry["size"] == stamp["size"]:
+                    stats["cached"] += 1
+                    continue
+
+                try:
+                    digest = content_hash(file_path.read_bytes())
+                except OSError:
+                    digest = None
+                stamp["hash"] = digest
+
+                if entry and digest is not None and entry.get("hash") == digest:
+                    entry.update(stamp)
+                    stats["rehashed"] += 1
+                else:
+                    dirty.append((file_path, stamp))
+
+            if dirty:
+                analyses = self._analyze_all([(p, stamp["hash"]) for p, stamp in dirty])
+                for (file_path, stamp), analysis in zip(dirty, analyses):
+                    self._files[str(file_path)] = dict(stamp, analysis=analysis)
+                stats["analyzed"] = len(dirty)
+
+            # Files deleted since the last scan
+            prefix = str(root).rstrip(os.sep) + os.sep
+            gone = [k for k in self._files if k.startswith(prefix) and k not in present]
+            for key in gone:
+                del self._files[key]
+            stats["removed"] = len(gone)
+
+            if dirty or gone or stats["rehashed"]:
+                self._save()
+
+            results = [(path, dict(self._files[key]["analysis"])) for key, path in present.items()]
+
+        stats["files"] = len(results)
+        stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return results, stats
+
+
+__all__ = [
+    "CodeIndex",
+    "content_hash",
+    "python_files",
+]
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    from the_cartographer import analyze_python_file
+
+    root = Path(sys.argv[1] if len(sys.argv) > 1 else ".")
+    with tempfile.TemporaryDirectory() as tmp:
+        index = CodeIndex(Path(tmp) / "index.json", analyze_python_file)
+        for label in ("cold", "warm"):
+            _, stats = index.scan(root)
+            print(f"{label}: {stats}")
@@ -8,7 +8,8 @@ Test: curl http://localhost:8090/ask -d '{"question": "How do I reset a Siemens
 
 import os
 import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from service_runtime import ServiceHandler, ServiceServer
 
 # Pre-loaded manual knowledge (simulating RAG)
 MANUAL_KNOWLEDGE = {
@@ -98,7 +99,7 @@ def generate_response(question: str) -> str:
     
     return response
 
-class AgentHandler(BaseHTTPRequestHandler):
+class AgentHandler(ServiceHandler):
     def do_POST(self):
         if self.path == "/ask":
             content_length = int(self.headers.get('Content-Length', 0))
@@ -153,7 +154,7 @@ class AgentHandler(BaseHTTPRequestHandler):
 
 if __name__ == "__main__":
     port = 8090
-    server = HTTPServer(('0.0.0.0', port), AgentHandler)
+    server = ServiceServer(('0.0.0.0', port), AgentHandler)
     print(f"🤖 Manual Hunter Agent running on http://localhost:{port}")
     print(f"Test: curl http://localhost:{port}/ask -d '{{\"question\": \"How do I reset Siemens V20 fault F0001?\"}}'")
     server.serve_forever()
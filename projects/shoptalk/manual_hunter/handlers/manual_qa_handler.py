@@ -41,6 +41,11 @@ import asyncpg
 from rivet_pro.core.services.manual_qa_service import ManualQAService
 from rivet_pro.core.services.manual_conversation_service import ManualConversationService
 
+from ..services.answer_cache import AnswerCache, CachedAnswer
+from ..services.context_assembler import estimate_tokens
+from ..services.manual_rag_service import ManualRAGService, RAGResult
+from ..services.token_reporter import TokenUsageReporter
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,6 +61,8 @@ class ManualQAHandler:
     Manages:
     - Q&A sessions per user
     - Question routing to ManualQAService
+    - Answer cache keyed on the chunks the answer is built from (context is
+      retrieved once and passed to ask(); repeat questions skip the LLM)
     - Session persistence via ManualConversationService
     """
 
@@ -64,21 +71,39 @@ class ManualQAHandler:
     MANUAL_ID_KEY = "manual_qa_manual_id"
     IN_QA_MODE_KEY = "in_manual_qa_mode"
 
-    def __init__(self, db_pool: asyncpg.Pool, bot=None):
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        bot=None,
+        answer_cache: Optional[AnswerCache] = None,
+        token_reporter: Optional[TokenUsageReporter] = None
+    ):
         """
         Initialize handler.
 
         Args:
             db_pool: Database connection pool
             bot: Optional TelegramBot instance for shared state
+            answer_cache: Answer cache (in-memory, 6h TTL if None)
+            token_reporter: Reports context tokens to the Watchman (local
+                Watchman if None)
         """
         self.db_pool = db_pool
         self.bot = bot
         self.qa_service = ManualQAService(db_pool)
         self.conversation_service = ManualConversationService(db_pool)
+        self.token_reporter = token_reporter or TokenUsageReporter()
+        self.rag_service = ManualRAGService(db_pool, token_reporter=self.token_reporter)
+        # Share with ChunkIngestionPipeline(answer_cache=...) so re-ingested
+        # manuals drop their answers
+        self.answer_cache = answer_cache or AnswerCache()
 
         logger.info("ManualQAHandler initialized")
 
+    async def close(self) -> None:
+        """Send pending token usage to the Watchman. Call on shutdown."""
+        await self.rag_service.close()
+
     def register_handlers(self, application: Application) -> None:
         """
         Register command handlers with the Telegram application.
@@ -196,13 +221,42 @@ class ManualQAHandler:
                     f"Started manual QA session | user={user.id} | session={session_id}"
                 )
 
-            # Ask the question
-            response = await self.qa_service.ask(
-                query=query,
-                manual_id=target_manual_id,
-                session_id=session_id,
-                user_id=user.id
-            )
+            # Retrieve once: the chunks are both the cache key and the answer's context
+            retrieved = await self._retrieve(query, target_manual_id)
+            chunk_ids = [c.chunk_id for c in retrieved.chunks] if retrieved else []
+            context_tokens = retrieved.query_tokens_used if retrieved else 0
+
+            answer = self.answer_cache.get(target_manual_id, chunk_ids, query) if chunk_ids else None
+            cache_hit = answer is not None
+
+            if not cache_hit:
+                # Ask the question (with the context we already retrieved)
+                response = await self.qa_service.ask(
+                    query=query,
+                    manual_id=target_manual_id,
+                    session_id=session_id,
+                    user_id=user.id,
+                    retrieved_context=retrieved
+                )
+                answer = CachedAnswer(
+                    answer=response.answer,
+                    confidence=response.confidence,
+                    sources_used=response.sources_used,
+                    model_used=response.model_used,
+                    citations=[
+                        {"page": c.page, "section": c.section}
+                        for c in response.citations
+                    ],
+                    cost_usd=response.cost_usd,
+                    tokens=(
+                        getattr(response, "tokens_used", 0)
+                        or context_tokens + estimate_tokens(query) + estimate_tokens(response.answer)
+                    )
+                )
+                if chunk_ids and answer.sources_used:
+                    self.answer_cache.set(target_manual_id, chunk_ids, query, answer)
+
+            cost_usd = 0.0 if cache_hit else answer.cost_usd
 
             # Persist messages
             await self.conversation_service.add_message(
@@ -213,35 +267,28 @@ class ManualQAHandler:
             await self.conversation_service.add_message(
                 session_id=session_id,
                 role="assistant",
-                content=response.answer,
-                citations=[
-                    {"page": c.page, "section": c.section}
-                    for c in response.citations
-                ],
-                confidence=response.confidence,
-                cost_usd=response.cost_usd,
-                model_used=response.model_used,
-                rag_chunks_used=response.sources_used
+                content=answer.answer,
+                citations=answer.citations,
+                confidence=answer.confidence,
+                cost_usd=cost_usd,
+                model_used=answer.model_used,
+                rag_chunks_used=answer.sources_used
             )
 
             # Log analytics
-            await self.conversation_service.log_query_analytics(
-                manual_id=target_manual_id,
-                query_text=query,
-                response_confidence=response.confidence,
-                sources_found=response.sources_used
-            )
+            await self._log_query_analytics(target_manual_id, query, answer, cache_hit)
 
             # Format response
-            confidence_emoji = self._get_confidence_emoji(response.confidence)
-            answer_text = f"{response.answer}"
+            confidence_emoji = self._get_confidence_emoji(answer.confidence)
+            answer_text = f"{answer.answer}"
 
             # Add metadata footer
             footer = (
                 f"\n\n---\n"
-                f"{confidence_emoji} Confidence: {response.confidence:.0%} | "
-                f"Sources: {response.sources_used}\n"
-                f"_Model: {response.model_used} | Cost: ${response.cost_usd:.4f}_"
+                f"{confidence_emoji} Confidence: {answer.confidence:.0%} | "
+                f"Sources: {answer.sources_used}\n"
+                f"_Model: {answer.model_used} | Cost: ${cost_usd:.4f}"
+                f"{' (cached)' if cache_hit else ''}_"
             )
 
             full_response = answer_text + footer
@@ -264,8 +311,8 @@ class ManualQAHandler:
                 )
 
             logger.info(
-                f"Manual QA response | user={user.id} | "
-                f"confidence={response.confidence:.2f} | cost=${response.cost_usd:.4f}"
+                f"Manual QA response | user={user.id} | cache_hit={cache_hit} | "
+                f"confidence={answer.confidence:.2f} | cost=${cost_usd:.4f}"
             )
 
         except Exception as e:
@@ -373,6 +420,13 @@ class ManualQAHandler:
                         f"{s.status}\n"
                     )
 
+            cache = self.answer_cache.stats()
+            stats_text += (
+                f"\n*Answer Cache:* {cache['answer_cache_hits']} hits / "
+                f"{cache['answer_cache_misses']} misses | "
+                f"~{cache['answer_cache_tokens_saved']} tokens saved\n"
+            )
+
             await update.message.reply_text(stats_text, parse_mode="Markdown")
 
         except Exception as e:
@@ -382,6 +436,44 @@ class ManualQAHandler:
                 parse_mode="Markdown"
             )
 
+    async def _retrieve(self, query: str, manual_id: Optional[UUID]) -> Optional[RAGResult]:
+        """
+        Retrieve the question's context once, for ask() and the cache key.
+
+        Returns:
+            The RAG result, or None if retrieval fails (ask() then retrieves
+            on its own and the answer is not cached)
+        """
+        try:
+            return await self.rag_service.retrieve_context(query=query, manual_id=manual_id)
+        except Exception as e:
+            logger.warning(f"Manual QA retrieval failed | error={e}")
+            return None
+
+    async def _log_query_analytics(
+        self,
+        manual_id: Optional[UUID],
+        query: str,
+        answer: CachedAnswer,
+        cache_hit: bool
+    ) -> None:
+        """Log the query, with answer cache hit and saved tokens, to query analytics."""
+        stats = self.answer_cache.stats()
+        logger.info(
+            f"Manual QA answer cache | hit={cache_hit} | "
+            f"hits={stats['answer_cache_hits']} | misses={stats['answer_cache_misses']} | "
+            f"tokens_saved={stats['answer_cache_tokens_saved']}"
+        )
+
+        await self.conversation_service.log_query_analytics(
+            manual_id=manual_id,
+            query_text=query,
+            response_confidence=answer.confidence,
+            sources_found=answer.sources_used,
+            cache_hit=cache_hit,
+            tokens_saved=answer.tokens if cache_hit else 0
+        )
+
     def _get_confidence_emoji(self, confidence: float) -> str:
         """Get emoji indicator for confidence level."""
         if confidence >= 0.8:
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Chunker Benchmark
+
+Chunks a synthetic 2,000-page manual with the current PDFChunkerService and
+with a frozen copy of the previous (quadratic) implementation, asserts the
+chunks are identical, and prints timings.
+
+Usage: python scripts/benchmark_chunker.py [--pages 2000] [--seed 7]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Add project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.pdf_chunker_service import ManualChunk, PDFChunkerService, SectionBoundary
+
+
+class LegacyChunker(PDFChunkerService):
+    """Previous chunk assembly: += concatenation and linear scans."""
+
+    def _combine_pages(
+        self,
+        pages: List[Tuple[int, str]]
+    ) -> Tuple[str, List[Tuple[int, int]]]:
+        full_text = ""
+        page_map = []
+
+        for page_num, text in pages:
+            page_map.append((page_num, len(full_text)))
+            full_text += text + "\n\n"
+
+        return full_text, page_map
+
+    def _create_overlapping_chunks(
+        self,
+        text: str,
+        sections: List[SectionBoundary],
+        page_map: List[Tuple[int, int]]
+    ) -> List[ManualChunk]:
+        chunks = []
+        position = 0
+        chunk_index = 0
+        text_len = len(text)
+
+        while position < text_len:
+            chunk_start = position
+            chunk_end = min(position + self.chunk_chars, text_len)
+
+            if chunk_end < text_len:
+                search_start = chunk_end - int(self.chunk_chars * 0.2)
+                sentence_end = self._find_sentence_boundary(
+                    text, search_start, chunk_end + 100
+                )
+                if sentence_end > search_start:
+                    chunk_end = sentence_end
+
+            content = text[chunk_start:chunk_end].strip()
+
+            if len(content) < self.min_chunk_chars:
+                position = chunk_end
+                continue
+
+            page_num = self._get_page_for_position(chunk_start, page_map)
+            section_title = self._get_section_for_position(chunk_start, sections)
+
+            chunks.append(ManualChunk(
+                content=content,
+                page_number=page_num,
+                chunk_index=chunk_index,
+                section_title=section_title,
+                char_start=chunk_start,
+                char_end=chunk_end
+            ))
+            chunk_index += 1
+
+            position = chunk_end - self.overlap_chars
+            if position <= chunk_start:
+                position = chunk_end
+
+        return chunks
+
+    def _find_sentence_boundary(self, text: str, start: int, end: int, sentence_ends=None) -> int:
+        search_text = text[start:end]
+
+        matches = list(re.finditer(r'[.!?](?:\s|$)', search_text))
+        if matches:
+            return start + matches[-1].end()
+
+        newline_pos = search_text.rfind('\n')
+        if newline_pos > 0:
+            return start + newline_pos + 1
+
+        return end
+
+    def _get_page_for_position(self, position: int, page_map, page_starts=None) -> int:
+        page_num = 1
+        for pn, char_start in page_map:
+            if char_start <= position:
+                page_num = pn
+            else:
+                break
+        return page_num
+
+    def _get_section_for_position(self, position: int, sections, section_starts=None) -> Optional[str]:
+        current_section = None
+        for section in sections:
+            if section.char_start <= position:
+                current_section = section.title
+            else:
+                break
+        return current_section
+
+
+WORDS = (
+    "drive motor fault parameter reset inverter voltage current frequency "
+    "terminal wiring install check ensure before power supply output input "
+    "control panel display setting value default range operation"
+).split()
+
+
+def synthetic_pages(count: int, seed: int) -> List[Tuple[int, str]]:
+    """Manual-like pages: numbered headings, caps headings, fault codes, specs."""
+    rng = random.Random(seed)
+    pages = []
+
+    for page_num in range(1, count + 1):
+        lines = []
+        if page_num % 3 == 0:
+            lines.append(f"{page_num // 3}.{rng.randint(1, 9)} Parameter Settings For Group {page_num}")
+        if page_num % 17 == 0:
+            lines.append("TROUBLESHOOTING AND FAULT CODES")
+
+        for _ in range(rng.randint(8, 20)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(6, 18))]
+            if rng.random() < 0.2:
+                words.append(f"F{rng.randint(1000, 9999)}")
+            if rng.random() < 0.2:
+                words.append(f"{rng.choice([24, 230, 400])} V")
+            end = rng.choice([".", ".", ".", "!", "?", ":", ""])
+            lines.append(" ".join(words).capitalize() + end)
+
+        pages.append((page_num, "\n".join(lines)))
+
+    return pages
+
+
+def run(chunker: PDFChunkerService, pages) -> Tuple[float, float, List[ManualChunk]]:
+    """
+    Returns (assembly seconds, total seconds, chunks).
+
+    Assembly covers the code paths that changed: _combine_pages and
+    _create_overlapping_chunks (section detection is timed only in total).
+    """
+    start = time.perf_counter()
+    full_text, page_map = chunker._combine_pages(pages)
+    assembly = time.perf_counter() - start
+
+    sections = chunker._detect_sections(full_text)
+
+    start = time.perf_counter()
+    chunker._create_overlapping_chunks(full_text, sections, page_map)
+    assembly += time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = chunker._chunk_pages(pages)
+    return assembly, time.perf_counter() - start, chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    pages = synthetic_pages(args.pages, args.seed)
+    print(f"Synthetic manual: {len(pages)} pages, {sum(len(t) for _, t in pages):,} chars")
+
+    legacy_assembly, legacy_total, legacy_chunks = run(LegacyChunker(), pages)
+    current_assembly, current_total, current_chunks = run(PDFChunkerService(), pages)
+
+    assert len(current_chunks) == len(legacy_chunks), \
+        f"chunk count differs: {len(current_chunks)} != {len(legacy_chunks)}"
+    for old, new in zip(legacy_chunks, current_chunks):
+        assert old == new, f"chunk {old.chunk_index} differs"
+
+    print(f"  chunks:  {len(current_chunks)} (identical)")
+    print(f"  assembly (combine + overlapping chunks):")
+    print(f"    legacy:  {legacy_assembly:.3f}s")
+    print(f"    current: {current_assembly:.3f}s ({legacy_assembly / current_assembly:.1f}x)")
+    print(f"  total (incl. sections + keywords):")
+    print(f"    legacy:  {legacy_total:.3f}s")
+    print(f"    current: {current_total:.3f}s ({legacy_total / current_total:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+pgvector Encoding Benchmark
+
+Compares the text literal ('[0.1,0.2,...]' + $1::vector) and binary
+(register_vector_codec) encodings of query vectors.
+
+- Always: client-side encode cost per vector
+- With DATABASE_URL set: end-to-end `SELECT $1::vector` round-trips on a
+  text pool and a binary pool (measures server-side parsing too)
+
+Usage: python scripts/benchmark_vector_codec.py [--dims 384 768 1024] [--iterations 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from array import array
+from pathlib import Path
+
+# Add project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.pgvector_codec import (
+    decode_vector,
+    encode_vector,
+    register_vector_codec,
+    vector_literal,
+)
+
+
+def per_call_us(fn, arg, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def bench_encoding(dims, iterations: int) -> None:
+    print("Client-side encoding (µs per vector)")
+    print(f"  {'dim':>6} {'text':>10} {'binary':>10} {'speedup':>8} {'text B':>8} {'bin B':>8}")
+
+    for dim in dims:
+        embedding = [random.uniform(-1, 1) for _ in range(dim)]
+
+        # Round-trip check: binary is exact at float32 precision
+        assert list(decode_vector(encode_vector(embedding))) == list(array('f', embedding))
+
+        text_us = per_call_us(vector_literal, embedding, iterations)
+        binary_us = per_call_us(encode_vector, embedding, iterations)
+
+        print(
+            f"  {dim:>6} {text_us:>10.1f} {binary_us:>10.1f} {text_us / binary_us:>7.1f}x "
+            f"{len(vector_literal(embedding)):>8} {len(encode_vector(embedding)):>8}"
+        )
+
+
+async def bench_round_trips(dsn: str, dims, iterations: int) -> None:
+    import asyncpg
+
+    text_pool = await asyncpg.create_pool(dsn, min_size=1, max_size=1)
+    binary_pool = await asyncpg.create_pool(dsn, min_size=1, max_size=1, init=register_vector_codec)
+
+    print(f"\nRound-trips: SELECT $1::vector ({iterations} queries, µs per query)")
+    print(f"  {'dim':>6} {'text':>10} {'binary':>10} {'speedup':>8}")
+
+    try:
+        for dim in dims:
+            embedding = [random.uniform(-1, 1) for _ in range(dim)]
+            timings = []
+
+            for pool, param in (
+                (text_pool, lambda: vector_literal(embedding)),
+                (binary_pool, lambda: array('f', embedding)),
+            ):
+                async with pool.acquire() as conn:
+                    stmt = await conn.prepare("SELECT $1::vector IS NOT NULL")
+                    start = time.perf_counter()
+                    for _ in range(iterations):
+                        await stmt.fetchval(param())
+                    timings.append((time.perf_counter() - start) * 1e6 / iterations)
+
+            print(f"  {dim:>6} {timings[0]:>10.1f} {timings[1]:>10.1f} {timings[0] / timings[1]:>7.1f}x")
+    finally:
+        await text_pool.close()
+        await binary_pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dims', type=int, nargs='+', default=[384, 768, 1024])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    bench_encoding(args.dims, args.iterations)
+
+    dsn = os.environ.get('DATABASE_URL')
+    if dsn:
+        asyncio.run(bench_round_trips(dsn, args.dims, args.iterations // 4))
+    else:
+        print("\n(Set DATABASE_URL to also benchmark database round-trips)")
+
+
+if __name__ == '__main__':
+    main()
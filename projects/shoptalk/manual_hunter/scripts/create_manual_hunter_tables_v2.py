@@ -123,6 +123,82 @@ def create_tables():
         """)
         print("   [OK] Indexes created\n")
 
+        # Create manual_url_verdicts table (cached LLM URL-validation verdicts)
+        print("[*] Creating manual_url_verdicts table...")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS manual_url_verdicts (
+                cache_key CHAR(64) PRIMARY KEY,
+                url TEXT NOT NULL,
+                manufacturer VARCHAR(255) NOT NULL,
+                model VARCHAR(255) NOT NULL,
+                prompt_version VARCHAR(50) NOT NULL,
+                verdict JSONB NOT NULL,
+                is_positive BOOLEAN NOT NULL,
+                created_at TIMESTAMP DEFAULT NOW(),
+                expires_at TIMESTAMPTZ NOT NULL
+            );
+        """)
+        # Tables created with a naive expires_at held UTC (datetime.utcnow())
+        cur.execute("""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'manual_url_verdicts'
+                      AND column_name = 'expires_at'
+                      AND data_type = 'timestamp without time zone'
+                ) THEN
+                    ALTER TABLE manual_url_verdicts
+                        ALTER COLUMN expires_at TYPE TIMESTAMPTZ
+                        USING expires_at AT TIME ZONE 'UTC';
+                END IF;
+            END $$;
+        """)
+        print("   [OK] manual_url_verdicts table created")
+
+        print("   [*] Creating indexes...")
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_manual_url_verdicts_expires
+                ON manual_url_verdicts(expires_at);
+        """)
+        print("   [OK] Indexes created\n")
+
+        # Create manual_pages table (page fingerprints for incremental re-ingest)
+        print("[*] Creating manual_pages table...")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS manual_pages (
+                manual_id UUID NOT NULL,
+                page_number INTEGER NOT NULL,
+                content_sha256 CHAR(64),
+                text TEXT NOT NULL DEFAULT '',
+                updated_at TIMESTAMP DEFAULT NOW(),
+                PRIMARY KEY (manual_id, page_number)
+            );
+        """)
+        print("   [OK] manual_pages table created")
+
+        # Chunk checksums let re-ingest keep unchanged chunk rows;
+        # GIN indexes serve hybrid (keyword + vector) retrieval
+        print("[*] Adding manual_chunks checksum and keyword/full-text indexes...")
+        cur.execute("""
+            DO $$
+            BEGIN
+                IF to_regclass('public.manual_chunks') IS NOT NULL THEN
+                    ALTER TABLE manual_chunks
+                        ADD COLUMN IF NOT EXISTS content_sha256 CHAR(64);
+                    CREATE INDEX IF NOT EXISTS idx_manual_chunks_checksum
+                        ON manual_chunks(manual_id, content_sha256);
+
+                    -- Hybrid retrieval: exact code lookups and full-text search
+                    CREATE INDEX IF NOT EXISTS idx_manual_chunks_keywords
+                        ON manual_chunks USING GIN (keywords);
+                    CREATE INDEX IF NOT EXISTS idx_manual_chunks_fts
+                        ON manual_chunks USING GIN (to_tsvector('english', content));
+                END IF;
+            END $$;
+        """)
+        print("   [OK] manual_chunks updated\n")
+
         # Commit all changes
         conn.commit()
 
@@ -143,7 +219,7 @@ def create_tables():
 
         # Show column counts
         print("\n[*] Table schemas:")
-        for table_name in ['manual_cache', 'manual_requests']:
+        for table_name in ['manual_cache', 'manual_requests', 'manual_url_verdicts', 'manual_pages']:
             cur.execute("""
                 SELECT COUNT(*)
                 FROM information_schema.columns
@@ -161,6 +237,8 @@ def create_tables():
         print("\nTables created:")
         print("  - manual_cache (equipment manual cache)")
         print("  - manual_requests (human queue for failed searches)")
+        print("  - manual_url_verdicts (cached LLM URL verdicts)")
+        print("  - manual_pages (page fingerprints for incremental re-ingest)")
         print("\nNext steps:")
         print("  1. Configure DeepSeek credential in n8n")
         print("  2. Import Manual Hunter workflow JSON")
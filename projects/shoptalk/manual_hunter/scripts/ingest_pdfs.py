@@ -2,7 +2,10 @@
 """
 Batch PDF Ingestion Script
 
-Directly processes PDFs without Redis queue.
+Directly processes PDFs without Redis queue. URLs are processed
+concurrently (INGEST_CONCURRENCY, default 3) so downloads overlap with
+extraction and embedding of other manuals.
+
 Usage: python scripts/ingest_pdfs.py
 """
 
@@ -68,34 +71,41 @@ async def main():
     print("  KB Batch Ingestion")
     print("=" * 60)
 
+    concurrency = int(os.environ.get('INGEST_CONCURRENCY', '3'))
+
     worker = KBIngestionWorker()
     worker.db_pool = await asyncpg.create_pool(
         os.environ['DATABASE_URL'],
         min_size=1,
-        max_size=3
+        max_size=concurrency + 1
     )
 
     # Count before
     before = await worker.db_pool.fetchval("SELECT COUNT(*) FROM knowledge_atoms")
     print(f"\nAtoms before: {before}")
-    print(f"URLs to process: {len(PDF_URLS)}\n")
-
-    total_atoms = 0
-    success_count = 0
-
-    for i, url in enumerate(PDF_URLS, 1):
-        print(f"\n[{i}/{len(PDF_URLS)}] {url[:60]}...")
-
-        try:
-            success, atoms = await worker._process_url(url)
-            if success:
-                total_atoms += atoms
-                success_count += 1
-                print(f"    ✅ {atoms} atoms")
-            else:
-                print(f"    ❌ Failed")
-        except Exception as e:
-            print(f"    ❌ Error: {e}")
+    print(f"URLs to process: {len(PDF_URLS)} (concurrency={concurrency})\n")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def process(i: int, url: str):
+        async with semaphore:
+            label = f"[{i}/{len(PDF_URLS)}] {url[:60]}..."
+            try:
+                success, atoms = await worker._process_url(url)
+                if success:
+                    print(f"{label}\n    ✅ {atoms} atoms")
+                    return atoms
+                print(f"{label}\n    ❌ Failed")
+            except Exception as e:
+                print(f"{label}\n    ❌ Error: {e}")
+            return None
+
+    results = await asyncio.gather(
+        *(process(i, url) for i, url in enumerate(PDF_URLS, 1))
+    )
+
+    total_atoms = sum(r for r in results if r)
+    success_count = sum(1 for r in results if r is not None)
 
     # Count after
     after = await worker.db_pool.fetchval("SELECT COUNT(*) FROM knowledge_atoms")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Create and tune the manual_chunks vector indexes
+
+- Denormalizes manufacturer_id onto manual_chunks (column, backfill, insert trigger)
+- Creates B-tree indexes for the manual / manufacturer filters
+- Creates the HNSW (default) or IVFFlat embedding index, CONCURRENTLY
+- ANALYZEs, then EXPLAINs each search scope and warns on sequential scans
+
+Idempotent; safe to re-run. Needs DATABASE_URL.
+Run: python scripts/migrate_vector_indexes.py [--method hnsw|ivfflat] [--rebuild] [--check-only]
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+try:
+    import psycopg2
+except ImportError:
+    print("[*] Installing psycopg2...")
+    os.system("pip install psycopg2-binary")
+    import psycopg2
+
+# Add project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.vector_index import (
+    ANN_METHODS,
+    DEFAULT_EF_SEARCH,
+    DEFAULT_HNSW_EF_CONSTRUCTION,
+    DEFAULT_HNSW_M,
+    FILTER_INDEXES,
+    HAS_MANUFACTURER_ID_SQL,
+    MANUFACTURER_ID_MIGRATION,
+    PLAN_SAMPLE_SQL,
+    ann_index_sql,
+    find_seq_scans,
+    ivfflat_lists_for,
+    vector_search_sql,
+)
+
+# Existing ANN indexes on manual_chunks, whatever their names
+ANN_INDEXES_SQL = """
+    SELECT indexname
+    FROM pg_indexes
+    WHERE tablename = 'manual_chunks'
+      AND (indexdef ILIKE '%USING hnsw%' OR indexdef ILIKE '%USING ivfflat%')
+"""
+
+
+def migrate(cur, args):
+    """Denormalize manufacturer_id, then build filter and ANN indexes"""
+
+    print("[*] Denormalizing manufacturer_id onto manual_chunks...")
+    for statement in MANUFACTURER_ID_MIGRATION:
+        cur.execute(statement)
+    print("[OK] manufacturer_id column, backfill and insert trigger in place")
+
+    print("[*] Creating filter indexes (concurrently)...")
+    for statement in FILTER_INDEXES:
+        cur.execute(statement)
+    print("[OK] Filter indexes ready")
+
+    cur.execute("SELECT count(*) FROM manual_chunks WHERE embedding IS NOT NULL")
+    rows = cur.fetchone()[0]
+    lists = args.lists or ivfflat_lists_for(rows)
+
+    if args.rebuild:
+        cur.execute(ANN_INDEXES_SQL)
+        for (index_name,) in cur.fetchall():
+            print(f"[*] Dropping ANN index {index_name}...")
+            cur.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+
+    print(f"[*] Creating {args.method} index on {rows:,} embeddings...")
+    cur.execute(f"SET maintenance_work_mem = '{args.maintenance_work_mem}'")
+    cur.execute(ann_index_sql(args.method, args.m, args.ef_construction, lists))
+    print("[OK] ANN index ready")
+
+    print("[*] Analyzing manual_chunks...")
+    cur.execute("ANALYZE manual_chunks")
+    print("[OK] Statistics updated")
+
+
+def check_plans(cur, ef_search):
+    """EXPLAIN each search scope with a real row's parameters; return warning count"""
+
+    print("[*] Checking vector search plans...")
+
+    cur.execute(HAS_MANUFACTURER_ID_SQL)
+    denormalized = cur.fetchone()[0]
+
+    cur.execute(PLAN_SAMPLE_SQL)
+    sample = cur.fetchone()
+    if not sample:
+        print("[WARNING] No embedded chunks - nothing to check")
+        return 0
+
+    embedding, manual_id, manufacturer = sample
+    scopes = {
+        'global': (embedding, 5),
+        'manual': (embedding, str(manual_id), 5),
+    }
+    if manufacturer:
+        scopes['manufacturer'] = (embedding, manufacturer, 5)
+
+    cur.execute(f"SET hnsw.ef_search = {int(ef_search)}")
+
+    warnings = 0
+    for scope, params in scopes.items():
+        # PREPARE keeps the $n placeholders shared with ManualRAGService
+        cur.execute(f"PREPARE vector_plan_check AS {vector_search_sql(scope, denormalized)}")
+        placeholders = ", ".join(["%s"] * len(params))
+        cur.execute(f"EXPLAIN (FORMAT JSON) EXECUTE vector_plan_check({placeholders})", params)
+        plan = cur.fetchone()[0]
+        cur.execute("DEALLOCATE vector_plan_check")
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        issues = find_seq_scans(plan)
+        for issue in issues:
+            print(f"[WARNING] {scope}: {issue}")
+        if not issues:
+            print(f"[OK] {scope}: index scan")
+        warnings += len(issues)
+
+    return warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create and tune manual_chunks vector indexes")
+    parser.add_argument('--method', choices=ANN_METHODS, default='hnsw')
+    parser.add_argument('--m', type=int, default=DEFAULT_HNSW_M, help="HNSW links per node")
+    parser.add_argument('--ef-construction', type=int, default=DEFAULT_HNSW_EF_CONSTRUCTION)
+    parser.add_argument('--lists', type=int, default=None, help="IVFFlat lists (default: rows / 1000)")
+    parser.add_argument('--maintenance-work-mem', default='512MB')
+    parser.add_argument('--ef-search', type=int, default=DEFAULT_EF_SEARCH, help="hnsw.ef_search for the plan check")
+    parser.add_argument('--rebuild', action='store_true', help="Drop existing ANN indexes first")
+    parser.add_argument('--check-only', action='store_true', help="Only run the plan check")
+    args = parser.parse_args()
+
+    database_url = os.environ.get('DATABASE_URL')
+    if not database_url:
+        print("[ERROR] DATABASE_URL is not set")
+        return 1
+
+    print("[*] Connecting to PostgreSQL...")
+    conn = psycopg2.connect(database_url)
+    # CREATE / DROP INDEX CONCURRENTLY cannot run inside a transaction
+    conn.autocommit = True
+    cur = conn.cursor()
+    print("[OK] Connected to database\n")
+
+    try:
+        if not args.check_only:
+            migrate(cur, args)
+            print()
+        warnings = check_plans(cur, args.ef_search)
+
+    except psycopg2.Error as e:
+        print(f"\n[ERROR] Database error: {e}")
+        return 1
+
+    finally:
+        cur.close()
+        conn.close()
+
+    if warnings:
+        print(f"\n[WARNING] {warnings} sequential scan(s) on manual_chunks")
+        return 2
+
+    print("\n[SUCCESS] Vector search plans use indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
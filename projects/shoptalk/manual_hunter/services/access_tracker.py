@@ -0,0 +1,157 @@
+"""
+Access Tracker
+
+Write-behind batching of access_count / last_accessed updates for the
+manual_files and manual_cache tables.
+
+Instead of one UPDATE per lookup hit, increments are accumulated in memory
+and flushed periodically as a single multi-row UPDATE ... FROM (VALUES ...)
+per table. Hot rows (V20, PowerFlex 4M) then take one row lock per flush
+instead of one per request.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .write_behind import WriteBehindBuffer
+
+logger = logging.getLogger(__name__)
+
+
+# table -> (last-accessed column, whether rows are qualified by manual_type)
+TRACKED_TABLES = {
+    'manual_files': ('last_accessed_at', True),
+    'manual_cache': ('last_accessed', False),
+}
+
+# Rows per UPDATE statement (5 params per row, well under asyncpg's 32767 limit)
+MAX_ROWS_PER_STATEMENT = 500
+
+
+class AccessTracker(WriteBehindBuffer):
+    """
+    Accumulates access increments and flushes them in batches.
+
+    Usage:
+        tracker = AccessTracker(db)
+        tracker.record('manual_cache', 'Siemens', 'V20')
+        ...
+        await tracker.close()  # final flush on shutdown
+    """
+
+    name = "Access"
+
+    def __init__(
+        self,
+        db,
+        flush_interval: float = 10.0,
+        max_pending: int = 1000
+    ):
+        """
+        Initialize access tracker.
+
+        Args:
+            db: Database connection pool
+            flush_interval: Seconds between background flushes
+            max_pending: Flush early once this many distinct rows are pending
+        """
+        # Buffered as (table, manufacturer, model, manual_type) -> [count, last_accessed]
+        super().__init__(flush_interval=flush_interval, max_pending=max_pending)
+        self.db = db
+
+        self.recorded = 0
+        self.rows_coalesced = 0
+
+    def record(
+        self,
+        table: str,
+        manufacturer: str,
+        model: str,
+        manual_type: Optional[str] = None
+    ) -> None:
+        """
+        Record one access. Never touches the database.
+
+        Args:
+            table: 'manual_files' or 'manual_cache'
+            manufacturer: Equipment manufacturer
+            model: Equipment model number
+            manual_type: Required for manual_files rows
+        """
+        if table not in TRACKED_TABLES:
+            raise ValueError(f"Untracked table: {table}")
+
+        if not TRACKED_TABLES[table][1]:
+            manual_type = None
+
+        key = (table, manufacturer.strip().lower(), model.strip().lower(), manual_type)
+        self.recorded += 1
+        self._add(key, [1, datetime.now(timezone.utc)])
+
+    def _merge(self, old: List[Any], new: List[Any]) -> List[Any]:
+        return [old[0] + new[0], max(old[1], new[1])]
+
+    def _batches(self, items: List[Tuple[Tuple, List[Any]]]) -> Iterator[List[Tuple[Tuple, List[Any]]]]:
+        """One UPDATE per table, at most MAX_ROWS_PER_STATEMENT rows each."""
+        by_table: Dict[str, List[Tuple[Tuple, List[Any]]]] = {}
+        for key, entry in items:
+            by_table.setdefault(key[0], []).append((key, entry))
+
+        for table_items in by_table.values():
+            for i in range(0, len(table_items), MAX_ROWS_PER_STATEMENT):
+                yield table_items[i:i + MAX_ROWS_PER_STATEMENT]
+
+    def _written(self, batch: List[Tuple[Tuple, List[Any]]]) -> None:
+        self.rows_coalesced += sum(entry[0] for _, entry in batch) - len(batch)
+
+    async def _write_batch(self, batch: List[Tuple[Tuple, List[Any]]]) -> None:
+        """
+        Apply one multi-row UPDATE ... FROM (VALUES ...) for a table.
+
+        Access times are sent as timestamptz and cast to the session time
+        zone for the TIMESTAMP columns, as NOW() would be.
+        """
+        table = batch[0][0][0]
+        last_column, by_type = TRACKED_TABLES[table]
+
+        values = []
+        params: List[Any] = []
+        for (_, manufacturer, model, manual_type), (count, last_at) in batch:
+            n = len(params)
+            values.append(
+                f"(${n + 1}::text, ${n + 2}::text, ${n + 3}::text, ${n + 4}::int, ${n + 5}::timestamptz)"
+            )
+            params.extend([manufacturer, model, manual_type, count, last_at])
+
+        type_filter = "AND t.manual_type = v.manual_type" if by_type else ""
+
+        await self.db.execute(
+            f"""
+            UPDATE {table} AS t
+            SET access_count = t.access_count + v.hits,
+                {last_column} = GREATEST(t.{last_column}, v.last_at::timestamp)
+            FROM (VALUES {', '.join(values)})
+                AS v(manufacturer, model, manual_type, hits, last_at)
+            WHERE LOWER(t.manufacturer) = v.manufacturer
+              AND LOWER(t.model) = v.model
+              {type_filter}
+            """,
+            *params
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return flush counters for reporting."""
+        return {
+            'access_pending_rows': self.pending,
+            'access_recorded': self.recorded,
+            'access_flushes': self.flushes,
+            'access_rows_written': self.rows_written,
+            'access_rows_coalesced': self.rows_coalesced,
+            'access_flush_errors': self.flush_errors,
+        }
+
+
+__all__ = [
+    "AccessTracker",
+]
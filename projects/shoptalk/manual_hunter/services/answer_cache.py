@@ -0,0 +1,165 @@
+"""
+Manual Q&A Answer Cache
+
+In-process LRU/TTL cache of generated answers for ManualQAHandler, so the
+same question against the same manual content is answered without another
+LLM call.
+
+Keyed on (manual_id, retrieved chunk IDs, normalized question):
+- Chunk IDs are the retrieval fingerprint: the ingestion pipeline gives
+  re-written or changed chunks new IDs (incremental re-ingest keeps an ID
+  only while the chunk's content checksum is unchanged), so an updated
+  manual never matches answers generated from its old text
+- invalidate_manual() drops a manual's entries explicitly
+- Hit/miss counters and the tokens / cost that hits avoided
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .embedding_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAnswer:
+    """A generated answer and what it cost to produce."""
+    answer: str
+    confidence: float
+    sources_used: int
+    model_used: str
+    citations: List[Dict[str, Any]] = field(default_factory=list)
+    cost_usd: float = 0.0
+    tokens: int = 0  # Prompt + completion tokens (estimated if not reported)
+    created_at: float = field(default_factory=time.time)
+
+
+class AnswerCache:
+    """
+    Bounded LRU cache of CachedAnswer with a TTL.
+
+    Not thread-safe by design: the handler runs on a single event loop and
+    every operation here is synchronous.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 6 * 3600):
+        """
+        Initialize answer cache.
+
+        Args:
+            max_entries: Maximum cached answers before LRU eviction
+            ttl_seconds: Lifetime of an answer
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (expires_at, manual_id, answer)
+        self._entries: "OrderedDict[str, Tuple[float, Hashable, CachedAnswer]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.tokens_saved = 0
+        self.cost_saved_usd = 0.0
+
+    @staticmethod
+    def key(manual_id: Optional[Hashable], chunk_ids: Iterable[Hashable], question: str) -> str:
+        """Cache key: manual, the set of retrieved chunks, and the normalized question."""
+        chunks = ",".join(sorted(str(c) for c in chunk_ids))
+        raw = f"{manual_id}\x1f{chunks}\x1f{normalize_query(question)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(
+        self,
+        manual_id: Optional[Hashable],
+        chunk_ids: Iterable[Hashable],
+        question: str
+    ) -> Optional[CachedAnswer]:
+        """
+        Look up an answer.
+
+        Returns:
+            The cached answer, or None if absent or expired
+        """
+        key = self.key(manual_id, chunk_ids, question)
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        answer = entry[2]
+
+        self.hits += 1
+        self.tokens_saved += answer.tokens
+        self.cost_saved_usd += answer.cost_usd
+        return answer
+
+    def set(
+        self,
+        manual_id: Optional[Hashable],
+        chunk_ids: Iterable[Hashable],
+        question: str,
+        answer: CachedAnswer
+    ) -> None:
+        """Store an answer for a retrieval fingerprint."""
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+
+        key = self.key(manual_id, chunk_ids, question)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, manual_id, answer)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_manual(self, manual_id: Optional[Hashable]) -> int:
+        """
+        Drop every answer generated for a manual (e.g. after re-ingest).
+
+        Returns:
+            Number of entries removed
+        """
+        stale = [key for key, entry in self._entries.items() if entry[1] == manual_id]
+        for key in stale:
+            del self._entries[key]
+
+        if stale:
+            self.invalidations += len(stale)
+            logger.debug(f"Answer cache invalidated | manual={manual_id} | entries={len(stale)}")
+
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss and savings counters for reporting."""
+        lookups = self.hits + self.misses
+        return {
+            'answer_cache_entries': len(self._entries),
+            'answer_cache_hits': self.hits,
+            'answer_cache_misses': self.misses,
+            'answer_cache_evictions': self.evictions,
+            'answer_cache_invalidations': self.invalidations,
+            'answer_cache_hit_rate_pct': int(100 * self.hits / lookups) if lookups else 0,
+            'answer_cache_tokens_saved': self.tokens_saved,
+            'answer_cache_cost_saved_usd': round(self.cost_saved_usd, 4),
+        }
+
+
+__all__ = [
+    "AnswerCache",
+    "CachedAnswer",
+]
@@ -0,0 +1,209 @@
+"""
+Context Assembly for Manual RAG
+
+Turns retrieved / neighbouring manual chunks into LLM context blocks:
+- Consecutive chunks of the same manual are merged into one block
+- The chunker's overlap (a chunk starts with the previous chunk's last
+  ~256 tokens) is stripped, so repeated text is sent once
+- Blocks are packed by relevance into a token budget
+
+Token counts are estimates at ~4 characters per token, the same ratio
+PDFChunkerService uses to size chunks.
+"""
+
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+CHARS_PER_TOKEN = 4
+
+# Shortest suffix/prefix match treated as chunker overlap rather than coincidence
+MIN_OVERLAP_CHARS = 32
+
+# Chunker overlap is 256 tokens; allow slack for sentence-boundary snapping
+MAX_OVERLAP_CHARS = 2048
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 chars per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def overlap_length(
+    previous: str,
+    following: str,
+    max_overlap: int = MAX_OVERLAP_CHARS,
+    min_overlap: int = MIN_OVERLAP_CHARS
+) -> int:
+    """
+    Length of the longest suffix of previous that is a prefix of following.
+
+    Only overlaps of at least min_overlap characters count; 0 if none.
+    """
+    limit = min(len(previous), len(following), max_overlap)
+    if limit < min_overlap:
+        return 0
+
+    tail_start = len(previous) - limit
+    probe = following[:min_overlap]
+
+    # Candidate starts in previous's tail, longest overlap first
+    pos = previous.find(probe, tail_start)
+    while pos != -1:
+        length = len(previous) - pos
+        if following.startswith(previous[pos:]):
+            return length
+        pos = previous.find(probe, pos + 1)
+
+    return 0
+
+
+def merge_contents(contents: Sequence[str]) -> Tuple[str, int]:
+    """
+    Join consecutive chunk texts, dropping each chunk's overlap with the previous one.
+
+    Returns:
+        (merged text, characters of duplicated overlap removed)
+    """
+    if not contents:
+        return "", 0
+
+    parts = [contents[0]]
+    removed = 0
+    for previous, following in zip(contents, contents[1:]):
+        overlap = overlap_length(previous, following)
+        removed += overlap
+        parts.append(following[overlap:] if overlap else "\n\n" + following)
+
+    return "".join(parts), removed
+
+
+@dataclass
+class ContextBlock:
+    """One or more consecutive chunks of a manual, merged."""
+    manual_id: Any
+    chunk_ids: List[Any]
+    first_index: Optional[int]
+    last_index: Optional[int]
+    page_start: int
+    page_end: int
+    section_title: Optional[str]
+    content: str
+    rank: int  # Best (lowest) relevance rank of the chunks it contains
+    duplicate_chars: int = 0
+    keywords: List[str] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.content)
+
+    @property
+    def citation(self) -> str:
+        """Format citation string."""
+        pages = f"Page {self.page_start}" if self.page_start == self.page_end \
+            else f"Pages {self.page_start}-{self.page_end}"
+        if self.section_title:
+            return f"{pages}, Section: {self.section_title}"
+        return pages
+
+
+def build_blocks(rows: Iterable[Dict[str, Any]]) -> List[ContextBlock]:
+    """
+    Merge chunk rows into blocks of consecutive chunk_index per manual.
+
+    Each row needs chunk_id, manual_id, chunk_index, content, page_number,
+    section_title, keywords and rank. Rows may repeat (overlapping windows);
+    the best rank wins. Rows with chunk_index None become their own block.
+
+    Returns:
+        Blocks sorted by rank
+    """
+    unique: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        seen = unique.get(row['chunk_id'])
+        if seen is None or row['rank'] < seen['rank']:
+            unique[row['chunk_id']] = row
+
+    indexed = [r for r in unique.values() if r['chunk_index'] is not None]
+    ordered = sorted(indexed, key=lambda r: (str(r['manual_id']), r['chunk_index']))
+
+    runs: List[List[Dict[str, Any]]] = []
+    for row in ordered:
+        last = runs[-1][-1] if runs else None
+        if last and last['manual_id'] == row['manual_id'] and row['chunk_index'] <= last['chunk_index'] + 1:
+            runs[-1].append(row)
+        else:
+            runs.append([row])
+
+    runs.extend([r] for r in unique.values() if r['chunk_index'] is None)
+
+    blocks = []
+    for run in runs:
+        content, duplicate_chars = merge_contents([r['content'] for r in run])
+        keywords: List[str] = []
+        for r in run:
+            keywords.extend(k for k in (r.get('keywords') or []) if k not in keywords)
+
+        blocks.append(ContextBlock(
+            manual_id=run[0]['manual_id'],
+            chunk_ids=[r['chunk_id'] for r in run],
+            first_index=run[0]['chunk_index'],
+            last_index=run[-1]['chunk_index'],
+            page_start=run[0]['page_number'] or 1,
+            page_end=run[-1]['page_number'] or run[0]['page_number'] or 1,
+            section_title=next((r['section_title'] for r in run if r['section_title']), None),
+            content=content,
+            rank=min(r['rank'] for r in run),
+            duplicate_chars=duplicate_chars,
+            keywords=keywords
+        ))
+
+    blocks.sort(key=lambda b: (b.rank, str(b.manual_id), b.first_index or 0))
+    return blocks
+
+
+def pack_blocks(
+    blocks: Sequence[ContextBlock],
+    token_budget: int,
+    min_tail_tokens: int = 64
+) -> Tuple[List[ContextBlock], int]:
+    """
+    Take blocks in order until token_budget is spent.
+
+    The first block that does not fit is truncated to the remaining budget
+    (if at least min_tail_tokens remain); later blocks are dropped.
+
+    Returns:
+        (packed blocks, tokens used)
+    """
+    packed: List[ContextBlock] = []
+    used = 0
+
+    for block in blocks:
+        remaining = token_budget - used
+        if block.tokens <= remaining:
+            packed.append(block)
+            used += block.tokens
+            continue
+
+        if remaining >= min_tail_tokens:
+            cut = block.content[:remaining * CHARS_PER_TOKEN - 3].rstrip() + "..."
+            packed.append(replace(block, content=cut))
+            used += estimate_tokens(cut)
+        break
+
+    return packed, used
+
+
+__all__ = [
+    "CHARS_PER_TOKEN",
+    "ContextBlock",
+    "build_blocks",
+    "estimate_tokens",
+    "merge_contents",
+    "overlap_length",
+    "pack_blocks",
+]
@@ -0,0 +1,189 @@
+"""
+Query Embedding Cache
+
+Caches query embeddings for ManualRAGService.retrieve_context so repeat
+questions ("how do I reset", "F0002 meaning") skip the embedding model.
+
+Tiers:
+1. In-process LRU of float32 arrays
+2. Optional on-disk store: one raw float32 file per query under disk_dir,
+   shared across restarts and processes
+
+Keyed on sha256(namespace, normalized query); the namespace should name the
+embedding model so a model change never serves stale vectors. Concurrent
+misses for the same query share one embedding call (SingleFlight).
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share a key."""
+    return re.sub(r'\s+', ' ', (text or '').casefold()).strip()
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier (memory, then disk) embedding cache with hit/latency counters.
+
+    Disk errors are logged and treated as misses - the cache must never make
+    retrieval fail.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        disk_dir: Optional[Union[str, Path]] = None,
+        namespace: str = ""
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            max_entries: In-process LRU capacity
+            disk_dir: Directory for the on-disk float32 store (None = memory only)
+            namespace: Embedding model identifier, part of every key
+        """
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.namespace = namespace
+
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._flights = SingleFlight()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.embed_seconds = 0.0
+        self.lookup_seconds = 0.0
+
+    def key(self, query: str) -> str:
+        """Cache key for a query."""
+        raw = f"{self.namespace}\x1f{normalize_query(query)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    async def get_or_embed(
+        self,
+        query: str,
+        embed: Callable[[str], Awaitable[Sequence[float]]]
+    ) -> List[float]:
+        """
+        Return the cached embedding for query, computing it with embed() on a miss.
+
+        Args:
+            query: Query text (normalized for the key; passed to embed() as-is)
+            embed: Async embedding function, e.g. EmbeddingService.generate_embedding
+        """
+        start = time.monotonic()
+        key = self.key(query)
+
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            self.lookup_seconds += time.monotonic() - start
+            return vector.tolist()
+
+        if self.disk_dir:
+            vector = await asyncio.to_thread(self._read_disk, key)
+            if vector is not None:
+                self._remember(key, vector)
+                self.disk_hits += 1
+                self.lookup_seconds += time.monotonic() - start
+                return vector.tolist()
+
+        vector, _shared = await self._flights.run(key, lambda: self._embed(key, query, embed))
+        return vector.tolist()
+
+    async def _embed(
+        self,
+        key: str,
+        query: str,
+        embed: Callable[[str], Awaitable[Sequence[float]]]
+    ) -> array:
+        self.misses += 1
+
+        start = time.monotonic()
+        vector = array('f', await embed(query))
+        self.embed_seconds += time.monotonic() - start
+
+        self._remember(key, vector)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, vector)
+
+        return vector
+
+    def _remember(self, key: str, vector: array) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        # Two-level fan-out keeps directories small
+        return self.disk_dir / key[:2] / f"{key}.f32"
+
+    def _read_disk(self, key: str) -> Optional[array]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Embedding cache read failed | path={path} | error={e}")
+            return None
+
+        vector = array('f')
+        vector.frombytes(data)
+        return vector
+
+    def _write_disk(self, key: str, vector: array) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(vector.tobytes())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Embedding cache write failed | path={path} | error={e}")
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (the disk store is left intact)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit ratio and embedding latency counters."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            'embedding_cache_entries': len(self._entries),
+            'embedding_cache_memory_hits': self.memory_hits,
+            'embedding_cache_disk_hits': self.disk_hits,
+            'embedding_cache_misses': self.misses,
+            'embedding_cache_coalesced': self._flights.coalesced,
+            'embedding_cache_hit_rate_pct': int(100 * hits / lookups) if lookups else 0,
+            'embedding_avg_ms': round(1000 * self.embed_seconds / self.misses, 1) if self.misses else 0.0,
+            'embedding_cache_hit_avg_ms': round(1000 * self.lookup_seconds / hits, 3) if hits else 0.0,
+        }
+
+
+__all__ = [
+    "QueryEmbeddingCache",
+    "normalize_query",
+]
@@ -0,0 +1,233 @@
+"""
+Shared HTTP Client Pool
+
+One process-wide httpx.AsyncClient for Manual Hunter, so Tavily, Groq,
+Claude, DeepSeek and PDF downloads reuse warm keep-alive connections instead
+of paying a TLS handshake per call.
+
+Features:
+- Global and per-host connection limits
+- Keep-alive with configurable expiry
+- HTTP/2 when the optional `h2` package is installed
+- Pool stats (active, idle, opened, reused connections)
+- Clean shutdown via close_http_client()
+
+Usage:
+    from manual_hunter.services.http_pool import get_http_client
+
+    client = get_http_client()
+    response = await client.post(url, json=payload, timeout=5)
+
+Per-call timeouts are passed on each request; never close the shared client
+from a service - call close_http_client() once on application shutdown.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Defaults (override via configure_http_pool before first use)
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_PER_HOST_LIMIT = 10
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+_config: Dict[str, Any] = {
+    'max_connections': DEFAULT_MAX_CONNECTIONS,
+    'max_keepalive_connections': DEFAULT_MAX_KEEPALIVE,
+    'keepalive_expiry': DEFAULT_KEEPALIVE_EXPIRY,
+    'per_host_limit': DEFAULT_PER_HOST_LIMIT,
+    'http2': HTTP2_AVAILABLE,
+}
+
+_client: Optional[httpx.AsyncClient] = None
+_transport: Optional["PooledTransport"] = None
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees its per-host slot once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    AsyncHTTPTransport wrapper adding per-host limits and pool accounting.
+
+    httpx.Limits only caps the pool as a whole; a burst of PDF downloads from
+    one slow host would otherwise starve the LLM APIs of connections.
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, per_host_limit: int):
+        self._transport = transport
+        self._per_host_limit = per_host_limit
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._seen_connections: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+        self.requests = 0
+        self.connections_opened = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self._per_host_limit)
+
+        await slot.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+
+        self.requests += 1
+        self._track_connections()
+
+        response.stream = _ReleasingStream(response.stream, slot.release)
+        return response
+
+    def _connections(self) -> list:
+        """Connections currently held by the underlying httpcore pool."""
+        pool = getattr(self._transport, '_pool', None)
+        return list(getattr(pool, 'connections', []) or [])
+
+    def _track_connections(self) -> None:
+        """Count connections we have not seen before as newly opened."""
+        for conn in self._connections():
+            if conn not in self._seen_connections:
+                self._seen_connections.add(conn)
+                self.connections_opened += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool occupancy and reuse counters."""
+        connections = self._connections()
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            'http_active_connections': len(connections) - idle,
+            'http_idle_connections': idle,
+            'http_requests': self.requests,
+            'http_connections_opened': self.connections_opened,
+            'http_connections_reused': max(0, self.requests - self.connections_opened),
+            'http_hosts': len(self._host_slots),
+        }
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def configure_http_pool(
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    per_host_limit: Optional[int] = None,
+    http2: Optional[bool] = None
+) -> None:
+    """
+    Override pool settings. Takes effect for the next client created.
+
+    Args:
+        max_connections: Total open connections across all hosts
+        max_keepalive_connections: Idle connections kept warm
+        keepalive_expiry: Seconds an idle connection is kept
+        per_host_limit: Concurrent requests per host
+        http2: Enable HTTP/2 (ignored if `h2` is not installed)
+    """
+    overrides = {
+        'max_connections': max_connections,
+        'max_keepalive_connections': max_keepalive_connections,
+        'keepalive_expiry': keepalive_expiry,
+        'per_host_limit': per_host_limit,
+        'http2': http2,
+    }
+    _config.update({k: v for k, v in overrides.items() if v is not None})
+
+    if _config['http2'] and not HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 requested but `h2` not installed - using HTTP/1.1")
+        _config['http2'] = False
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _client, _transport
+
+    if _client is None or _client.is_closed:
+        _transport = PooledTransport(
+            httpx.AsyncHTTPTransport(
+                http2=_config['http2'],
+                limits=httpx.Limits(
+                    max_connections=_config['max_connections'],
+                    max_keepalive_connections=_config['max_keepalive_connections'],
+                    keepalive_expiry=_config['keepalive_expiry'],
+                )
+            ),
+            per_host_limit=_config['per_host_limit']
+        )
+        _client = httpx.AsyncClient(transport=_transport, timeout=DEFAULT_TIMEOUT)
+
+        logger.info(
+            f"Shared HTTP client created | http2={_config['http2']} | "
+            f"max_connections={_config['max_connections']} | "
+            f"per_host={_config['per_host_limit']}"
+        )
+
+    return _client
+
+
+def get_pool_stats() -> Dict[str, int]:
+    """Return connection pool stats (zeros before first use)."""
+    if _transport is None:
+        return {
+            'http_active_connections': 0,
+            'http_idle_connections': 0,
+            'http_requests': 0,
+            'http_connections_opened': 0,
+            'http_connections_reused': 0,
+            'http_hosts': 0,
+        }
+    return _transport.stats()
+
+
+async def close_http_client() -> None:
+    """Close the shared client. Call once on application shutdown."""
+    global _client, _transport
+
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Shared HTTP client closed")
+
+    _client = None
+    _transport = None
+
+
+__all__ = [
+    "get_http_client",
+    "get_pool_stats",
+    "configure_http_pool",
+    "close_http_client",
+    "PooledTransport",
+    "HTTP2_AVAILABLE",
+]
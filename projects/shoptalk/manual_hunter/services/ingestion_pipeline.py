@@ -0,0 +1,591 @@
+"""
+Chunk Ingestion Pipeline
+
+Bounded async pipeline that turns manual PDFs into embedded manual_chunks rows:
+
+    download -> extract/chunk -> embed (batched) -> write (COPY / executemany)
+
+Stages are connected by small bounded queues so a slow stage applies
+backpressure instead of buffering a whole manual in memory, and the stages
+overlap: manual B downloads while manual A's chunks are being embedded.
+
+Each stage records items processed and busy time for throughput metrics.
+
+A manual's changes are applied atomically: its embedded batches are staged
+in memory, and once the last batch arrives the old rows are replaced and the
+new chunks inserted in one transaction, so a failed extract/embed/write
+leaves the previous chunks (and page fingerprints) untouched. Full re-ingest
+(the default) replaces all of a manual's chunks.
+
+Incremental mode (incremental=True) re-ingests an updated manual without
+redoing unchanged work:
+- Page content streams are fingerprinted; only pages whose fingerprint
+  differs from manual_pages are text-extracted, the rest reuse stored text
+- The re-chunked manual is diffed against existing manual_chunks by content
+  checksum; unchanged chunks keep their row (id and embedding, so existing
+  citations stay valid), only new chunks are embedded and inserted, and
+  chunks no longer present are deleted - together with the manual_pages
+  update, in the transaction that inserts the new chunks
+
+A manual's cached Q&A answers (answer_cache, shared with ManualQAHandler)
+are dropped whenever its chunks are rewritten.
+
+Usage:
+    pipeline = ChunkIngestionPipeline(db_pool, answer_cache=qa_handler.answer_cache)
+    summary = await pipeline.run([
+        IngestJob(manual_id=uuid, source="https://.../v20_manual.pdf"),
+        IngestJob(manual_id=uuid2, source="/data/manuals/pf4m.pdf"),
+    ])
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import asyncpg
+
+from rivet.services.embedding_service import EmbeddingService
+
+from .answer_cache import AnswerCache
+from .http_pool import get_http_client
+from .pdf_chunker_service import ManualChunk, PDFChunkerService
+from .pgvector_codec import supports_binary_vectors, vector_literal
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DOWNLOAD_DIR = Path(__file__).resolve().parent.parent / "data" / "manuals"
+MAX_DOWNLOAD_BYTES = 200 * 1024 * 1024
+
+# Queue sentinel marking end of input for one downstream worker
+_DONE = object()
+
+
+@dataclass
+class IngestJob:
+    """One manual to ingest."""
+    manual_id: UUID
+    source: str  # URL or local file path
+    max_pages: int = 500
+
+
+@dataclass
+class StageMetrics:
+    """Throughput counters for one pipeline stage."""
+    name: str
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items produced per second of busy time."""
+        return self.items_out / self.busy_seconds if self.busy_seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'errors': self.errors,
+            'busy_seconds': round(self.busy_seconds, 2),
+            'per_second': round(self.throughput, 2),
+        }
+
+
+@dataclass
+class _ManualPlan:
+    """Row changes committed together with a manual's new chunks."""
+    replace_all: bool = False  # Full re-ingest: delete every existing chunk
+    removed: List[Any] = field(default_factory=list)  # Chunk ids no longer present
+    kept: List[tuple] = field(default_factory=list)  # (id, chunk_index, page_number, section_title, checksum)
+    pages: List[tuple] = field(default_factory=list)  # manual_pages rows to upsert
+    page_count: Optional[int] = None  # manual_pages beyond this are deleted
+    pages_reused: int = 0
+
+
+@dataclass
+class _ChunkBatch:
+    job: IngestJob
+    chunks: List[ManualChunk]
+    embeddings: Optional[List[List[float]]] = None
+    manual_batches: int = 1  # Batches in the manual; the last one commits them all
+
+
+@dataclass
+class PipelineSummary:
+    """Result of a pipeline run."""
+    chunks_written: Dict[UUID, int] = field(default_factory=dict)
+    chunks_reused: int = 0
+    chunks_deleted: int = 0
+    pages_reused: int = 0
+    failed_jobs: List[str] = field(default_factory=list)
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+
+class ChunkIngestionPipeline:
+    """
+    Download, chunk, embed and store manuals with overlapping stages.
+    """
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        chunker: Optional[PDFChunkerService] = None,
+        embedding_service: Optional[EmbeddingService] = None,
+        download_dir: Optional[Path] = None,
+        embed_batch_size: int = 32,
+        queue_size: int = 4,
+        download_workers: int = 3,
+        extract_workers: int = 2,
+        embed_workers: int = 2,
+        write_workers: int = 2,
+        incremental: bool = False,
+        binary_vectors: Optional[bool] = None,
+        answer_cache: Optional[AnswerCache] = None
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            db_pool: Database connection pool
+            chunker: PDFChunkerService instance. Created if None.
+            embedding_service: EmbeddingService instance. Created if None.
+            download_dir: Where downloaded PDFs are stored
+            embed_batch_size: Chunks per embedding call / DB write
+            queue_size: Max items buffered between stages
+            download_workers: Concurrent downloads
+            extract_workers: Concurrent PDF extractions
+            embed_workers: Concurrent embedding batches
+            write_workers: Concurrent DB writers
+            incremental: Diff against existing pages/chunks instead of
+                replacing the manual's chunks
+            binary_vectors: Write with binary COPY (pool created with
+                init=register_vector_codec). None = detect on first write.
+            answer_cache: Q&A answer cache to invalidate for re-ingested manuals
+        """
+        self.db_pool = db_pool
+        self.chunker = chunker or PDFChunkerService()
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.download_dir = Path(download_dir or DEFAULT_DOWNLOAD_DIR)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.queue_size = max(1, queue_size)
+        self.incremental = incremental
+        self.binary_vectors = binary_vectors
+        self.answer_cache = answer_cache
+        self.workers = {
+            'download': max(1, download_workers),
+            'extract': max(1, extract_workers),
+            'embed': max(1, embed_workers),
+            'write': max(1, write_workers),
+        }
+
+        self.metrics = {name: StageMetrics(name) for name in self.workers}
+        self._summary = PipelineSummary()
+
+        # Encoded records and pending row changes per manual until all its batches arrive
+        self._staged: Dict[UUID, List[List[tuple]]] = {}
+        self._plans: Dict[UUID, _ManualPlan] = {}
+
+    async def run(self, jobs: Iterable[IngestJob]) -> PipelineSummary:
+        """
+        Ingest all jobs and return per-manual counts plus stage metrics.
+        """
+        start = time.monotonic()
+        summary = self._summary = PipelineSummary()
+        self._staged = {}
+        self._plans = {}
+
+        source_q: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            source_q.put_nowait(job)
+        for _ in range(self.workers['download']):
+            source_q.put_nowait(_DONE)
+
+        download_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        embed_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        write_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        await asyncio.gather(
+            self._stage('download', source_q, download_q, 'extract', self._download),
+            self._stage('extract', download_q, embed_q, 'embed', self._extract),
+            self._stage('embed', embed_q, write_q, 'write', self._embed),
+            self._stage('write', write_q, None, None, self._write),
+        )
+
+        for manual_id in self._plans:
+            logger.warning(f"Re-ingest incomplete, previous chunks kept | manual={manual_id}")
+        self._staged = {}
+        self._plans = {}
+
+        summary.stages = {name: m.as_dict() for name, m in self.metrics.items()}
+        summary.elapsed_seconds = round(time.monotonic() - start, 2)
+
+        logger.info(
+            f"Ingestion pipeline complete | manuals={len(summary.chunks_written)} | "
+            f"chunks={sum(summary.chunks_written.values())} | "
+            f"reused={summary.chunks_reused} | "
+            f"failed={len(summary.failed_jobs)} | elapsed={summary.elapsed_seconds}s"
+        )
+        return summary
+
+    async def _stage(
+        self,
+        name: str,
+        in_q: asyncio.Queue,
+        out_q: Optional[asyncio.Queue],
+        next_stage: Optional[str],
+        handler: Callable[[Any], AsyncIterator[Any]]
+    ) -> None:
+        """Run a stage's workers, then signal end-of-input downstream."""
+        metrics = self.metrics[name]
+
+        async def worker():
+            while True:
+                item = await in_q.get()
+                if item is _DONE:
+                    return
+
+                metrics.items_in += 1
+                started = time.monotonic()
+                try:
+                    async for output in handler(item):
+                        metrics.items_out += 1
+                        # Time spent blocked on a full downstream queue isn't busy time
+                        metrics.busy_seconds += time.monotonic() - started
+                        if out_q is not None:
+                            await out_q.put(output)
+                        started = time.monotonic()
+                except Exception as e:
+                    metrics.errors += 1
+                    job = item.job if isinstance(item, _ChunkBatch) else item
+                    job = job[0] if isinstance(job, tuple) else job
+                    logger.error(f"Ingestion stage failed | stage={name} | source={job.source} | error={e}")
+                    self._summary.failed_jobs.append(f"{name}: {job.source} ({e})")
+                finally:
+                    metrics.busy_seconds += time.monotonic() - started
+
+        await asyncio.gather(*(worker() for _ in range(self.workers[name])))
+
+        if out_q is not None:
+            for _ in range(self.workers[next_stage]):
+                await out_q.put(_DONE)
+
+    # ----- Stage handlers (async generators: one input -> zero or more outputs) -----
+
+    async def _download(self, job: IngestJob):
+        """Yield (job, local_path), downloading URLs to download_dir."""
+        if not job.source.startswith(("http://", "https://")):
+            yield job, Path(job.source)
+            return
+
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        path = self.download_dir / f"{hashlib.sha1(job.source.encode()).hexdigest()[:16]}.pdf"
+
+        if not path.exists():
+            tmp_path = path.with_suffix(".part")
+            size = 0
+            async with get_http_client().stream(
+                'GET', job.source, follow_redirects=True, timeout=120.0
+            ) as response:
+                response.raise_for_status()
+                with open(tmp_path, 'wb') as f:
+                    async for block in response.aiter_bytes():
+                        size += len(block)
+                        if size > MAX_DOWNLOAD_BYTES:
+                            raise ValueError(f"Download exceeds {MAX_DOWNLOAD_BYTES} bytes")
+                        f.write(block)
+            tmp_path.replace(path)
+
+        yield job, path
+
+    async def _extract(self, item):
+        """Chunk one PDF and yield embedding-sized batches."""
+        job, path = item
+
+        if self.incremental:
+            plan, chunks = await self._changed_chunks(job, path)
+            if plan is None:
+                return
+        else:
+            chunks = await self.chunker.chunk_pdf(str(path), max_pages=job.max_pages)
+
+            if not chunks:
+                logger.warning(f"No chunks extracted | source={job.source}")
+                return
+
+            plan = _ManualPlan(replace_all=True)
+
+        if not chunks:
+            # Nothing to embed: deletions and page updates only
+            async with self.db_pool.acquire() as conn:
+                async with conn.transaction():
+                    await self._apply_plan(conn, job.manual_id, plan)
+            self._committed(job.manual_id, plan, 0)
+            return
+
+        # Applied with the new chunks once every batch is embedded (_write)
+        self._plans[job.manual_id] = plan
+        manual_batches = -(-len(chunks) // self.embed_batch_size)
+
+        for i in range(0, len(chunks), self.embed_batch_size):
+            yield _ChunkBatch(
+                job=job,
+                chunks=chunks[i:i + self.embed_batch_size],
+                manual_batches=manual_batches
+            )
+
+    async def _changed_chunks(
+        self,
+        job: IngestJob,
+        path: Path
+    ) -> Tuple[Optional[_ManualPlan], List[ManualChunk]]:
+        """
+        Re-chunk a manual reusing unchanged pages and chunks.
+
+        Nothing is written here: returns the manual_pages updates, vanished
+        chunks and re-indexed kept chunks as a plan, plus only the chunks
+        that still need embedding. (None, []) if the PDF can't be read.
+        """
+        fingerprints = await self.chunker.page_fingerprints(str(path), job.max_pages)
+        if fingerprints is None:
+            logger.warning(f"PDF is encrypted | source={job.source}")
+            return None, []
+
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT page_number, content_sha256, text FROM manual_pages WHERE manual_id = $1",
+                job.manual_id
+            )
+        stored = {row['page_number']: row for row in rows}
+
+        changed = {
+            page_num for page_num, digest in fingerprints
+            if digest is None
+            or page_num not in stored
+            or stored[page_num]['content_sha256'] != digest
+        }
+
+        extracted: Dict[int, str] = {}
+        if changed:
+            async for page_num, text in self.chunker.iter_pages(
+                str(path), job.max_pages, page_numbers=changed
+            ):
+                extracted[page_num] = text
+
+        page_texts = {
+            page_num: extracted.get(page_num, '') if page_num in changed else stored[page_num]['text']
+            for page_num, _ in fingerprints
+        }
+        chunks = await self.chunker.chunk_pages(
+            [(page_num, text) for page_num, text in page_texts.items() if text],
+            job.source
+        )
+
+        async with self.db_pool.acquire() as conn:
+            existing = await conn.fetch(
+                """
+                SELECT id,
+                       COALESCE(content_sha256,
+                                encode(sha256(convert_to(content, 'UTF8')), 'hex')) AS checksum
+                FROM manual_chunks
+                WHERE manual_id = $1
+                """,
+                job.manual_id
+            )
+
+            # checksum -> row ids (a manual can repeat boilerplate chunks)
+            available: Dict[str, List[Any]] = {}
+            for row in existing:
+                available.setdefault(row['checksum'], []).append(row['id'])
+
+            kept, new = [], []
+            for chunk in chunks:
+                ids = available.get(chunk.checksum)
+                if ids:
+                    kept.append((ids.pop(), chunk))
+                else:
+                    new.append(chunk)
+
+            removed = [chunk_id for ids in available.values() for chunk_id in ids]
+
+        plan = _ManualPlan(
+            removed=removed,
+            # Positions may shift when earlier pages change; embeddings don't
+            kept=[
+                (chunk_id, c.chunk_index, c.page_number, c.section_title, c.checksum)
+                for chunk_id, c in kept
+            ],
+            pages=[
+                (job.manual_id, page_num, digest, page_texts[page_num])
+                for page_num, digest in fingerprints
+                if page_num in changed
+            ],
+            page_count=len(fingerprints),
+            pages_reused=len(fingerprints) - len(changed)
+        )
+
+        logger.info(
+            f"Incremental re-chunk | source={job.source} | "
+            f"pages_changed={len(changed)}/{len(fingerprints)} | "
+            f"chunks_new={len(new)} | reused={len(kept)} | deleted={len(removed)}"
+        )
+        return plan, new
+
+    async def _apply_plan(self, conn: asyncpg.Connection, manual_id: UUID, plan: _ManualPlan) -> None:
+        """Delete/re-index existing chunks and update manual_pages (inside the caller's transaction)."""
+        if plan.replace_all:
+            await conn.execute("DELETE FROM manual_chunks WHERE manual_id = $1", manual_id)
+            return
+
+        if plan.removed:
+            await conn.execute("DELETE FROM manual_chunks WHERE id = ANY($1)", plan.removed)
+
+        if plan.kept:
+            await conn.executemany(
+                """
+                UPDATE manual_chunks
+                SET chunk_index = $2, page_number = $3,
+                    section_title = $4, content_sha256 = $5
+                WHERE id = $1
+                """,
+                plan.kept
+            )
+
+        if plan.pages:
+            await conn.executemany(
+                """
+                INSERT INTO manual_pages (manual_id, page_number, content_sha256, text)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (manual_id, page_number)
+                DO UPDATE SET content_sha256 = EXCLUDED.content_sha256,
+                              text = EXCLUDED.text,
+                              updated_at = NOW()
+                """,
+                plan.pages
+            )
+
+        if plan.page_count is not None:
+            await conn.execute(
+                "DELETE FROM manual_pages WHERE manual_id = $1 AND page_number > $2",
+                manual_id,
+                plan.page_count
+            )
+
+    def _committed(self, manual_id: UUID, plan: _ManualPlan, chunks_written: int) -> None:
+        """Count a manual's committed changes and drop its cached answers."""
+        summary = self._summary
+        summary.chunks_reused += len(plan.kept)
+        summary.chunks_deleted += len(plan.removed)
+        summary.pages_reused += plan.pages_reused
+        if chunks_written:
+            summary.chunks_written[manual_id] = summary.chunks_written.get(manual_id, 0) + chunks_written
+
+        if plan.replace_all or plan.removed or chunks_written:
+            self._invalidate_answers(manual_id)
+
+    async def _embed(self, batch: _ChunkBatch):
+        """Embed a batch of chunks in one call where the service supports it."""
+        texts = [chunk.content for chunk in batch.chunks]
+
+        batch_embed = getattr(self.embedding_service, 'generate_embeddings', None)
+        if batch_embed is not None:
+            batch.embeddings = list(await batch_embed(texts))
+        else:
+            batch.embeddings = list(await asyncio.gather(
+                *(self.embedding_service.generate_embedding(text) for text in texts)
+            ))
+
+        yield batch
+
+    async def _write(self, batch: _ChunkBatch):
+        """
+        Insert a batch of chunks in one round-trip.
+
+        Binary COPY when the pool has the pgvector codec, otherwise a single
+        executemany with text vector literals. Batches are staged until the
+        manual's last one, then its plan (old chunks deleted, kept chunks
+        re-indexed, pages updated) and all new chunks commit in one transaction.
+        """
+        if self.binary_vectors is None:
+            self.binary_vectors = await supports_binary_vectors(self.db_pool)
+
+        encode = (lambda e: array('f', e)) if self.binary_vectors else vector_literal
+        records = [
+            (
+                batch.job.manual_id,
+                chunk.chunk_index,
+                chunk.content,
+                chunk.page_number,
+                chunk.section_title,
+                chunk.keywords,
+                encode(embedding),
+                chunk.checksum,
+            )
+            for chunk, embedding in zip(batch.chunks, batch.embeddings)
+        ]
+
+        manual_id = batch.job.manual_id
+
+        staged = self._staged.setdefault(manual_id, [])
+        staged.append(records)
+        if len(staged) < batch.manual_batches:
+            yield batch
+            return
+
+        del self._staged[manual_id]
+        plan = self._plans.pop(manual_id)
+        records = [record for part in staged for record in part]
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                await self._apply_plan(conn, manual_id, plan)
+                await self._insert_records(conn, records)
+
+        self._committed(manual_id, plan, len(records))
+        yield batch
+
+    def _invalidate_answers(self, manual_id: UUID) -> None:
+        """Drop cached answers built from a manual's previous chunks."""
+        if self.answer_cache is not None:
+            self.answer_cache.invalidate_manual(manual_id)
+
+    async def _insert_records(self, conn: asyncpg.Connection, records: List[tuple]) -> None:
+        """Insert encoded chunk records (COPY or executemany)."""
+        if self.binary_vectors:
+            await conn.copy_records_to_table(
+                'manual_chunks',
+                records=records,
+                columns=[
+                    'manual_id', 'chunk_index', 'content', 'page_number',
+                    'section_title', 'keywords', 'embedding', 'content_sha256',
+                ]
+            )
+        else:
+            await conn.executemany(
+                """
+                INSERT INTO manual_chunks
+                    (manual_id, chunk_index, content, page_number,
+                     section_title, keywords, embedding, content_sha256)
+                VALUES ($1, $2, $3, $4, $5, $6, $7::vector, $8)
+                """,
+                records
+            )
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage throughput metrics."""
+        return {name: m.as_dict() for name, m in self.metrics.items()}
+
+
+__all__ = [
+    "ChunkIngestionPipeline",
+    "IngestJob",
+    "PipelineSummary",
+    "StageMetrics",
+]
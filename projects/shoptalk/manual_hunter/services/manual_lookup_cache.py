@@ -0,0 +1,174 @@
+"""
+Manual Lookup Cache
+
+In-process LRU/TTL cache in front of the manual_files and manual_cache
+lookups done by ManualService.search_manual.
+
+Features:
+- Keyed on normalized (manufacturer, model) per lookup tier
+- Caches negative results (shorter TTL) so repeat misses skip Postgres
+- Bounded LRU eviction
+- Hit/miss counters for get_cache_stats
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Sentinel distinguishing "not in cache" from a cached negative result (None)
+MISSING = object()
+
+
+def normalize_key(manufacturer: str, model: str) -> Tuple[str, str]:
+    """Normalize a manufacturer/model pair the same way the SQL does (LOWER + trim)."""
+    return (manufacturer or "").strip().lower(), (model or "").strip().lower()
+
+
+class ManualLookupCache:
+    """
+    Bounded LRU cache with separate TTLs for positive and negative entries.
+
+    Not thread-safe by design: ManualService runs on a single event loop and
+    every operation here is synchronous, so no await happens mid-update.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 300.0,
+        negative_ttl_seconds: float = 60.0
+    ):
+        """
+        Initialize lookup cache.
+
+        Args:
+            max_entries: Maximum cached keys before LRU eviction
+            ttl_seconds: Lifetime of positive (found) entries
+            negative_ttl_seconds: Lifetime of negative (not found) entries
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+        # key -> (expires_at, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Look up a key.
+
+        Returns:
+            A copy of the cached dict, None for a cached negative result,
+            or MISSING if the key is absent or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        if value is None:
+            self.negative_hits += 1
+            return None
+
+        self.hits += 1
+        # Callers decorate result dicts, so never hand out the cached object
+        return dict(value)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Optional[Dict[str, Any]],
+        ttl: Optional[float] = None
+    ) -> None:
+        """
+        Store a result (None = negative result).
+
+        Args:
+            key: Cache key
+            value: Result dict, or None for a negative result
+            ttl: Override lifetime in seconds (default: by positive/negative)
+        """
+        if self.max_entries <= 0:
+            return
+
+        if ttl is None:
+            ttl = self.ttl_seconds if value is not None else self.negative_ttl_seconds
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (
+            time.monotonic() + ttl,
+            dict(value) if value is not None else None
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, manufacturer: str, model: str) -> int:
+        """
+        Drop every tier's entry for a manufacturer/model pair.
+
+        Keys are tuples of (tier, manufacturer, model, ...), so this matches
+        on positions 1-2 regardless of tier or extra qualifiers.
+
+        Returns:
+            Number of entries removed
+        """
+        mfr_key, model_key = normalize_key(manufacturer, model)
+        stale = [
+            key for key in self._entries
+            if isinstance(key, tuple) and key[1:3] == (mfr_key, model_key)
+        ]
+        for key in stale:
+            del self._entries[key]
+
+        if stale:
+            self.invalidations += len(stale)
+            logger.debug(f"Lookup cache invalidated | {manufacturer} {model} | entries={len(stale)}")
+
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for reporting."""
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            'memory_entries': len(self._entries),
+            'memory_hits': self.hits,
+            'memory_negative_hits': self.negative_hits,
+            'memory_misses': self.misses,
+            'memory_evictions': self.evictions,
+            'memory_invalidations': self.invalidations,
+            'memory_hit_rate_pct': (
+                int(100 * (self.hits + self.negative_hits) / lookups) if lookups else 0
+            ),
+        }
+
+
+__all__ = [
+    "ManualLookupCache",
+    "MISSING",
+    "normalize_key",
+]
@@ -4,7 +4,7 @@ Manual Matcher Service - LLM-validated manual matching with multiple manuals sup
 Intelligent manual discovery with:
 - Multi-source manual search (Tavily, manufacturer sites)
 - LLM validation (Groq primary, Claude fallback)
-- PDF parsing and analysis (PyPDF2)
+- PDF parsing and analysis (PyPDF2, streamed with HTTP Range requests)
 - Multiple manuals storage (all with confidence ≥0.70)
 - Human-in-loop verification for inconclusive results (0.70-0.85)
 - Persistent retry logic with exponential backoff
@@ -17,9 +17,7 @@ import re
 from typing import Dict, List, Optional, Any
 from uuid import UUID
 from datetime import datetime, timedelta
-from io import BytesIO
 
-import httpx
 try:
     import PyPDF2
     PDF_AVAILABLE = True
@@ -29,6 +27,9 @@ except ImportError:
 from rivet_pro.infra.observability import get_logger
 from rivet_pro.core.services.manual_service import ManualService
 from rivet_pro.core.feature_flags import FeatureFlagManager
+from .http_pool import get_http_client
+from .retry_worker import ManualRetryWorker
+from .pdf_probe import PDFProbe
 
 # LLM imports
 try:
@@ -69,8 +70,13 @@ class ManualMatcherService:
     def __init__(self, db):
         self.db = db
         self.manual_service = ManualService(db)
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.http_client = get_http_client()  # Shared pool - do not close here
         self.flags = FeatureFlagManager()
+        self._retry_worker: Optional[ManualRetryWorker] = None
+
+    async def close(self) -> None:
+        """Flush ManualService access tracking. The shared HTTP pool is closed by the app."""
+        await self.manual_service.close()
 
     async def search_and_validate_manual(
         self,
@@ -313,9 +319,10 @@ class ManualMatcherService:
                 "manual_type": "unknown"
             }
 
-        # Extract manual metadata
-        manual_title = await self._get_pdf_title(url)
-        first_pages = await self._extract_pdf_first_pages(url, max_pages=2)
+        # Extract manual metadata (one probe: bytes fetched once, via Range requests)
+        probe = PDFProbe(self.http_client)
+        manual_title = await self._get_pdf_title(url, probe)
+        first_pages = await self._extract_pdf_first_pages(url, max_pages=2, probe=probe)
 
         prompt = f"""Does this manual match {manufacturer} {model} ({equipment_type})?
 Manual: {manual_title} | {url}
@@ -336,8 +343,10 @@ STRICT: Model must match exactly. matches=false if search page, wrong model, or
             }
 
         try:
-            # Use Claude Sonnet 4.5
-            response = anthropic_client.messages.create(
+            # Use Claude Sonnet 4.5 (sync SDK - run off the event loop)
+            await self.manual_service._throttle('claude')
+            response = await asyncio.to_thread(
+                anthropic_client.messages.create,
                 model="claude-sonnet-4-5-20250929",
                 max_tokens=300,
                 temperature=0.1,
@@ -361,41 +370,32 @@ STRICT: Model must match exactly. matches=false if search page, wrong model, or
                 "manual_type": "unknown"
             }
 
-    async def _get_pdf_title(self, url: str) -> str:
+    async def _get_pdf_title(self, url: str, probe: Optional[PDFProbe] = None) -> str:
         """Extract PDF title from metadata."""
         if not PDF_AVAILABLE:
             return "Unknown"
 
         try:
-            response = await self.http_client.get(url, follow_redirects=True)
-            pdf_bytes = BytesIO(response.content)
-            reader = PyPDF2.PdfReader(pdf_bytes)
-
-            if reader.metadata and reader.metadata.title:
-                return reader.metadata.title
-
-            return "Unknown"
+            probe = probe or PDFProbe(self.http_client)
+            return await probe.get_title(url) or "Unknown"
 
         except Exception as e:
             logger.warning(f"Failed to extract PDF title from {url}: {e}")
             return "Unknown"
 
-    async def _extract_pdf_first_pages(self, url: str, max_pages: int = 2) -> str:
+    async def _extract_pdf_first_pages(
+        self,
+        url: str,
+        max_pages: int = 2,
+        probe: Optional[PDFProbe] = None
+    ) -> str:
         """Extract text from first N pages of PDF."""
         if not PDF_AVAILABLE:
             return ""
 
         try:
-            response = await self.http_client.get(url, follow_redirects=True)
-            pdf_bytes = BytesIO(response.content)
-            reader = PyPDF2.PdfReader(pdf_bytes)
-
-            text = ""
-            for i in range(min(max_pages, len(reader.pages))):
-                page = reader.pages[i]
-                text += page.extract_text() + "\n\n"
-
-            return text.strip()
+            probe = probe or PDFProbe(self.http_client)
+            return await probe.extract_first_pages(url, max_pages=max_pages)
 
         except Exception as e:
             logger.warning(f"Failed to extract PDF pages from {url}: {e}")
@@ -655,47 +655,22 @@ Use /manual {equipment_number} for instant retrieval."""
         except Exception as e:
             logger.error(f"Failed to mark search as failed: {e}", exc_info=True)
 
-    async def process_pending_retries(self) -> int:
-        """Process equipment with next_retry_at < NOW(). Returns count processed."""
-        try:
-            # Get pending retries
-            pending = await self.db.fetch("""
-                SELECT ems.equipment_id, e.manufacturer, e.model_number,
-                       e.equipment_type, ems.telegram_chat_id, ems.retry_count
-                FROM equipment_manual_searches ems
-                JOIN cmms_equipment e ON e.id = ems.equipment_id
-                WHERE ems.search_status = 'retrying'
-                    AND ems.next_retry_at < NOW()
-                ORDER BY ems.next_retry_at ASC
-                LIMIT 20
-            """)
-
-            if not pending:
-                return 0
-
-            count = 0
-            for record in pending:
-                try:
-                    logger.info(
-                        f"Processing retry | equipment_id={record['equipment_id']} | "
-                        f"attempt={record['retry_count']}"
-                    )
-
-                    await self.search_and_validate_manual(
-                        equipment_id=record['equipment_id'],
-                        manufacturer=record['manufacturer'],
-                        model=record['model_number'],
-                        equipment_type=record['equipment_type'],
-                        telegram_chat_id=record['telegram_chat_id']
-                    )
-
-                    count += 1
-                    await asyncio.sleep(5)  # Rate limit
+    async def process_pending_retries(
+        self,
+        concurrency: int = 4,
+        max_rows: Optional[int] = None
+    ) -> int:
+        """
+        Process equipment with next_retry_at < NOW(). Returns count processed.
 
-                except Exception as e:
-                    logger.error(f"Retry failed for {record['equipment_id']}: {e}")
+        Rows are claimed with FOR UPDATE SKIP LOCKED and processed concurrently
+        by ManualRetryWorker, so it is safe to call from several workers.
+        """
+        try:
+            if self._retry_worker is None or self._retry_worker.concurrency != concurrency:
+                self._retry_worker = ManualRetryWorker(self, concurrency=concurrency)
 
-            return count
+            return await self._retry_worker.run_once(max_rows=max_rows)
 
         except Exception as e:
             logger.error(f"Failed to process pending retries: {e}", exc_info=True)
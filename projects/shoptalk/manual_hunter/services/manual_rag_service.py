@@ -5,23 +5,83 @@ Retrieves relevant manual chunks using vector similarity search.
 Formats retrieved chunks with citations for LLM prompts.
 
 Uses:
-- EmbeddingService for query embedding generation
+- EmbeddingService for query embedding generation (cached per query)
 - manual_chunks table with pgvector for similarity search
+- Keyword (fault/parameter code) and full-text search, fused with the
+  vector ranking by reciprocal-rank fusion (hybrid mode)
+- Per-query hnsw.ef_search and an EXPLAIN self-check (vector_index)
 - Page number and section title for citations
+- Token-budgeted context: adjacent chunks merged, overlap sent once;
+  per-query tokens used/saved reported to the Watchman (token_reporter)
+- Batched neighbour-window expansion, merged and de-duplicated (context_assembler)
 """
 
+import asyncio
+import json
 import logging
+import re
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union
 from uuid import UUID
 
 import asyncpg
 
 from rivet.services.embedding_service import EmbeddingService
 
+from .context_assembler import (
+    CHARS_PER_TOKEN,
+    ContextBlock,
+    build_blocks,
+    estimate_tokens,
+    pack_blocks,
+)
+from .embedding_cache import QueryEmbeddingCache
+from .pdf_chunker_service import PDFChunkerService
+from .pgvector_codec import supports_binary_vectors, vector_literal
+from .token_reporter import TokenUsageReporter
+from .vector_index import (
+    DEFAULT_EF_SEARCH,
+    HAS_MANUFACTURER_ID_SQL,
+    PLAN_SAMPLE_SQL,
+    find_seq_scans,
+    manufacturer_scope,
+    search_settings,
+    vector_search_sql,
+)
+
 logger = logging.getLogger(__name__)
 
 
+# Reciprocal-rank fusion constant (standard value from Cormack et al.)
+RRF_K = 60
+
+# Every center chunk's neighbour window in one query. $1 = chunk IDs in
+# relevance order (rank = position), $2 = window. Served by the
+# (manual_id, chunk_index) index.
+WINDOWS_SQL = """
+    WITH centers AS (
+        SELECT c.manual_id, c.chunk_index, t.rank
+        FROM unnest($1::uuid[]) WITH ORDINALITY AS t(id, rank)
+        JOIN manual_chunks c ON c.id = t.id
+    )
+    SELECT DISTINCT ON (mc.id)
+        mc.id as chunk_id,
+        mc.manual_id,
+        mc.content,
+        mc.page_number,
+        mc.section_title,
+        mc.keywords,
+        mc.chunk_index,
+        ce.rank
+    FROM centers ce
+    JOIN manual_chunks mc
+      ON mc.manual_id = ce.manual_id
+     AND mc.chunk_index BETWEEN ce.chunk_index - $2 AND ce.chunk_index + $2
+    ORDER BY mc.id, ce.rank
+"""
+
+
 @dataclass
 class ManualChunkResult:
     """A retrieved chunk with similarity score."""
@@ -32,6 +92,8 @@ class ManualChunkResult:
     section_title: Optional[str]
     keywords: List[str]
     similarity: float  # 0.0 to 1.0, higher = more similar
+    keyword_match: bool = False  # Exact fault/parameter code hit
+    chunk_index: Optional[int] = None  # Position in the manual (adjacency)
 
     @property
     def citation(self) -> str:
@@ -57,7 +119,18 @@ class RAGResult:
     formatted_context: str
     citations: List[Citation]
     top_similarity: float
-    query_tokens_used: int = 0
+    query_tokens_used: int = 0  # Estimated tokens in formatted_context
+    keyword_hits: int = 0
+    context_tokens_saved: int = 0  # Duplicate chunk overlap not sent
+
+
+@dataclass
+class ExpandedContext:
+    """Neighbour-expanded, de-duplicated context for a set of result chunks."""
+    blocks: List[ContextBlock]
+    formatted_context: str
+    tokens_used: int = 0
+    tokens_saved: int = 0  # Duplicate overlap not sent
 
 
 class ManualRAGService:
@@ -66,6 +139,8 @@ class ManualRAGService:
 
     Features:
     - Vector similarity search with pgvector
+    - Hybrid mode: keyword/full-text search run concurrently and fused
+      with the vector ranking (reciprocal-rank fusion)
     - Optional manual/manufacturer filtering
     - Citation formatting with page numbers
     - Query enhancement from conversation history
@@ -74,7 +149,14 @@ class ManualRAGService:
     def __init__(
         self,
         db_pool: asyncpg.Pool,
-        embedding_service: Optional[EmbeddingService] = None
+        embedding_service: Optional[EmbeddingService] = None,
+        hybrid: bool = True,
+        embedding_cache: Optional[QueryEmbeddingCache] = None,
+        binary_vectors: Optional[bool] = None,
+        ef_search: int = DEFAULT_EF_SEARCH,
+        ivfflat_probes: Optional[int] = None,
+        context_token_budget: int = 2000,
+        token_reporter: Optional[TokenUsageReporter] = None
     ):
         """
         Initialize RAG service.
@@ -82,12 +164,41 @@ class ManualRAGService:
         Args:
             db_pool: Database connection pool
             embedding_service: EmbeddingService instance. Created if None.
+            hybrid: Fuse keyword/full-text hits with vector results
+            embedding_cache: Query embedding cache. In-memory LRU if None;
+                pass QueryEmbeddingCache(disk_dir=...) to persist vectors.
+            binary_vectors: Send query vectors in binary (pool created with
+                init=register_vector_codec). None = detect on first query.
+            ef_search: hnsw.ef_search per query (raised to top_k if lower);
+                higher = better recall on filtered searches, slower
+            ivfflat_probes: ivfflat.probes per query (IVFFlat index only)
+            context_token_budget: Approximate token limit for formatted_context
+            token_reporter: Sends context tokens used/saved to the Watchman's
+                daily budget. TokenUsageReporter() (local Watchman) if None.
         """
         self.db_pool = db_pool
         self.embedding_service = embedding_service or EmbeddingService()
+        self.hybrid = hybrid
+        self.embedding_cache = embedding_cache or QueryEmbeddingCache(
+            namespace=getattr(self.embedding_service, 'model_name', '')
+        )
+        self.binary_vectors = binary_vectors
+        self.ef_search = ef_search
+        self.ivfflat_probes = ivfflat_probes
+        self._manufacturer_id_column: Optional[bool] = None
+        self.context_token_budget = context_token_budget
+        self.token_reporter = token_reporter or TokenUsageReporter()
+
+        self.context_queries = 0
+        self.context_tokens_used = 0
+        self.context_tokens_saved = 0
 
         logger.info("ManualRAGService initialized")
 
+    async def close(self) -> None:
+        """Send pending token usage to the Watchman. Call on shutdown."""
+        await self.token_reporter.close()
+
     async def retrieve_context(
         self,
         query: str,
@@ -127,48 +238,96 @@ class ManualRAGService:
         # Step 1: Enhance query with conversation context
         enhanced_query = self._enhance_query(query, conversation_history)
 
-        # Step 2: Generate query embedding
+        # Step 2: Generate query embedding (repeat questions hit the cache)
         try:
-            query_embedding = await self.embedding_service.generate_embedding(
-                enhanced_query
+            query_embedding = await self.embedding_cache.get_or_embed(
+                enhanced_query,
+                self.embedding_service.generate_embedding
             )
         except Exception as e:
             logger.error(f"[Manual RAG] Embedding failed: {e}")
             return self._empty_result()
 
-        # Step 3: Vector search
-        chunks = await self._vector_search(
-            query_embedding=query_embedding,
+        query_vector = await self._vector_param(query_embedding)
+
+        # Step 3: Vector search (+ keyword search in hybrid mode, concurrently)
+        vector_task = self._vector_search(
+            query_vector=query_vector,
             manual_id=manual_id,
             manufacturer=manufacturer,
             top_k=top_k,
             min_similarity=min_similarity
         )
 
+        keyword_chunks: List[ManualChunkResult] = []
+        if self.hybrid:
+            vector_chunks, keyword_chunks = await asyncio.gather(
+                vector_task,
+                self._keyword_search(
+                    query=query,
+                    query_vector=query_vector,
+                    manual_id=manual_id,
+                    manufacturer=manufacturer,
+                    top_k=top_k,
+                    min_similarity=min_similarity
+                )
+            )
+            chunks = reciprocal_rank_fusion([keyword_chunks, vector_chunks])[:top_k]
+        else:
+            chunks = await vector_task
+
         if not chunks:
             logger.info("[Manual RAG] No chunks found above threshold")
             return self._empty_result()
 
         # Step 4: Format results
-        formatted_context = self._format_context(chunks)
+        formatted_context, tokens_used, tokens_saved = self._format_context(chunks)
         citations = self._extract_citations(chunks)
         top_similarity = max(c.similarity for c in chunks)
 
+        keyword_hits = sum(1 for c in chunks if c.keyword_match)
+
+        self.context_queries += 1
+        self.context_tokens_used += tokens_used
+        self.context_tokens_saved += tokens_saved
+        self.token_reporter.record(tokens_used, tokens_saved)
+
         logger.info(
             f"[Manual RAG] Retrieved {len(chunks)} chunks "
-            f"(top similarity: {top_similarity:.2f})"
+            f"(top similarity: {top_similarity:.2f}, keyword hits: {keyword_hits}) | "
+            f"context_tokens={tokens_used} | tokens_saved={tokens_saved}"
         )
 
         return RAGResult(
             chunks=chunks,
             formatted_context=formatted_context,
             citations=citations,
-            top_similarity=top_similarity
+            top_similarity=top_similarity,
+            query_tokens_used=tokens_used,
+            keyword_hits=keyword_hits,
+            context_tokens_saved=tokens_saved
         )
 
+    async def _vector_param(self, embedding: List[float]) -> Union[array, str]:
+        """Encode a query vector for a $n::vector parameter (binary if the pool supports it)."""
+        if self.binary_vectors is None:
+            self.binary_vectors = await supports_binary_vectors(self.db_pool)
+        return array('f', embedding) if self.binary_vectors else vector_literal(embedding)
+
+    async def _has_manufacturer_id(self) -> bool:
+        """Whether manual_chunks.manufacturer_id exists (scripts/migrate_vector_indexes.py)."""
+        if self._manufacturer_id_column is None:
+            try:
+                async with self.db_pool.acquire() as conn:
+                    self._manufacturer_id_column = bool(await conn.fetchval(HAS_MANUFACTURER_ID_SQL))
+            except Exception as e:
+                logger.warning(f"[Manual RAG] manufacturer_id detection failed: {e}")
+                return False
+        return self._manufacturer_id_column
+
     async def _vector_search(
         self,
-        query_embedding: List[float],
+        query_vector: Union[array, str],
         manual_id: Optional[UUID],
         manufacturer: Optional[str],
         top_k: int,
@@ -178,73 +337,32 @@ class ManualRAGService:
         Execute vector similarity search against manual_chunks.
 
         Uses pgvector cosine distance: 1 - (embedding <=> query)
+
+        Args:
+            query_vector: Query embedding encoded by _vector_param
         """
         try:
-            # Build embedding string for pgvector
-            embedding_str = f"[{','.join(str(x) for x in query_embedding)}]"
+            denormalized = await self._has_manufacturer_id()
 
-            # Build query based on filters
             if manual_id:
                 # Search specific manual
-                query = """
-                    SELECT
-                        mc.id as chunk_id,
-                        mc.manual_id,
-                        mc.content,
-                        mc.page_number,
-                        mc.section_title,
-                        mc.keywords,
-                        1 - (mc.embedding <=> $1::vector) as similarity
-                    FROM manual_chunks mc
-                    WHERE mc.manual_id = $2
-                      AND mc.embedding IS NOT NULL
-                    ORDER BY mc.embedding <=> $1::vector
-                    LIMIT $3
-                """
-                params = [embedding_str, manual_id, top_k]
-
+                scope, params = 'manual', [query_vector, manual_id, top_k]
             elif manufacturer:
-                # Search by manufacturer (join through equipment_models)
-                query = """
-                    SELECT
-                        mc.id as chunk_id,
-                        mc.manual_id,
-                        mc.content,
-                        mc.page_number,
-                        mc.section_title,
-                        mc.keywords,
-                        1 - (mc.embedding <=> $1::vector) as similarity
-                    FROM manual_chunks mc
-                    JOIN manuals m ON mc.manual_id = m.id
-                    JOIN equipment_models em ON m.equipment_model_id = em.id
-                    JOIN manufacturers mfr ON em.manufacturer_id = mfr.id
-                    WHERE LOWER(mfr.name) = LOWER($2)
-                      AND mc.embedding IS NOT NULL
-                    ORDER BY mc.embedding <=> $1::vector
-                    LIMIT $3
-                """
-                params = [embedding_str, manufacturer, top_k]
-
+                # Search by manufacturer (manual_chunks.manufacturer_id once migrated)
+                scope, params = 'manufacturer', [query_vector, manufacturer, top_k]
             else:
                 # Search all manuals
-                query = """
-                    SELECT
-                        mc.id as chunk_id,
-                        mc.manual_id,
-                        mc.content,
-                        mc.page_number,
-                        mc.section_title,
-                        mc.keywords,
-                        1 - (mc.embedding <=> $1::vector) as similarity
-                    FROM manual_chunks mc
-                    WHERE mc.embedding IS NOT NULL
-                    ORDER BY mc.embedding <=> $1::vector
-                    LIMIT $2
-                """
-                params = [embedding_str, top_k]
+                scope, params = 'global', [query_vector, top_k]
+
+            query = vector_search_sql(scope, denormalized)
 
             async with self.db_pool.acquire() as conn:
-                rows = await conn.fetch(query, *params)
+                # SET LOCAL: ANN settings apply to this query only
+                async with conn.transaction():
+                    await conn.execute("; ".join(
+                        search_settings(top_k, self.ef_search, self.ivfflat_probes)
+                    ))
+                    rows = await conn.fetch(query, *params)
 
             # Filter by minimum similarity and convert to results
             chunks = []
@@ -258,7 +376,8 @@ class ManualRAGService:
                         page_number=row['page_number'] or 1,
                         section_title=row['section_title'],
                         keywords=row['keywords'] or [],
-                        similarity=similarity
+                        similarity=similarity,
+                        chunk_index=row['chunk_index']
                     ))
 
             return chunks
@@ -267,6 +386,161 @@ class ManualRAGService:
             logger.error(f"[Manual RAG] Vector search failed: {e}")
             return []
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Embedding cache and context token counters (feed the daily token budget)."""
+        return {
+            **self.embedding_cache.stats(),
+            'context_queries': self.context_queries,
+            'context_tokens_used': self.context_tokens_used,
+            'context_tokens_saved': self.context_tokens_saved,
+            **self.token_reporter.stats(),
+        }
+
+    async def check_query_plans(self, top_k: int = 5) -> Dict[str, List[str]]:
+        """
+        EXPLAIN the vector search for each scope and warn on sequential scans.
+
+        Uses a real chunk's embedding, manual and manufacturer as parameters.
+        A Seq Scan on manual_chunks means the ANN / filter indexes are missing
+        or not chosen (run scripts/migrate_vector_indexes.py, then ANALYZE).
+
+        Returns:
+            Scope ('global', 'manual', 'manufacturer') -> seq scan descriptions
+        """
+        denormalized = await self._has_manufacturer_id()
+        issues: Dict[str, List[str]] = {}
+
+        async with self.db_pool.acquire() as conn:
+            sample = await conn.fetchrow(PLAN_SAMPLE_SQL)
+            if not sample:
+                logger.info("[Manual RAG] Plan check skipped: no embedded chunks")
+                return issues
+
+            # Text literal works with and without the binary codec
+            scopes = {
+                'global': [sample['embedding'], top_k],
+                'manual': [sample['embedding'], sample['manual_id'], top_k],
+            }
+            if sample['manufacturer']:
+                scopes['manufacturer'] = [sample['embedding'], sample['manufacturer'], top_k]
+
+            async with conn.transaction():
+                await conn.execute("; ".join(
+                    search_settings(top_k, self.ef_search, self.ivfflat_probes)
+                ))
+                for scope, params in scopes.items():
+                    plan = await conn.fetchval(
+                        "EXPLAIN (FORMAT JSON) " + vector_search_sql(scope, denormalized),
+                        *params
+                    )
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+
+                    issues[scope] = find_seq_scans(plan)
+                    for issue in issues[scope]:
+                        logger.warning(f"[Manual RAG] Vector search plan | scope={scope} | {issue}")
+
+        return issues
+
+    def _extract_query_codes(self, query: str) -> List[str]:
+        """Fault/parameter codes and specs in the query, normalized like chunk keywords."""
+        codes = []
+        for pattern in PDFChunkerService.CODE_PATTERNS:
+            for match in re.finditer(pattern, query, re.IGNORECASE):
+                code = match.group(0).upper()
+                if code not in codes:
+                    codes.append(code)
+        return codes
+
+    async def _keyword_search(
+        self,
+        query: str,
+        query_vector: Union[array, str],
+        manual_id: Optional[UUID],
+        manufacturer: Optional[str],
+        top_k: int,
+        min_similarity: float
+    ) -> List[ManualChunkResult]:
+        """
+        Exact keyword-array and full-text search against manual_chunks.
+
+        Served by the GIN indexes on keywords and to_tsvector(content), so
+        code lookups ("F0001", "P1080") don't depend on embedding similarity:
+        exact code hits are not subject to min_similarity. Full-text hits
+        must contain every query term and still meet min_similarity.
+        Ranked by matched codes, then full-text rank.
+        """
+        codes = self._extract_query_codes(query)
+
+        try:
+            params: List[Any] = [query_vector, codes, query, top_k, min_similarity]
+
+            if manual_id:
+                join = ""
+                scope = "AND mc.manual_id = $6"
+                params.append(manual_id)
+            elif manufacturer:
+                fragments = manufacturer_scope("$6", await self._has_manufacturer_id())
+                join = fragments['join']
+                scope = f"AND {fragments['where']}"
+                params.append(manufacturer)
+            else:
+                join = ""
+                scope = ""
+
+            # All terms must match (AND); parameter-only, so the GIN index is used
+            tsquery = "plainto_tsquery('english', $3)"
+
+            query_sql = f"""
+                SELECT
+                    mc.id as chunk_id,
+                    mc.manual_id,
+                    mc.content,
+                    mc.page_number,
+                    mc.section_title,
+                    mc.keywords,
+                    mc.chunk_index,
+                    1 - (mc.embedding <=> $1::vector) as similarity,
+                    cardinality(ARRAY(
+                        SELECT unnest(mc.keywords) INTERSECT SELECT unnest($2::text[])
+                    )) as code_hits,
+                    ts_rank(to_tsvector('english', mc.content), {tsquery}) as text_rank
+                FROM manual_chunks mc
+                {join}
+                WHERE (
+                    mc.keywords && $2::text[]
+                    OR (
+                        to_tsvector('english', mc.content) @@ {tsquery}
+                        AND 1 - (mc.embedding <=> $1::vector) >= $5
+                    )
+                )
+                {scope}
+                ORDER BY code_hits DESC, text_rank DESC
+                LIMIT $4
+            """
+
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(query_sql, *params)
+
+            return [
+                ManualChunkResult(
+                    chunk_id=row['chunk_id'],
+                    manual_id=row['manual_id'],
+                    content=row['content'],
+                    page_number=row['page_number'] or 1,
+                    section_title=row['section_title'],
+                    keywords=row['keywords'] or [],
+                    similarity=row['similarity'] or 0.0,
+                    keyword_match=row['code_hits'] > 0,
+                    chunk_index=row['chunk_index']
+                )
+                for row in rows
+            ]
+
+        except Exception as e:
+            logger.error(f"[Manual RAG] Keyword search failed: {e}")
+            return []
+
     def _enhance_query(
         self,
         query: str,
@@ -296,44 +570,64 @@ class ManualRAGService:
         enhanced = " | ".join(parts)
         return enhanced[:2000]  # Limit for embedding
 
-    def _format_context(self, chunks: List[ManualChunkResult]) -> str:
+    def _format_context(self, chunks: List[ManualChunkResult]) -> Tuple[str, int, int]:
         """
         Format chunks as structured context for LLM prompt.
 
-        Returns Markdown-formatted context with citations.
+        Adjacent chunks of the same manual are merged with their overlap sent
+        once, then blocks are packed by relevance (chunk order) into
+        context_token_budget.
+
+        Returns:
+            (Markdown-formatted context with citations, tokens used, tokens
+            saved by overlap de-duplication)
         """
         if not chunks:
-            return self._no_context_message()
+            return self._no_context_message(), 0, 0
+
+        by_id = {chunk.chunk_id: chunk for chunk in chunks}
+        blocks = build_blocks(
+            {
+                'chunk_id': chunk.chunk_id,
+                'manual_id': chunk.manual_id,
+                'chunk_index': chunk.chunk_index,
+                'content': chunk.content,
+                'page_number': chunk.page_number,
+                'section_title': chunk.section_title,
+                'keywords': chunk.keywords,
+                'rank': rank,
+            }
+            for rank, chunk in enumerate(chunks)
+        )
+        packed, tokens_used = pack_blocks(blocks, self.context_token_budget)
+        tokens_saved = sum(b.duplicate_chars for b in blocks) // CHARS_PER_TOKEN
 
         lines = ["## Relevant Manual Sections\n"]
 
-        for i, chunk in enumerate(chunks, 1):
+        for i, block in enumerate(packed, 1):
+            similarity = max(by_id[chunk_id].similarity for chunk_id in block.chunk_ids)
+
             # Confidence indicator
-            if chunk.similarity >= 0.85:
+            if similarity >= 0.85:
                 conf = "[HIGH CONFIDENCE]"
-            elif chunk.similarity >= 0.70:
+            elif similarity >= 0.70:
                 conf = "[MEDIUM CONFIDENCE]"
             else:
                 conf = "[LOW CONFIDENCE]"
 
             # Section header with citation
-            lines.append(f"### {i}. {chunk.citation} {conf}")
+            lines.append(f"### {i}. {block.citation} {conf}")
             lines.append("")
 
-            # Content (truncate if very long)
-            content = chunk.content
-            if len(content) > 1500:
-                content = content[:1500] + "..."
-
-            lines.append(content)
+            lines.append(block.content)
             lines.append("")
 
             # Keywords if present
-            if chunk.keywords:
-                lines.append(f"*Keywords: {', '.join(chunk.keywords[:5])}*")
+            if block.keywords:
+                lines.append(f"*Keywords: {', '.join(block.keywords[:5])}*")
                 lines.append("")
 
-        return "\n".join(lines)
+        return "\n".join(lines), tokens_used, tokens_saved
 
     def _extract_citations(self, chunks: List[ManualChunkResult]) -> List[Citation]:
         """Extract citation objects from chunks."""
@@ -379,50 +673,82 @@ class ManualRAGService:
         Returns:
             List of surrounding chunks (including center)
         """
-        try:
-            async with self.db_pool.acquire() as conn:
-                # Get the center chunk info
-                center = await conn.fetchrow(
-                    "SELECT manual_id, chunk_index FROM manual_chunks WHERE id = $1",
-                    chunk_id
-                )
+        rows = await self._fetch_windows([chunk_id], window)
+
+        return [
+            ManualChunkResult(
+                chunk_id=row['chunk_id'],
+                manual_id=row['manual_id'],
+                content=row['content'],
+                page_number=row['page_number'] or 1,
+                section_title=row['section_title'],
+                keywords=row['keywords'] or [],
+                similarity=1.0,  # Exact match for context expansion
+                chunk_index=row['chunk_index']
+            )
+            for row in sorted(rows, key=lambda r: r['chunk_index'])
+        ]
 
-                if not center:
-                    return []
-
-                # Get surrounding chunks
-                rows = await conn.fetch(
-                    """
-                    SELECT
-                        id as chunk_id,
-                        manual_id,
-                        content,
-                        page_number,
-                        section_title,
-                        keywords,
-                        chunk_index
-                    FROM manual_chunks
-                    WHERE manual_id = $1
-                      AND chunk_index BETWEEN $2 AND $3
-                    ORDER BY chunk_index
-                    """,
-                    center['manual_id'],
-                    center['chunk_index'] - window,
-                    center['chunk_index'] + window
-                )
+    async def expand_context(
+        self,
+        chunk_ids: List[UUID],
+        window: int = 1,
+        token_budget: int = 3000
+    ) -> ExpandedContext:
+        """
+        Expand result chunks with their neighbours in one query.
 
-                return [
-                    ManualChunkResult(
-                        chunk_id=row['chunk_id'],
-                        manual_id=row['manual_id'],
-                        content=row['content'],
-                        page_number=row['page_number'] or 1,
-                        section_title=row['section_title'],
-                        keywords=row['keywords'] or [],
-                        similarity=1.0  # Exact match for context expansion
-                    )
-                    for row in rows
-                ]
+        Overlapping windows are merged into one block per run of consecutive
+        chunks, the chunker's overlap between neighbours is sent once, and
+        blocks are packed by the best rank they contain until token_budget
+        is spent.
+
+        Args:
+            chunk_ids: Result chunk IDs, most relevant first
+            window: Number of chunks before/after each result
+            token_budget: Approximate token limit for the context block
+
+        Returns:
+            ExpandedContext with blocks in relevance order
+        """
+        rows = await self._fetch_windows(chunk_ids, window)
+        if not rows:
+            return ExpandedContext(blocks=[], formatted_context=self._no_context_message())
+
+        blocks = build_blocks(rows)
+        packed, tokens_used = pack_blocks(blocks, token_budget)
+
+        raw_tokens = sum(estimate_tokens(row['content']) for row in rows)
+        tokens_saved = max(0, raw_tokens - sum(b.tokens for b in blocks))
+
+        lines = ["## Relevant Manual Sections\n"]
+        for i, block in enumerate(packed, 1):
+            lines.append(f"### {i}. {block.citation}")
+            lines.append("")
+            lines.append(block.content)
+            lines.append("")
+
+        logger.info(
+            f"[Manual RAG] Expanded context | centers={len(chunk_ids)} | "
+            f"chunks={len(rows)} | blocks={len(packed)}/{len(blocks)} | "
+            f"tokens={tokens_used} | saved={tokens_saved}"
+        )
+
+        return ExpandedContext(
+            blocks=packed,
+            formatted_context="\n".join(lines),
+            tokens_used=tokens_used,
+            tokens_saved=tokens_saved
+        )
+
+    async def _fetch_windows(self, chunk_ids: List[UUID], window: int) -> List[Any]:
+        """Rows for every chunk within window of any center chunk (one round-trip)."""
+        if not chunk_ids:
+            return []
+
+        try:
+            async with self.db_pool.acquire() as conn:
+                return await conn.fetch(WINDOWS_SQL, list(chunk_ids), window)
 
         except Exception as e:
             logger.error(f"Failed to get surrounding chunks: {e}")
@@ -431,6 +757,39 @@ class ManualRAGService:
 
 # ===== Helper Functions =====
 
+def reciprocal_rank_fusion(
+    rankings: List[List[ManualChunkResult]],
+    k: int = RRF_K
+) -> List[ManualChunkResult]:
+    """
+    Merge ranked chunk lists: score(chunk) = sum over lists of 1 / (k + rank).
+
+    Chunks found by several lists are merged (keyword_match is kept if any
+    list set it). Ties keep first-seen order.
+
+    Args:
+        rankings: Ranked result lists, best first
+        k: Fusion constant; higher flattens the weight of top ranks
+
+    Returns:
+        Fused list, best first
+    """
+    scores: Dict[UUID, float] = {}
+    merged: Dict[UUID, ManualChunkResult] = {}
+
+    for ranking in rankings:
+        for rank, chunk in enumerate(ranking, 1):
+            scores[chunk.chunk_id] = scores.get(chunk.chunk_id, 0.0) + 1.0 / (k + rank)
+
+            seen = merged.get(chunk.chunk_id)
+            if seen is None:
+                merged[chunk.chunk_id] = chunk
+            elif chunk.keyword_match and not seen.keyword_match:
+                seen.keyword_match = True
+
+    return sorted(merged.values(), key=lambda c: scores[c.chunk_id], reverse=True)
+
+
 def calculate_rag_confidence(chunks: List[ManualChunkResult]) -> float:
     """
     Calculate overall RAG confidence from chunk similarities.
@@ -482,6 +841,8 @@ __all__ = [
     "ManualChunkResult",
     "Citation",
     "RAGResult",
+    "ExpandedContext",
     "calculate_rag_confidence",
+    "reciprocal_rank_fusion",
     "format_citations_for_response",
 ]
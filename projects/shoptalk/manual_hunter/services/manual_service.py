@@ -4,8 +4,9 @@ Caches manual URLs in database and searches via n8n Manual Hunter webhook.
 Also serves locally downloaded manuals (AUTO-KB-009).
 """
 
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
+import asyncio
 import httpx
 import json
 import time
@@ -15,6 +16,12 @@ from rivet_pro.config.settings import settings
 from rivet_pro.core.models.search_report import (
     SearchReport, SearchStage, SearchStatus
 )
+from .manual_lookup_cache import ManualLookupCache, MISSING, normalize_key
+from .access_tracker import AccessTracker
+from .single_flight import SingleFlight
+from .http_pool import get_http_client
+from .verdict_cache import VerdictCache
+from .rate_limiter import ProviderRateLimiter, current_rate_limiter
 
 logger = get_logger(__name__)
 
@@ -24,11 +31,14 @@ class ManualService:
     Service for searching and caching equipment manuals.
 
     Flow:
-    1. Check database cache first (instant)
+    1. Check in-process lookup cache, then database cache (instant)
     2. If not cached, call n8n Manual Hunter webhook
     3. Cache successful results for future lookups
     """
 
+    # Bump whenever the URL validation prompt changes - invalidates cached verdicts
+    VALIDATION_PROMPT_VERSION = "url-judge-v1"
+
     def __init__(self, db):
         """
         Initialize manual service.
@@ -40,6 +50,38 @@ class ManualService:
         self.tavily_api_key = settings.tavily_api_key
         self.use_tavily_direct = bool(self.tavily_api_key)
 
+        # In-process cache in front of manual_files / manual_cache lookups
+        self.lookup_cache = ManualLookupCache(
+            max_entries=getattr(settings, 'manual_lookup_cache_size', 2048),
+            ttl_seconds=getattr(settings, 'manual_lookup_cache_ttl', 300),
+            negative_ttl_seconds=getattr(settings, 'manual_lookup_cache_negative_ttl', 60)
+        )
+
+        # Write-behind access_count / last_accessed updates
+        self.access_tracker = AccessTracker(
+            db,
+            flush_interval=getattr(settings, 'manual_access_flush_interval', 10)
+        )
+
+        # Coalesce concurrent external searches for the same manufacturer/model
+        self.search_flights = SingleFlight()
+
+        # Cached LLM verdicts for URL validation (memory + manual_url_verdicts)
+        self.verdict_cache = VerdictCache(
+            db,
+            positive_ttl_seconds=getattr(settings, 'manual_verdict_ttl', 7 * 24 * 3600),
+            negative_ttl_seconds=getattr(settings, 'manual_verdict_negative_ttl', 24 * 3600)
+        )
+
+        # Optional per-provider token buckets for every call on this service;
+        # batch callers such as ManualRetryWorker scope theirs with use_rate_limiter()
+        self.rate_limiter: Optional[ProviderRateLimiter] = None
+
+        # Bounds concurrent LLM URL checks across all searches on this service
+        self.validation_semaphore = asyncio.Semaphore(
+            getattr(settings, 'manual_validation_concurrency', 3)
+        )
+
         # LLM configuration for URL validation
         self.anthropic_api_key = settings.anthropic_api_key
         self.openai_api_key = settings.openai_api_key
@@ -58,6 +100,16 @@ class ManualService:
             )
             logger.warning("Tavily API key not configured - will use n8n Manual Hunter webhook")
 
+    async def close(self) -> None:
+        """Flush pending access tracking. Call on shutdown."""
+        await self.access_tracker.close()
+
+    async def _throttle(self, provider: str) -> None:
+        """Wait for a rate-limit token for an external provider, if limiting is enabled."""
+        limiter = self.rate_limiter or current_rate_limiter()
+        if limiter:
+            await limiter.acquire(provider)
+
     async def search_manual(
         self,
         manufacturer: str,
@@ -147,18 +199,58 @@ class ManualService:
                 'is_local': False
             }, report
 
-        # 2. Cache miss - search externally (Tavily or n8n fallback)
+        # 2. Cache miss - search externally (Tavily or n8n fallback).
+        # Concurrent callers for the same pair share one in-flight search.
         search_method = "Tavily" if self.use_tavily_direct else "n8n"
         logger.info(f"Manual cache MISS | {mfr_clean} {model_clean} | Searching via {search_method}...")
 
+        (result, flight_report), shared = await self.search_flights.run(
+            normalize_key(mfr_clean, model_clean),
+            lambda: self._search_and_cache(mfr_clean, model_clean, timeout, report)
+        )
+
+        if shared:
+            logger.info(f"Joined in-flight manual search | {mfr_clean} {model_clean}")
+
+        # Followers receive the leader's SearchReport (same key, same cache misses)
+        if collect_report:
+            report = flight_report
+
+        return (dict(result) if result else None), report
+
+    async def _search_and_cache(
+        self,
+        manufacturer: str,
+        model: str,
+        timeout: int,
+        report: Optional[SearchReport] = None
+    ) -> Tuple[Optional[Dict[str, Any]], SearchReport]:
+        """
+        Run the external search and cache a successful result.
+
+        Executed once per in-flight key; the result and report are shared by
+        every coalesced caller, so a report is always collected here.
+
+        Args:
+            manufacturer: Equipment manufacturer (already stripped)
+            model: Equipment model number (already stripped)
+            timeout: Max seconds to wait for external search
+            report: Leader's SearchReport, or None to start a fresh one
+
+        Returns:
+            (manual info or None, SearchReport)
+        """
+        if report is None:
+            report = SearchReport(manufacturer=manufacturer, model=model)
+
         try:
-            result = await self._search_external(mfr_clean, model_clean, timeout, report)
+            result = await self._search_external(manufacturer, model, timeout, report)
 
             if result and result.get('url'):
                 # 3. Cache successful result
                 await self.cache_manual(
-                    manufacturer=mfr_clean,
-                    model=model_clean,
+                    manufacturer=manufacturer,
+                    model=model,
                     manual_url=result['url'],
                     manual_title=result.get('title'),
                     source=result.get('source', 'tavily')
@@ -167,26 +259,23 @@ class ManualService:
                 result['cached'] = False
                 result['is_local'] = False
                 result['local_path'] = None
-                logger.info(f"Manual found and cached | {mfr_clean} {model_clean}")
-                if report:
-                    report.complete(manual_found=True, manual_url=result['url'])
+                logger.info(f"Manual found and cached | {manufacturer} {model}")
+                report.complete(manual_found=True, manual_url=result['url'])
                 return result, report
 
-            logger.info(f"Manual not found | {mfr_clean} {model_clean}")
-            if report:
-                report.complete(manual_found=False)
+            logger.info(f"Manual not found | {manufacturer} {model}")
+            report.complete(manual_found=False)
             return None, report
 
         except Exception as e:
-            logger.error(f"Manual search failed | {mfr_clean} {model_clean} | error={e}")
-            if report:
-                report.add_stage(
-                    SearchStage.EXTERNAL_SEARCH,
-                    SearchStatus.ERROR,
-                    0,
-                    details=f"Error: {str(e)[:50]}"
-                )
-                report.complete(manual_found=False)
+            logger.error(f"Manual search failed | {manufacturer} {model} | error={e}")
+            report.add_stage(
+                SearchStage.EXTERNAL_SEARCH,
+                SearchStatus.ERROR,
+                0,
+                details=f"Error: {str(e)[:50]}"
+            )
+            report.complete(manual_found=False)
             return None, report
 
     async def get_local_manual(
@@ -215,66 +304,60 @@ class ManualService:
             }
             Returns None if not found locally.
         """
-        try:
-            row = await self.db.fetchrow(
-                """
-                SELECT
-                    file_path,
-                    filename,
-                    size_bytes,
-                    checksum_sha256,
-                    text_content IS NOT NULL as has_text,
-                    embedding_vector IS NOT NULL as has_embedding,
-                    downloaded_at,
-                    access_count
-                FROM manual_files
-                WHERE LOWER(manufacturer) = LOWER($1)
-                  AND LOWER(model) = LOWER($2)
-                  AND manual_type = $3
-                  AND file_path IS NOT NULL
-                """,
-                manufacturer,
-                model,
-                manual_type
-            )
-
-            if row:
-                file_path = row['file_path']
+        cache_key = ('local',) + normalize_key(manufacturer, model) + (manual_type,)
 
-                # Verify file still exists on disk
-                if not Path(file_path).exists():
-                    logger.warning(f"Local manual file missing | {manufacturer} {model} | path={file_path}")
-                    return None
+        try:
+            local = self.lookup_cache.get(cache_key)
 
-                # Update access tracking
-                await self.db.execute(
+            if local is MISSING:
+                row = await self.db.fetchrow(
                     """
-                    UPDATE manual_files
-                    SET last_accessed_at = NOW(),
-                        access_count = access_count + 1
+                    SELECT
+                        file_path,
+                        filename,
+                        size_bytes,
+                        checksum_sha256,
+                        text_content IS NOT NULL as has_text,
+                        embedding_vector IS NOT NULL as has_embedding,
+                        downloaded_at
+                    FROM manual_files
                     WHERE LOWER(manufacturer) = LOWER($1)
                       AND LOWER(model) = LOWER($2)
                       AND manual_type = $3
+                      AND file_path IS NOT NULL
                     """,
                     manufacturer,
                     model,
                     manual_type
                 )
 
-                logger.info(
-                    f"Local manual found | {manufacturer} {model} | "
-                    f"path={file_path} | access_count={row['access_count'] + 1}"
-                )
-
-                return {
-                    'file_path': file_path,
+                local = {
+                    'file_path': row['file_path'],
                     'filename': row['filename'],
                     'size_bytes': row['size_bytes'],
                     'checksum': row['checksum_sha256'],
                     'has_text': row['has_text'],
                     'has_embedding': row['has_embedding'],
                     'downloaded_at': row['downloaded_at']
-                }
+                } if row else None
+
+                self.lookup_cache.set(cache_key, local)
+
+            if local:
+                file_path = local['file_path']
+
+                # Verify file still exists on disk
+                if not Path(file_path).exists():
+                    logger.warning(f"Local manual file missing | {manufacturer} {model} | path={file_path}")
+                    self.lookup_cache.invalidate(manufacturer, model)
+                    return None
+
+                # Update access tracking (batched, flushed in the background)
+                self.access_tracker.record('manual_files', manufacturer, model, manual_type)
+
+                logger.info(f"Local manual found | {manufacturer} {model} | path={file_path}")
+
+                return local
 
             return None
 
@@ -337,31 +420,22 @@ class ManualService:
         Returns:
             Dict with cached manual info or None if not found
         """
+        cache_key = ('url',) + normalize_key(manufacturer, model)
+
         try:
-            row = await self.db.fetchrow(
-                """
-                SELECT
-                    manual_url,
-                    manual_title,
-                    source,
-                    verified,
-                    found_at,
-                    access_count
-                FROM manual_cache
-                WHERE LOWER(manufacturer) = LOWER($1)
-                  AND LOWER(model) = LOWER($2)
-                """,
-                manufacturer,
-                model
-            )
+            cached = self.lookup_cache.get(cache_key)
 
-            if row:
-                # Update access tracking
-                await self.db.execute(
+            if cached is MISSING:
+                row = await self.db.fetchrow(
                     """
-                    UPDATE manual_cache
-                    SET last_accessed = NOW(),
-                        access_count = access_count + 1
+                    SELECT
+                        manual_url,
+                        manual_title,
+                        source,
+                        verified,
+                        found_at,
+                        access_count
+                    FROM manual_cache
                     WHERE LOWER(manufacturer) = LOWER($1)
                       AND LOWER(model) = LOWER($2)
                     """,
@@ -369,7 +443,14 @@ class ManualService:
                     model
                 )
 
-                return dict(row)
+                cached = dict(row) if row else None
+                self.lookup_cache.set(cache_key, cached)
+
+            if cached:
+                # Update access tracking (batched, flushed in the background)
+                self.access_tracker.record('manual_cache', manufacturer, model)
+
+                return cached
 
             return None
 
@@ -383,6 +464,49 @@ class ManualService:
         manufacturer: str,
         model: str,
         timeout: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Validate a URL, reusing a cached verdict when one exists.
+
+        Only real LLM verdicts are cached; the safe-default rejections returned
+        when no provider answers are not, so the URL is retried next time.
+
+        Args:
+            url: URL to validate
+            manufacturer: Equipment manufacturer
+            model: Equipment model number
+            timeout: LLM API timeout in seconds (default: 5)
+
+        Returns:
+            Validation dict (see _validate_manual_url_llm), with 'cached': True
+            when served from the verdict cache
+        """
+        verdict = await self.verdict_cache.get(
+            url, manufacturer, model, self.VALIDATION_PROMPT_VERSION
+        )
+        if verdict is not None:
+            logger.info(
+                f"URL verdict cache HIT | {manufacturer} {model} | url={url[:100]} | "
+                f"is_direct_pdf={verdict.get('is_direct_pdf')}"
+            )
+            verdict['cached'] = True
+            return verdict
+
+        verdict = await self._validate_manual_url_llm(url, manufacturer, model, timeout)
+
+        if verdict.get('validated_by'):
+            await self.verdict_cache.set(
+                url, manufacturer, model, self.VALIDATION_PROMPT_VERSION, verdict
+            )
+
+        return verdict
+
+    async def _validate_manual_url_llm(
+        self,
+        url: str,
+        manufacturer: str,
+        model: str,
+        timeout: int = 5
     ) -> Dict[str, Any]:
         """
         Use LLM to validate if URL is a direct PDF manual link or search page.
@@ -399,7 +523,8 @@ class ManualService:
                 'is_direct_pdf': bool,
                 'confidence': float (0.0-1.0),
                 'reasoning': str,
-                'likely_pdf_extension': bool
+                'likely_pdf_extension': bool,
+                'validated_by': 'groq' | 'deepseek' | 'claude'
             }
 
         If LLM validation fails, returns safe default (reject URL):
@@ -433,199 +558,209 @@ PDF indicators: .pdf extension, /manuals/, /documents/, /literature/ paths
 NOT PDF: /search?, /results, catalog pages, homepages, shopping carts"""
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                # Try Groq first (free, fastest)
-                if self.groq_api_key:
-                    logger.info(f"Attempting Groq API validation | url={url[:80]}")
-                    try:
-                        response = await client.post(
-                            "https://api.groq.com/openai/v1/chat/completions",
-                            headers={
-                                "Authorization": f"Bearer {self.groq_api_key}",
-                                "Content-Type": "application/json"
-                            },
-                            json={
-                                "model": "llama-3.3-70b-versatile",
-                                "max_tokens": 200,
-                                "temperature": 0.1,
-                                "messages": [
-                                    {"role": "user", "content": prompt}
-                                ]
-                            }
-                        )
+            client = get_http_client()
 
-                        logger.info(f"Groq API response | status={response.status_code}")
-
-                        if response.status_code == 200:
-                            data = response.json()
-                            logger.info(f"Groq response data keys: {list(data.keys())}")
-
-                            content = data.get('choices', [{}])[0].get('message', {}).get('content', '{}')
-                            logger.info(f"Groq content (first 200 chars): {content[:200]}")
-
-                            try:
-                                result = json.loads(content)
-                                logger.info(
-                                    f"URL validation (Groq) SUCCESS | {manufacturer} {model} | "
-                                    f"url={url} | is_direct_pdf={result.get('is_direct_pdf')} | "
-                                    f"confidence={result.get('confidence'):.2f} | "
-                                    f"reasoning={result.get('reasoning', 'N/A')[:100]}"
-                                )
-                                return result
-                            except json.JSONDecodeError as json_err:
-                                logger.error(
-                                    f"Groq JSON parse failed | content={content[:300]} | "
-                                    f"error={json_err}"
-                                )
-                                raise
-                        else:
+            # Try Groq first (free, fastest)
+            if self.groq_api_key:
+                logger.info(f"Attempting Groq API validation | url={url[:80]}")
+                try:
+                    await self._throttle('groq')
+                    response = await client.post(
+                        "https://api.groq.com/openai/v1/chat/completions",
+                        timeout=timeout,
+                        headers={
+                            "Authorization": f"Bearer {self.groq_api_key}",
+                            "Content-Type": "application/json"
+                        },
+                        json={
+                            "model": "llama-3.3-70b-versatile",
+                            "max_tokens": 200,
+                            "temperature": 0.1,
+                            "messages": [
+                                {"role": "user", "content": prompt}
+                            ]
+                        }
+                    )
+
+                    logger.info(f"Groq API response | status={response.status_code}")
+
+                    if response.status_code == 200:
+                        data = response.json()
+                        logger.info(f"Groq response data keys: {list(data.keys())}")
+
+                        content = data.get('choices', [{}])[0].get('message', {}).get('content', '{}')
+                        logger.info(f"Groq content (first 200 chars): {content[:200]}")
+
+                        try:
+                            result = json.loads(content)
+                            result['validated_by'] = 'groq'
+                            logger.info(
+                                f"URL validation (Groq) SUCCESS | {manufacturer} {model} | "
+                                f"url={url} | is_direct_pdf={result.get('is_direct_pdf')} | "
+                                f"confidence={result.get('confidence'):.2f} | "
+                                f"reasoning={result.get('reasoning', 'N/A')[:100]}"
+                            )
+                            return result
+                        except json.JSONDecodeError as json_err:
                             logger.error(
-                                f"Groq API failed | status={response.status_code} | "
-                                f"body={response.text[:500]}"
+                                f"Groq JSON parse failed | content={content[:300]} | "
+                                f"error={json_err}"
                             )
-
-                    except httpx.HTTPStatusError as http_err:
-                        logger.error(
-                            f"Groq HTTP error | status={http_err.response.status_code} | "
-                            f"body={http_err.response.text[:500]}"
-                        )
-                    except json.JSONDecodeError as json_err:
-                        logger.error(f"Groq JSON decode error | error={json_err}")
-                    except Exception as e:
+                            raise
+                    else:
                         logger.error(
-                            f"Groq validation error | type={type(e).__name__} | "
-                            f"error={e}",
-                            exc_info=True
+                            f"Groq API failed | status={response.status_code} | "
+                            f"body={response.text[:500]}"
                         )
 
-                # Fallback to DeepSeek (cheap)
-                if self.deepseek_api_key:
-                    logger.info(f"Attempting DeepSeek API validation | url={url[:80]}")
-                    try:
-                        response = await client.post(
-                            "https://api.deepseek.com/v1/chat/completions",
-                            headers={
-                                "Authorization": f"Bearer {self.deepseek_api_key}",
-                                "Content-Type": "application/json"
-                            },
-                            json={
-                                "model": "deepseek-chat",
-                                "max_tokens": 200,
-                                "temperature": 0.1,
-                                "messages": [
-                                    {"role": "user", "content": prompt}
-                                ]
-                            }
-                        )
+                except httpx.HTTPStatusError as http_err:
+                    logger.error(
+                        f"Groq HTTP error | status={http_err.response.status_code} | "
+                        f"body={http_err.response.text[:500]}"
+                    )
+                except json.JSONDecodeError as json_err:
+                    logger.error(f"Groq JSON decode error | error={json_err}")
+                except Exception as e:
+                    logger.error(
+                        f"Groq validation error | type={type(e).__name__} | "
+                        f"error={e}",
+                        exc_info=True
+                    )
+
+            # Fallback to DeepSeek (cheap)
+            if self.deepseek_api_key:
+                logger.info(f"Attempting DeepSeek API validation | url={url[:80]}")
+                try:
+                    await self._throttle('deepseek')
+                    response = await client.post(
+                        "https://api.deepseek.com/v1/chat/completions",
+                        timeout=timeout,
+                        headers={
+                            "Authorization": f"Bearer {self.deepseek_api_key}",
+                            "Content-Type": "application/json"
+                        },
+                        json={
+                            "model": "deepseek-chat",
+                            "max_tokens": 200,
+                            "temperature": 0.1,
+                            "messages": [
+                                {"role": "user", "content": prompt}
+                            ]
+                        }
+                    )
+
+                    logger.info(f"DeepSeek API response | status={response.status_code}")
 
-                        logger.info(f"DeepSeek API response | status={response.status_code}")
-
-                        if response.status_code == 200:
-                            data = response.json()
-                            logger.info(f"DeepSeek response data keys: {list(data.keys())}")
-
-                            content = data.get('choices', [{}])[0].get('message', {}).get('content', '{}')
-                            logger.info(f"DeepSeek content (first 200 chars): {content[:200]}")
-
-                            try:
-                                result = json.loads(content)
-                                logger.info(
-                                    f"URL validation (DeepSeek) SUCCESS | {manufacturer} {model} | "
-                                    f"url={url} | is_direct_pdf={result.get('is_direct_pdf')} | "
-                                    f"confidence={result.get('confidence'):.2f} | "
-                                    f"reasoning={result.get('reasoning', 'N/A')[:100]}"
-                                )
-                                return result
-                            except json.JSONDecodeError as json_err:
-                                logger.error(
-                                    f"DeepSeek JSON parse failed | content={content[:300]} | "
-                                    f"error={json_err}"
-                                )
-                                raise
-                        else:
+                    if response.status_code == 200:
+                        data = response.json()
+                        logger.info(f"DeepSeek response data keys: {list(data.keys())}")
+
+                        content = data.get('choices', [{}])[0].get('message', {}).get('content', '{}')
+                        logger.info(f"DeepSeek content (first 200 chars): {content[:200]}")
+
+                        try:
+                            result = json.loads(content)
+                            result['validated_by'] = 'deepseek'
+                            logger.info(
+                                f"URL validation (DeepSeek) SUCCESS | {manufacturer} {model} | "
+                                f"url={url} | is_direct_pdf={result.get('is_direct_pdf')} | "
+                                f"confidence={result.get('confidence'):.2f} | "
+                                f"reasoning={result.get('reasoning', 'N/A')[:100]}"
+                            )
+                            return result
+                        except json.JSONDecodeError as json_err:
                             logger.error(
-                                f"DeepSeek API failed | status={response.status_code} | "
-                                f"body={response.text[:500]}"
+                                f"DeepSeek JSON parse failed | content={content[:300]} | "
+                                f"error={json_err}"
                             )
-
-                    except httpx.HTTPStatusError as http_err:
+                            raise
+                    else:
                         logger.error(
-                            f"DeepSeek HTTP error | status={http_err.response.status_code} | "
-                            f"body={http_err.response.text[:500]}"
-                        )
-                    except json.JSONDecodeError as json_err:
-                        logger.error(f"DeepSeek JSON decode error | error={json_err}")
-                    except Exception as e:
-                        logger.error(
-                            f"DeepSeek validation error | type={type(e).__name__} | "
-                            f"error={e}",
-                            exc_info=True
+                            f"DeepSeek API failed | status={response.status_code} | "
+                            f"body={response.text[:500]}"
                         )
 
-                # Final fallback to Claude (expensive, best quality)
-                if self.anthropic_api_key:
-                    logger.info(f"Attempting Claude API validation | url={url[:80]}")
-                    try:
-                        response = await client.post(
-                            "https://api.anthropic.com/v1/messages",
-                            headers={
-                                "x-api-key": self.anthropic_api_key,
-                                "anthropic-version": "2023-06-01",
-                                "content-type": "application/json"
-                            },
-                            json={
-                                "model": "claude-sonnet-4-20250514",
-                                "max_tokens": 200,
-                                "messages": [
-                                    {"role": "user", "content": prompt}
-                                ]
-                            }
-                        )
+                except httpx.HTTPStatusError as http_err:
+                    logger.error(
+                        f"DeepSeek HTTP error | status={http_err.response.status_code} | "
+                        f"body={http_err.response.text[:500]}"
+                    )
+                except json.JSONDecodeError as json_err:
+                    logger.error(f"DeepSeek JSON decode error | error={json_err}")
+                except Exception as e:
+                    logger.error(
+                        f"DeepSeek validation error | type={type(e).__name__} | "
+                        f"error={e}",
+                        exc_info=True
+                    )
+
+            # Final fallback to Claude (expensive, best quality)
+            if self.anthropic_api_key:
+                logger.info(f"Attempting Claude API validation | url={url[:80]}")
+                try:
+                    await self._throttle('claude')
+                    response = await client.post(
+                        "https://api.anthropic.com/v1/messages",
+                        timeout=timeout,
+                        headers={
+                            "x-api-key": self.anthropic_api_key,
+                            "anthropic-version": "2023-06-01",
+                            "content-type": "application/json"
+                        },
+                        json={
+                            "model": "claude-sonnet-4-20250514",
+                            "max_tokens": 200,
+                            "messages": [
+                                {"role": "user", "content": prompt}
+                            ]
+                        }
+                    )
 
-                        logger.info(f"Claude API response | status={response.status_code}")
-
-                        if response.status_code == 200:
-                            data = response.json()
-                            logger.info(f"Claude response data keys: {list(data.keys())}")
-
-                            content = data.get('content', [{}])[0].get('text', '{}')
-                            logger.info(f"Claude content (first 200 chars): {content[:200]}")
-
-                            try:
-                                result = json.loads(content)
-                                logger.info(
-                                    f"URL validation (Claude) SUCCESS | {manufacturer} {model} | "
-                                    f"url={url} | is_direct_pdf={result.get('is_direct_pdf')} | "
-                                    f"confidence={result.get('confidence'):.2f} | "
-                                    f"reasoning={result.get('reasoning', 'N/A')[:100]}"
-                                )
-                                return result
-                            except json.JSONDecodeError as json_err:
-                                logger.error(
-                                    f"Claude JSON parse failed | content={content[:300]} | "
-                                    f"error={json_err}"
-                                )
-                                raise
-                        else:
+                    logger.info(f"Claude API response | status={response.status_code}")
+
+                    if response.status_code == 200:
+                        data = response.json()
+                        logger.info(f"Claude response data keys: {list(data.keys())}")
+
+                        content = data.get('content', [{}])[0].get('text', '{}')
+                        logger.info(f"Claude content (first 200 chars): {content[:200]}")
+
+                        try:
+                            result = json.loads(content)
+                            result['validated_by'] = 'claude'
+                            logger.info(
+                                f"URL validation (Claude) SUCCESS | {manufacturer} {model} | "
+                                f"url={url} | is_direct_pdf={result.get('is_direct_pdf')} | "
+                                f"confidence={result.get('confidence'):.2f} | "
+                                f"reasoning={result.get('reasoning', 'N/A')[:100]}"
+                            )
+                            return result
+                        except json.JSONDecodeError as json_err:
                             logger.error(
-                                f"Claude API failed | status={response.status_code} | "
-                                f"body={response.text[:500]}"
+                                f"Claude JSON parse failed | content={content[:300]} | "
+                                f"error={json_err}"
                             )
-
-                    except httpx.HTTPStatusError as http_err:
+                            raise
+                    else:
                         logger.error(
-                            f"Claude HTTP error | status={http_err.response.status_code} | "
-                            f"body={http_err.response.text[:500]}"
-                        )
-                    except json.JSONDecodeError as json_err:
-                        logger.error(f"Claude JSON decode error | error={json_err}")
-                    except Exception as e:
-                        logger.error(
-                            f"Claude validation error | type={type(e).__name__} | "
-                            f"error={e}",
-                            exc_info=True
+                            f"Claude API failed | status={response.status_code} | "
+                            f"body={response.text[:500]}"
                         )
 
+                except httpx.HTTPStatusError as http_err:
+                    logger.error(
+                        f"Claude HTTP error | status={http_err.response.status_code} | "
+                        f"body={http_err.response.text[:500]}"
+                    )
+                except json.JSONDecodeError as json_err:
+                    logger.error(f"Claude JSON decode error | error={json_err}")
+                except Exception as e:
+                    logger.error(
+                        f"Claude validation error | type={type(e).__name__} | "
+                        f"error={e}",
+                        exc_info=True
+                    )
+
         except httpx.TimeoutException as timeout_err:
             logger.error(
                 f"URL validation timeout | {url} | timeout={timeout}s | error={timeout_err}",
@@ -699,6 +834,9 @@ NOT PDF: /search?, /results, catalog pages, homepages, shopping carts"""
                 verified
             )
 
+            # Drop stale in-process entries (including cached misses)
+            self.lookup_cache.invalidate(manufacturer, model)
+
             logger.info(f"Manual cached | {manufacturer} {model} | url={manual_url}")
             return True
 
@@ -754,132 +892,120 @@ NOT PDF: /search?, /results, catalog pages, homepages, shopping carts"""
         urls_rejected = 0
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                # Build search query optimized for PDF manuals
-                query = f"{manufacturer} {model} manual PDF filetype:pdf"
+            client = get_http_client()
+
+            # Build search query optimized for PDF manuals
+            query = f"{manufacturer} {model} manual PDF filetype:pdf"
+
+            await self._throttle('tavily')
+            response = await client.post(
+                "https://api.tavily.com/search",
+                timeout=timeout,
+                headers={"Content-Type": "application/json"},
+                json={
+                    "api_key": self.tavily_api_key,
+                    "query": query,
+                    "search_depth": "advanced",
+                    "max_results": 5,
+                    "include_domains": [
+                        "manualslib.com",
+                        "siemens.com",
+                        "abb.com",
+                        "rockwellautomation.com",
+                        "schneider-electric.com",
+                        "emerson.com",
+                        "ge.com",
+                        "automation.com"
+                    ]
+                }
+            )
 
-                response = await client.post(
-                    "https://api.tavily.com/search",
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "api_key": self.tavily_api_key,
-                        "query": query,
-                        "search_depth": "advanced",
-                        "max_results": 5,
-                        "include_domains": [
-                            "manualslib.com",
-                            "siemens.com",
-                            "abb.com",
-                            "rockwellautomation.com",
-                            "schneider-electric.com",
-                            "emerson.com",
-                            "ge.com",
-                            "automation.com"
-                        ]
-                    }
-                )
+            if response.status_code == 200:
+                data = response.json()
+                results = data.get('results', [])
+
+                logger.info(f"Tavily returned {len(results)} results | {manufacturer} {model}")
+
+                # Quick pre-filter: URLs likely to be documentation
+                candidates = []
+                for result in results:
+                    url = result.get('url', '')
+                    urls_found += 1
+
+                    url_lower = url.lower()
+                    is_likely_pdf = (
+                        url_lower.endswith('.pdf') or
+                        'manual' in url_lower or
+                        'document' in url_lower or
+                        'literature' in url_lower or
+                        'support' in url_lower or
+                        'download' in url_lower
+                    )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    results = data.get('results', [])
-
-                    logger.info(f"Tavily returned {len(results)} results | {manufacturer} {model}")
-
-                    # Validate each result with LLM judge
-                    for result in results:
-                        url = result.get('url', '')
-                        title = result.get('title', '')
-                        urls_found += 1
-
-                        # Quick pre-filter: URLs likely to be documentation
-                        url_lower = url.lower()
-                        is_likely_pdf = (
-                            url_lower.endswith('.pdf') or
-                            'manual' in url_lower or
-                            'document' in url_lower or
-                            'literature' in url_lower or
-                            'support' in url_lower or
-                            'download' in url_lower
-                        )
+                    if is_likely_pdf:
+                        candidates.append((url, result.get('title', '')))
 
-                        if is_likely_pdf:
-                            # Validate with LLM before returning
-                            validation = await self._validate_manual_url(
-                                url=url,
-                                manufacturer=manufacturer,
-                                model=model,
-                                timeout=5
-                            )
+                # Validate candidates concurrently with LLM judge
+                match, urls_rejected, cached_verdicts = await self._validate_candidates(
+                    candidates, manufacturer, model, report
+                )
 
-                            is_valid = validation.get('is_direct_pdf', False)
-                            confidence = validation.get('confidence', 0.0)
-                            reasoning = validation.get('reasoning', 'No reasoning provided')
-
-                            if is_valid and confidence >= 0.7:
-                                # URL passed validation - SUCCESS!
-                                duration_ms = int((time.time() - start_ms) * 1000)
-                                logger.info(
-                                    f"Tavily manual validated | {manufacturer} {model} | "
-                                    f"url={url} | confidence={confidence:.2f}"
-                                )
-                                if report:
-                                    report.add_stage(
-                                        SearchStage.EXTERNAL_SEARCH,
-                                        SearchStatus.SUCCESS,
-                                        duration_ms,
-                                        details=f"Found via Tavily ({urls_found} URLs checked)",
-                                        urls_found=urls_found,
-                                        urls_rejected=urls_rejected
-                                    )
-                                return {
-                                    'url': url,
-                                    'title': title or f"{manufacturer} {model} Manual",
-                                    'source': 'tavily',
-                                    'confidence': confidence
-                                }
-                            else:
-                                # URL rejected by LLM judge - track for transparency
-                                urls_rejected += 1
-                                logger.warning(
-                                    f"URL rejected by LLM judge | {manufacturer} {model} | "
-                                    f"url={url} | confidence={confidence:.2f} | reason={reasoning}"
-                                )
-                                if report:
-                                    report.add_rejected_url(
-                                        url=url,
-                                        title=title,
-                                        confidence=confidence,
-                                        rejection_reason=reasoning[:100],
-                                        validator="llm"
-                                    )
-                                # Continue checking next result
-
-                    # No valid results found
+                if match:
+                    # URL passed validation - SUCCESS!
+                    url, title, confidence = match
                     duration_ms = int((time.time() - start_ms) * 1000)
-                    logger.info(f"Tavily search: no valid PDF results after LLM validation | {manufacturer} {model}")
+                    logger.info(
+                        f"Tavily manual validated | {manufacturer} {model} | "
+                        f"url={url} | confidence={confidence:.2f}"
+                    )
                     if report:
                         report.add_stage(
                             SearchStage.EXTERNAL_SEARCH,
-                            SearchStatus.NOT_FOUND,
+                            SearchStatus.SUCCESS,
                             duration_ms,
-                            details=f"{urls_found} URLs found, {urls_rejected} rejected",
+                            details=(
+                                f"Found via Tavily ({urls_found} URLs checked, "
+                                f"{cached_verdicts} cached verdicts)"
+                            ),
                             urls_found=urls_found,
                             urls_rejected=urls_rejected
                         )
-                    return None
+                    return {
+                        'url': url,
+                        'title': title or f"{manufacturer} {model} Manual",
+                        'source': 'tavily',
+                        'confidence': confidence
+                    }
 
-                # Non-200 response
+                # No valid results found
                 duration_ms = int((time.time() - start_ms) * 1000)
-                logger.warning(f"Tavily API returned {response.status_code} | {manufacturer} {model}")
+                logger.info(f"Tavily search: no valid PDF results after LLM validation | {manufacturer} {model}")
                 if report:
                     report.add_stage(
                         SearchStage.EXTERNAL_SEARCH,
-                        SearchStatus.ERROR,
+                        SearchStatus.NOT_FOUND,
                         duration_ms,
-                        details=f"Tavily API error: {response.status_code}"
+                        details=(
+                            f"{urls_found} URLs found, {urls_rejected} rejected, "
+                            f"{cached_verdicts} cached verdicts"
+                        ),
+                        urls_found=urls_found,
+                        urls_rejected=urls_rejected
                     )
                 return None
 
+            # Non-200 response
+            duration_ms = int((time.time() - start_ms) * 1000)
+            logger.warning(f"Tavily API returned {response.status_code} | {manufacturer} {model}")
+            if report:
+                report.add_stage(
+                    SearchStage.EXTERNAL_SEARCH,
+                    SearchStatus.ERROR,
+                    duration_ms,
+                    details=f"Tavily API error: {response.status_code}"
+                )
+            return None
+
         except httpx.TimeoutException:
             duration_ms = int((time.time() - start_ms) * 1000)
             logger.error(f"Tavily search timeout | {manufacturer} {model} | timeout={timeout}s")
@@ -903,6 +1029,102 @@ NOT PDF: /search?, /results, catalog pages, homepages, shopping carts"""
                 )
             return None
 
+    async def _validate_candidates(
+        self,
+        candidates: List[Tuple[str, str]],
+        manufacturer: str,
+        model: str,
+        report: Optional[SearchReport] = None
+    ) -> Tuple[Optional[Tuple[str, str, float]], int, int]:
+        """
+        Validate candidate URLs concurrently and stop at the first pass.
+
+        Checks run under validation_semaphore. As soon as one URL clears the
+        confidence threshold the remaining checks are cancelled. If several
+        finish together, the best-ranked (earliest Tavily result) wins.
+
+        Args:
+            candidates: (url, title) pairs in search-rank order
+            manufacturer: Equipment manufacturer
+            model: Equipment model number
+            report: Optional SearchReport for per-URL timing
+
+        Returns:
+            ((url, title, confidence) or None, URLs rejected, verdicts served from cache)
+        """
+        async def check(index: int, url: str, title: str):
+            async with self.validation_semaphore:
+                check_start = time.time()
+                validation = await self._validate_manual_url(
+                    url=url,
+                    manufacturer=manufacturer,
+                    model=model,
+                    timeout=5
+                )
+                return index, url, title, validation, int((time.time() - check_start) * 1000)
+
+        pending = {
+            asyncio.ensure_future(check(i, url, title))
+            for i, (url, title) in enumerate(candidates)
+        }
+        match = None
+        urls_rejected = 0
+        cached_verdicts = 0
+
+        try:
+            while pending and not match:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for index, url, title, validation, check_ms in sorted(
+                    (task.result() for task in done), key=lambda r: r[0]
+                ):
+                    is_valid = validation.get('is_direct_pdf', False)
+                    confidence = validation.get('confidence', 0.0)
+                    reasoning = validation.get('reasoning', 'No reasoning provided')
+                    passed = is_valid and confidence >= 0.7
+                    from_cache = validation.get('cached', False)
+                    cached_verdicts += from_cache
+
+                    if report:
+                        report.add_stage(
+                            SearchStage.EXTERNAL_SEARCH,
+                            SearchStatus.SUCCESS if passed else SearchStatus.NOT_FOUND,
+                            check_ms,
+                            details=(
+                                f"{'Cached verdict' if from_cache else 'LLM check'} "
+                                f"#{index + 1} ({confidence:.2f}): {url[:60]}"
+                            )
+                        )
+
+                    if passed and not match:
+                        match = (url, title, confidence)
+                    elif not passed:
+                        # URL rejected by LLM judge - track for transparency
+                        urls_rejected += 1
+                        logger.warning(
+                            f"URL rejected by LLM judge | {manufacturer} {model} | "
+                            f"url={url} | confidence={confidence:.2f} | reason={reasoning}"
+                        )
+                        if report:
+                            report.add_rejected_url(
+                                url=url,
+                                title=title,
+                                confidence=confidence,
+                                rejection_reason=reasoning[:100],
+                                validator="llm"
+                            )
+        finally:
+            # First pass wins - cancel the remaining checks
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                logger.info(
+                    f"Cancelled {len(pending)} pending URL checks | {manufacturer} {model}"
+                )
+
+        return match, urls_rejected, cached_verdicts
+
     async def _search_via_n8n(
         self,
         manufacturer: str,
@@ -925,111 +1147,113 @@ NOT PDF: /search?, /results, catalog pages, homepages, shopping carts"""
         start_ms = time.time()
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    self.manual_hunter_url,
-                    json={
-                        'manufacturer': manufacturer,
-                        'model': model,
-                        'query': f"{manufacturer} {model} manual PDF"
-                    }
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
+            client = get_http_client()
+            await self._throttle('n8n')
+            response = await client.post(
+                self.manual_hunter_url,
+                timeout=timeout,
+                json={
+                    'manufacturer': manufacturer,
+                    'model': model,
+                    'query': f"{manufacturer} {model} manual PDF"
+                }
+            )
 
-                    # n8n Manual Hunter expected response format:
-                    # {
-                    #     'found': bool,
-                    #     'url': str,
-                    #     'title': str,
-                    #     'source': str
-                    # }
-
-                    if data.get('found') and data.get('url'):
-                        url = data['url']
-
-                        # Validate URL with LLM before returning
-                        validation = await self._validate_manual_url(
-                            url=url,
-                            manufacturer=manufacturer,
-                            model=model,
-                            timeout=5
-                        )
+            if response.status_code == 200:
+                data = response.json()
+
+                # n8n Manual Hunter expected response format:
+                # {
+                #     'found': bool,
+                #     'url': str,
+                #     'title': str,
+                #     'source': str
+                # }
+
+                if data.get('found') and data.get('url'):
+                    url = data['url']
+
+                    # Validate URL with LLM before returning
+                    validation = await self._validate_manual_url(
+                        url=url,
+                        manufacturer=manufacturer,
+                        model=model,
+                        timeout=5
+                    )
 
-                        is_valid = validation.get('is_direct_pdf', False)
-                        confidence = validation.get('confidence', 0.0)
-                        reasoning = validation.get('reasoning', 'No reasoning provided')
+                    is_valid = validation.get('is_direct_pdf', False)
+                    confidence = validation.get('confidence', 0.0)
+                    reasoning = validation.get('reasoning', 'No reasoning provided')
 
-                        duration_ms = int((time.time() - start_ms) * 1000)
+                    duration_ms = int((time.time() - start_ms) * 1000)
 
-                        if is_valid and confidence >= 0.7:
-                            # URL passed validation
-                            logger.info(
-                                f"n8n manual validated | {manufacturer} {model} | "
-                                f"url={url} | confidence={confidence:.2f}"
-                            )
-                            if report:
-                                report.add_stage(
-                                    SearchStage.EXTERNAL_SEARCH,
-                                    SearchStatus.SUCCESS,
-                                    duration_ms,
-                                    details="Found via n8n webhook",
-                                    urls_found=1
-                                )
-                            return {
-                                'url': url,
-                                'title': data.get('title', f"{manufacturer} {model} Manual"),
-                                'source': data.get('source', 'n8n'),
-                                'confidence': confidence
-                            }
-                        else:
-                            # URL rejected by LLM judge
-                            logger.warning(
-                                f"n8n URL rejected by LLM judge | {manufacturer} {model} | "
-                                f"url={url} | confidence={confidence:.2f} | reason={reasoning}"
+                    if is_valid and confidence >= 0.7:
+                        # URL passed validation
+                        logger.info(
+                            f"n8n manual validated | {manufacturer} {model} | "
+                            f"url={url} | confidence={confidence:.2f}"
+                        )
+                        if report:
+                            report.add_stage(
+                                SearchStage.EXTERNAL_SEARCH,
+                                SearchStatus.SUCCESS,
+                                duration_ms,
+                                details="Found via n8n webhook",
+                                urls_found=1
                             )
-                            if report:
-                                report.add_rejected_url(
-                                    url=url,
-                                    title=data.get('title'),
-                                    confidence=confidence,
-                                    rejection_reason=reasoning[:100],
-                                    validator="llm"
-                                )
-                                report.add_stage(
-                                    SearchStage.EXTERNAL_SEARCH,
-                                    SearchStatus.NOT_FOUND,
-                                    duration_ms,
-                                    details="n8n result rejected by LLM",
-                                    urls_found=1,
-                                    urls_rejected=1
-                                )
-                            return None
-
-                    # No result from n8n
-                    duration_ms = int((time.time() - start_ms) * 1000)
-                    if report:
-                        report.add_stage(
-                            SearchStage.EXTERNAL_SEARCH,
-                            SearchStatus.NOT_FOUND,
-                            duration_ms,
-                            details="n8n returned no results"
+                        return {
+                            'url': url,
+                            'title': data.get('title', f"{manufacturer} {model} Manual"),
+                            'source': data.get('source', 'n8n'),
+                            'confidence': confidence
+                        }
+                    else:
+                        # URL rejected by LLM judge
+                        logger.warning(
+                            f"n8n URL rejected by LLM judge | {manufacturer} {model} | "
+                            f"url={url} | confidence={confidence:.2f} | reason={reasoning}"
                         )
-                    return None
+                        if report:
+                            report.add_rejected_url(
+                                url=url,
+                                title=data.get('title'),
+                                confidence=confidence,
+                                rejection_reason=reasoning[:100],
+                                validator="llm"
+                            )
+                            report.add_stage(
+                                SearchStage.EXTERNAL_SEARCH,
+                                SearchStatus.NOT_FOUND,
+                                duration_ms,
+                                details="n8n result rejected by LLM",
+                                urls_found=1,
+                                urls_rejected=1
+                            )
+                        return None
 
-                # Non-200 response
+                # No result from n8n
                 duration_ms = int((time.time() - start_ms) * 1000)
-                logger.warning(f"n8n search returned {response.status_code} | {manufacturer} {model}")
                 if report:
                     report.add_stage(
                         SearchStage.EXTERNAL_SEARCH,
-                        SearchStatus.ERROR,
+                        SearchStatus.NOT_FOUND,
                         duration_ms,
-                        details=f"n8n error: {response.status_code}"
+                        details="n8n returned no results"
                     )
                 return None
 
+            # Non-200 response
+            duration_ms = int((time.time() - start_ms) * 1000)
+            logger.warning(f"n8n search returned {response.status_code} | {manufacturer} {model}")
+            if report:
+                report.add_stage(
+                    SearchStage.EXTERNAL_SEARCH,
+                    SearchStatus.ERROR,
+                    duration_ms,
+                    details=f"n8n error: {response.status_code}"
+                )
+            return None
+
         except httpx.TimeoutException:
             duration_ms = int((time.time() - start_ms) * 1000)
             logger.error(f"n8n search timeout | {manufacturer} {model} | timeout={timeout}s")
@@ -1058,8 +1282,17 @@ NOT PDF: /search?, /results, catalog pages, homepages, shopping carts"""
         Get statistics about manual cache.
 
         Returns:
-            Dict with cache statistics
+            Dict with cache statistics, including in-process lookup cache
+            counters (memory_hits, memory_misses, ...) and write-behind
+            access counters (access_flushes, access_rows_coalesced, ...)
+            single-flight counters (singleflight_coalesced, ...) and URL
+            verdict cache counters (verdict_hit_rate_pct, verdict_llm_calls_saved, ...)
         """
+        result = self.lookup_cache.stats()
+        result.update(self.access_tracker.stats())
+        result.update(self.search_flights.stats())
+        result.update(self.verdict_cache.stats())
+
         try:
             stats = await self.db.fetchrow(
                 """
@@ -1072,11 +1305,13 @@ NOT PDF: /search?, /results, catalog pages, homepages, shopping carts"""
                 """
             )
 
-            return dict(stats) if stats else {}
+            if stats:
+                result.update(dict(stats))
 
         except Exception as e:
             logger.error(f"Failed to get cache stats | error={e}")
-            return {}
+
+        return result
 
     async def generate_helpful_response(
         self,
@@ -1126,32 +1361,34 @@ Keep it under 80 words. Be practical and helpful. Do not apologize or say sorry.
                 continue
 
             try:
-                async with httpx.AsyncClient(timeout=10) as client:
-                    headers = {
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {api_key}"
-                    }
+                client = get_http_client()
+                headers = {
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {api_key}"
+                }
 
-                    response = await client.post(
-                        url,
-                        headers=headers,
-                        json={
-                            "model": model_name,
-                            "messages": [{"role": "user", "content": prompt}],
-                            "max_tokens": 150,
-                            "temperature": 0.3
-                        }
-                    )
+                await self._throttle(provider_name)
+                response = await client.post(
+                    url,
+                    timeout=10,
+                    headers=headers,
+                    json={
+                        "model": model_name,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "max_tokens": 150,
+                        "temperature": 0.3
+                    }
+                )
 
-                    if response.status_code == 200:
-                        data = response.json()
-                        content = data.get('choices', [{}])[0].get('message', {}).get('content', '')
-                        if content:
-                            logger.info(
-                                f"Generated helpful response | {manufacturer} {model} | "
-                                f"provider={provider_name} | len={len(content)}"
-                            )
-                            return content.strip()
+                if response.status_code == 200:
+                    data = response.json()
+                    content = data.get('choices', [{}])[0].get('message', {}).get('content', '')
+                    if content:
+                        logger.info(
+                            f"Generated helpful response | {manufacturer} {model} | "
+                            f"provider={provider_name} | len={len(content)}"
+                        )
+                        return content.strip()
 
             except Exception as e:
                 logger.warning(f"Helpful response generation failed | provider={provider_name} | error={e}")
@@ -9,13 +9,22 @@ Features:
 - Overlapping chunks for context continuity
 - Page number tracking for citations
 - Keyword extraction for metadata
+- Page text extraction in a process pool, off the event loop
+- Linear-time chunk assembly (bisect lookups, one sentence-boundary pass)
+- Page fingerprints and chunk checksums for incremental re-ingest
 """
 
+import asyncio
+import bisect
+import hashlib
 import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
 # PDF extraction
 try:
@@ -28,6 +37,119 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+MIN_PAGES_PER_TASK = 8
+
+# Sentence end: . ! ? followed by whitespace (position of the punctuation)
+SENTENCE_END_RE = re.compile(r'[.!?](?=\s)')
+
+# Shared across chunker instances; keyed by worker count
+_process_pools: Dict[int, ProcessPoolExecutor] = {}
+
+
+def _get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    pool = _process_pools.get(max_workers)
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        _process_pools[max_workers] = pool
+    return pool
+
+
+def shutdown_extraction_pools() -> None:
+    """Shut down extraction worker processes (call on application exit)."""
+    for pool in _process_pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _process_pools.clear()
+
+
+def _open_reader(pdf_path: str):
+    """Open a PdfReader, returning None if it is encrypted with a real password."""
+    reader = PyPDF2.PdfReader(pdf_path)
+    if reader.is_encrypted:
+        try:
+            reader.decrypt('')
+        except Exception:
+            return None
+    return reader
+
+
+def _count_pages(pdf_path: str) -> Optional[int]:
+    """Page count, or None if the PDF is encrypted. Runs in a worker process."""
+    reader = _open_reader(pdf_path)
+    return None if reader is None else len(reader.pages)
+
+
+def _fingerprint_pages(pdf_path: str, max_pages: int) -> Optional[List[Tuple[int, Optional[str]]]]:
+    """
+    SHA-256 of each page's raw content stream, without extracting text.
+
+    Runs in a worker process. Returns None if the PDF is encrypted; a page
+    whose stream can't be read gets None (always treated as changed).
+    """
+    reader = _open_reader(pdf_path)
+    if reader is None:
+        return None
+
+    fingerprints = []
+    for page_num in range(min(len(reader.pages), max_pages)):
+        try:
+            contents = reader.pages[page_num].get_contents()
+            data = contents.get_data() if contents is not None else b''
+            fingerprints.append((page_num + 1, hashlib.sha256(data).hexdigest()))
+        except Exception:
+            fingerprints.append((page_num + 1, None))
+
+    return fingerprints
+
+
+def _extract_page_batch(
+    pdf_path: str,
+    page_numbers: List[int]
+) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+    """
+    Extract and clean the given pages (1-indexed). Runs in a worker process.
+
+    Returns:
+        (pages, failures) - pages as (page_number, text);
+        failures as (page_number, error) for the parent to log
+    """
+    reader = _open_reader(pdf_path)
+    pages, failures = [], []
+
+    for page_num in page_numbers:
+        try:
+            text = reader.pages[page_num - 1].extract_text()
+            if text and text.strip():
+                pages.append((page_num, _clean_pdf_text(text)))
+        except Exception as e:
+            failures.append((page_num, str(e)))
+
+    return pages, failures
+
+
+def _clean_pdf_text(text: str) -> str:
+    """
+    Clean extracted PDF text.
+
+    - Normalize whitespace
+    - Remove page numbers and headers
+    - Fix common OCR issues
+    """
+    # Normalize whitespace
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+
+    # Remove standalone page numbers
+    text = re.sub(r'\n\s*\d+\s*\n', '\n', text)
+    text = re.sub(r'\n\s*Page \d+ of \d+\s*\n', '\n', text, flags=re.I)
+
+    # Remove common footer patterns
+    text = re.sub(r'\n\s*©.*?\n', '\n', text)
+    text = re.sub(r'\n\s*All rights reserved.*?\n', '\n', text, flags=re.I)
+
+    return text.strip()
+
+
 @dataclass
 class SectionBoundary:
     """Represents a detected section boundary in the text."""
@@ -51,6 +173,11 @@ class ManualChunk:
         if self.char_end == 0:
             self.char_end = self.char_start + len(self.content)
 
+    @property
+    def checksum(self) -> str:
+        """SHA-256 of the chunk content (what its embedding depends on)."""
+        return hashlib.sha256(self.content.encode('utf-8')).hexdigest()
+
 
 class PDFChunkerService:
     """
@@ -74,10 +201,14 @@ class PDFChunkerService:
         (r'^([A-Z\d][.)]\s+[A-Z][^\n]{5,80})', 2),
     ]
 
-    # Keywords to extract (equipment-related)
-    KEYWORD_PATTERNS = [
+    # Fault/parameter codes and specs (also matched in queries for keyword search)
+    CODE_PATTERNS = [
         r'\b[A-Z]\d{3,5}\b',  # Fault codes: F0001, E0123
         r'\b\d+\s*(?:V|A|kW|HP|Hz)\b',  # Electrical specs
+    ]
+
+    # Keywords to extract (equipment-related)
+    KEYWORD_PATTERNS = CODE_PATTERNS + [
         r'\b(?:WARNING|CAUTION|DANGER|NOTE)\b',  # Safety markers
     ]
 
@@ -85,7 +216,8 @@ class PDFChunkerService:
         self,
         chunk_size: int = 1024,
         overlap: int = 256,
-        min_chunk_size: int = 100
+        min_chunk_size: int = 100,
+        max_workers: Optional[int] = None
     ):
         """
         Initialize chunker.
@@ -94,10 +226,13 @@ class PDFChunkerService:
             chunk_size: Target chunk size in tokens (~4 chars per token)
             overlap: Overlap between chunks in tokens
             min_chunk_size: Minimum chunk size in tokens
+            max_workers: Processes used for page extraction
+                (default: min(4, CPUs); 0 = single worker thread, no processes)
         """
         self.chunk_size = chunk_size
         self.overlap = overlap
         self.min_chunk_size = min_chunk_size
+        self.max_workers = DEFAULT_EXTRACT_WORKERS if max_workers is None else max(0, max_workers)
 
         # Convert to approximate character counts
         self.chunk_chars = chunk_size * 4
@@ -141,12 +276,54 @@ class PDFChunkerService:
             logger.warning(f"No text extracted from {pdf_path}")
             return []
 
+        chunks = await self.chunk_pages(pages_text, pdf_path)
+
+        logger.info(
+            f"Chunked PDF | file={path.name} | "
+            f"pages={len(pages_text)} | chunks={len(chunks)}"
+        )
+
+        return chunks
+
+    async def chunk_pages(
+        self,
+        pages_text: List[Tuple[int, str]],
+        source: str = ""
+    ) -> List[ManualChunk]:
+        """
+        Chunk already-extracted (page_number, text) pairs.
+
+        Chunking is CPU-bound too, so it runs in a worker thread.
+        """
+        return await asyncio.to_thread(self._chunk_pages, pages_text, source)
+
+    async def page_fingerprints(
+        self,
+        pdf_path: str,
+        max_pages: int = 100
+    ) -> Optional[List[Tuple[int, Optional[str]]]]:
+        """
+        Hash each page's raw content stream (much cheaper than text extraction).
+
+        Returns:
+            [(page_number, sha256 or None), ...], or None if encrypted
+        """
+        loop = asyncio.get_running_loop()
+        executor = _get_process_pool(self.max_workers) if self.max_workers else None
+        return await loop.run_in_executor(executor, _fingerprint_pages, pdf_path, max_pages)
+
+    def _chunk_pages(
+        self,
+        pages_text: List[Tuple[int, str]],
+        source: str = ""
+    ) -> List[ManualChunk]:
+        """Build keyword-tagged overlapping chunks from (page_number, text) pairs."""
         # Combine text with page markers
         full_text, page_map = self._combine_pages(pages_text)
 
         # Detect sections
         sections = self._detect_sections(full_text)
-        logger.debug(f"Detected {len(sections)} sections in {pdf_path}")
+        logger.debug(f"Detected {len(sections)} sections in {source}")
 
         # Create overlapping chunks
         chunks = self._create_overlapping_chunks(full_text, sections, page_map)
@@ -155,11 +332,6 @@ class PDFChunkerService:
         for chunk in chunks:
             chunk.keywords = self._extract_keywords(chunk.content)
 
-        logger.info(
-            f"Chunked PDF | file={path.name} | "
-            f"pages={len(pages_text)} | chunks={len(chunks)}"
-        )
-
         return chunks
 
     async def _extract_pages(
@@ -173,33 +345,8 @@ class PDFChunkerService:
         Returns:
             List of (page_number, text) tuples (1-indexed)
         """
-        pages = []
-
         try:
-            with open(pdf_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-
-                # Handle encryption
-                if reader.is_encrypted:
-                    try:
-                        reader.decrypt('')
-                    except Exception:
-                        logger.warning(f"PDF is encrypted: {pdf_path}")
-                        return []
-
-                num_pages = min(len(reader.pages), max_pages)
-
-                for page_num in range(num_pages):
-                    try:
-                        page = reader.pages[page_num]
-                        text = page.extract_text()
-                        if text and text.strip():
-                            cleaned = self._clean_text(text)
-                            pages.append((page_num + 1, cleaned))  # 1-indexed
-                    except Exception as e:
-                        logger.warning(f"Failed to extract page {page_num + 1}: {e}")
-                        continue
-
+            return [page async for page in self.iter_pages(pdf_path, max_pages)]
         except PyPDF2.errors.PdfReadError as e:
             logger.error(f"PDF read error: {e}")
             return []
@@ -207,7 +354,64 @@ class PDFChunkerService:
             logger.error(f"PDF extraction failed: {e}")
             return []
 
-        return pages
+    async def iter_pages(
+        self,
+        pdf_path: str,
+        max_pages: int = 100,
+        page_numbers: Optional[Iterable[int]] = None
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Stream (page_number, text) pairs in page order as extraction proceeds.
+
+        Page ranges are extracted in parallel worker processes; the event loop
+        only awaits results. Empty pages are skipped.
+
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Maximum pages to process
+            page_numbers: Extract only these pages (1-indexed); None = all
+        """
+        loop = asyncio.get_running_loop()
+        executor = _get_process_pool(self.max_workers) if self.max_workers else None
+
+        try:
+            num_pages = await loop.run_in_executor(executor, _count_pages, pdf_path)
+        except BrokenProcessPool:
+            logger.warning("Extraction process pool broken; using a worker thread")
+            _process_pools.pop(self.max_workers, None)
+            executor = None
+            num_pages = await loop.run_in_executor(None, _count_pages, pdf_path)
+
+        if num_pages is None:
+            logger.warning(f"PDF is encrypted: {pdf_path}")
+            return
+
+        num_pages = min(num_pages, max_pages)
+        if page_numbers is None:
+            wanted = list(range(1, num_pages + 1))
+        else:
+            wanted = sorted(p for p in set(page_numbers) if 1 <= p <= num_pages)
+
+        workers = max(1, self.max_workers)
+        per_task = max(MIN_PAGES_PER_TASK, -(-len(wanted) // (workers * 2)))
+
+        futures = [
+            loop.run_in_executor(
+                executor, _extract_page_batch, pdf_path, wanted[i:i + per_task]
+            )
+            for i in range(0, len(wanted), per_task)
+        ]
+
+        try:
+            for future in futures:
+                pages, failures = await future
+                for page_num, error in failures:
+                    logger.warning(f"Failed to extract page {page_num}: {error}")
+                for page in pages:
+                    yield page
+        finally:
+            for future in futures:
+                future.cancel()
 
     def _combine_pages(
         self,
@@ -219,14 +423,17 @@ class PDFChunkerService:
         Returns:
             (full_text, page_map) where page_map is [(page_num, char_start), ...]
         """
-        full_text = ""
+        parts = []
         page_map = []  # (page_num, char_start)
+        offset = 0
 
         for page_num, text in pages:
-            page_map.append((page_num, len(full_text)))
-            full_text += text + "\n\n"
+            page_map.append((page_num, offset))
+            parts.append(text)
+            parts.append("\n\n")
+            offset += len(text) + 2
 
-        return full_text, page_map
+        return "".join(parts), page_map
 
     def _detect_sections(self, text: str) -> List[SectionBoundary]:
         """
@@ -274,7 +481,14 @@ class PDFChunkerService:
         3. Try to end at sentence boundary
         4. Next chunk starts at (end - overlap_chars)
         5. Track current section for each chunk
+
+        Page, section and sentence-boundary lookups use offsets precomputed
+        once per document, so the whole pass is O(n log n).
         """
+        page_starts = [char_start for _, char_start in page_map]
+        section_starts = [section.char_start for section in sections]
+        sentence_ends = self._sentence_end_positions(text)
+
         chunks = []
         position = 0
         chunk_index = 0
@@ -290,7 +504,7 @@ class PDFChunkerService:
                 # Look for sentence end in last 20% of chunk
                 search_start = chunk_end - int(self.chunk_chars * 0.2)
                 sentence_end = self._find_sentence_boundary(
-                    text, search_start, chunk_end + 100
+                    text, search_start, chunk_end + 100, sentence_ends
                 )
                 if sentence_end > search_start:
                     chunk_end = sentence_end
@@ -304,10 +518,10 @@ class PDFChunkerService:
                 continue
 
             # Determine page number
-            page_num = self._get_page_for_position(chunk_start, page_map)
+            page_num = self._get_page_for_position(chunk_start, page_map, page_starts)
 
             # Determine current section
-            section_title = self._get_section_for_position(chunk_start, sections)
+            section_title = self._get_section_for_position(chunk_start, sections, section_starts)
 
             # Create chunk
             chunk = ManualChunk(
@@ -330,63 +544,80 @@ class PDFChunkerService:
 
         return chunks
 
+    def _sentence_end_positions(
+        self,
+        text: str,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> List[int]:
+        """Positions of sentence-ending punctuation in text[start:end], ascending."""
+        end = len(text) if end is None else end
+        return [m.start() for m in SENTENCE_END_RE.finditer(text, start, end)]
+
     def _find_sentence_boundary(
         self,
         text: str,
         start: int,
-        end: int
+        end: int,
+        sentence_ends: Optional[List[int]] = None
     ) -> int:
         """
         Find sentence boundary (. ! ? followed by space/newline) in range.
 
+        Args:
+            sentence_ends: Precomputed _sentence_end_positions(text); the
+                range is scanned if omitted
+
         Returns:
             Position after sentence end, or end if no boundary found
         """
-        search_text = text[start:end]
+        limit = min(end, len(text))
+
+        if limit > start:
+            # Punctuation closing the range counts as a sentence end
+            if text[limit - 1] in '.!?':
+                return limit
 
-        # Find last sentence boundary
-        pattern = r'[.!?](?:\s|$)'
-        matches = list(re.finditer(pattern, search_text))
+            if sentence_ends is None:
+                sentence_ends = self._sentence_end_positions(text, start, limit)
 
-        if matches:
-            # Return position after the last sentence end
-            last_match = matches[-1]
-            return start + last_match.end()
+            # Last punctuation whose following whitespace is inside the range
+            i = bisect.bisect_right(sentence_ends, limit - 2) - 1
+            if i >= 0 and sentence_ends[i] >= start:
+                return sentence_ends[i] + 2
 
         # Fallback: try to break at newline
-        newline_pos = search_text.rfind('\n')
-        if newline_pos > 0:
-            return start + newline_pos + 1
+        newline_pos = text.rfind('\n', start, limit)
+        if newline_pos > start:
+            return newline_pos + 1
 
         return end
 
     def _get_page_for_position(
         self,
         position: int,
-        page_map: List[Tuple[int, int]]
+        page_map: List[Tuple[int, int]],
+        page_starts: Optional[List[int]] = None
     ) -> int:
         """Get page number for a character position."""
-        page_num = 1
-        for pn, char_start in page_map:
-            if char_start <= position:
-                page_num = pn
-            else:
-                break
-        return page_num
+        if page_starts is None:
+            page_starts = [char_start for _, char_start in page_map]
+
+        i = bisect.bisect_right(page_starts, position) - 1
+        return page_map[i][0] if i >= 0 else 1
 
     def _get_section_for_position(
         self,
         position: int,
-        sections: List[SectionBoundary]
+        sections: List[SectionBoundary],
+        section_starts: Optional[List[int]] = None
     ) -> Optional[str]:
         """Get section title for a character position."""
-        current_section = None
-        for section in sections:
-            if section.char_start <= position:
-                current_section = section.title
-            else:
-                break
-        return current_section
+        if section_starts is None:
+            section_starts = [section.char_start for section in sections]
+
+        i = bisect.bisect_right(section_starts, position) - 1
+        return sections[i].title if i >= 0 else None
 
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract relevant keywords from chunk text."""
@@ -400,26 +631,8 @@ class PDFChunkerService:
         return list(keywords)[:10]  # Limit to 10 keywords
 
     def _clean_text(self, text: str) -> str:
-        """
-        Clean extracted PDF text.
-
-        - Normalize whitespace
-        - Remove page numbers and headers
-        - Fix common OCR issues
-        """
-        # Normalize whitespace
-        text = re.sub(r'[ \t]+', ' ', text)
-        text = re.sub(r'\n{3,}', '\n\n', text)
-
-        # Remove standalone page numbers
-        text = re.sub(r'\n\s*\d+\s*\n', '\n', text)
-        text = re.sub(r'\n\s*Page \d+ of \d+\s*\n', '\n', text, flags=re.I)
-
-        # Remove common footer patterns
-        text = re.sub(r'\n\s*©.*?\n', '\n', text)
-        text = re.sub(r'\n\s*All rights reserved.*?\n', '\n', text, flags=re.I)
-
-        return text.strip()
+        """Clean extracted PDF text (see _clean_pdf_text)."""
+        return _clean_pdf_text(text)
 
     def estimate_chunks(self, text_length: int) -> int:
         """
@@ -477,4 +690,5 @@ __all__ = [
     "ManualChunk",
     "SectionBoundary",
     "chunk_text_simple",
+    "shutdown_extraction_pools",
 ]
@@ -0,0 +1,336 @@
+"""
+PDF Probe
+
+Reads PDF metadata and first-page text over HTTP without downloading the
+whole file.
+
+- Fetches the tail first (trailer/xref) with a suffix Range request
+- PyPDF2 then parses from a file-like view that pulls missing 64 KB blocks
+  on demand with further Range requests, so only the trailer, xref, page
+  tree and the requested pages are transferred
+- Servers without Range support fall back to one bounded full download, as
+  do servers answering 206 without a usable Content-Range
+- Fetched bytes and the parsed reader are cached per URL for the lifetime of
+  the probe (one validation), so title + first pages cost a single fetch
+
+PyPDF2 is synchronous, so parsing runs in a worker thread; each block fetch
+is scheduled back onto the event loop with the shared HTTP client.
+"""
+
+import asyncio
+import io
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+try:
+    import PyPDF2
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_TAIL_SIZE = 64 * 1024
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+CONTENT_RANGE_RE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
+
+class PDFTooLargeError(Exception):
+    """Raised when a probe would transfer more than max_bytes."""
+
+
+class RangedPDFSource:
+    """Block cache over one remote PDF, filled by HTTP Range requests."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        tail_size: int = DEFAULT_TAIL_SIZE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        timeout: float = 30.0
+    ):
+        self.client = client
+        self.url = url
+        self.block_size = block_size
+        self.tail_size = tail_size
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+        self.size: Optional[int] = None
+        self.supports_range = False
+        self._blocks: Dict[int, bytes] = {}
+        self._full: Optional[bytes] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.requests = 0
+        self.bytes_fetched = 0
+
+    async def open(self) -> None:
+        """Fetch the tail; detect Range support and total size."""
+        self._loop = asyncio.get_running_loop()
+
+        async with self.client.stream(
+            'GET',
+            self.url,
+            headers={'Range': f'bytes=-{self.tail_size}'},
+            follow_redirects=True,
+            timeout=self.timeout
+        ) as response:
+            self.requests += 1
+
+            if response.status_code == 206:
+                match = CONTENT_RANGE_RE.match(response.headers.get('content-range', ''))
+                if match and match.group(3) != '*':
+                    data = await response.aread()
+                    self.bytes_fetched += len(data)
+                    self.size = int(match.group(3))
+                    self.supports_range = True
+                    self._store(int(match.group(1)), data)
+                    return
+                # A partial body we can't place in the file (Content-Range
+                # missing, unparseable or of unknown length): fetch it whole
+            else:
+                if response.status_code != 200:
+                    response.raise_for_status()
+
+                # No Range support - bounded full download
+                self._full = await self._read_bounded(response)
+                self.size = len(self._full)
+                return
+
+        async with self.client.stream(
+            'GET',
+            self.url,
+            follow_redirects=True,
+            timeout=self.timeout
+        ) as response:
+            self.requests += 1
+            if response.status_code != 200:
+                response.raise_for_status()
+                raise httpx.HTTPStatusError(
+                    f"Full download returned {response.status_code}",
+                    request=response.request,
+                    response=response
+                )
+
+            self._full = await self._read_bounded(response)
+            self.size = len(self._full)
+
+    async def _read_bounded(self, response: httpx.Response) -> bytes:
+        declared = response.headers.get('content-length')
+        if declared and int(declared) > self.max_bytes:
+            raise PDFTooLargeError(f"PDF is {int(declared)} bytes (limit {self.max_bytes})")
+
+        buffer = bytearray()
+        async for chunk in response.aiter_bytes():
+            buffer.extend(chunk)
+            if len(buffer) > self.max_bytes:
+                raise PDFTooLargeError(f"PDF exceeds {self.max_bytes} bytes")
+
+        self.bytes_fetched += len(buffer)
+        return bytes(buffer)
+
+    def _store(self, start: int, data: bytes) -> None:
+        """Cache every complete block (or the final partial block) in data."""
+        end = start + len(data)
+        first = -(-start // self.block_size)  # ceil: skip a leading partial block
+
+        for index in range(first, (end + self.block_size - 1) // self.block_size):
+            block_start = index * self.block_size
+            block_end = min(block_start + self.block_size, self.size or end)
+            if block_end > end:
+                break
+            self._blocks[index] = data[block_start - start:block_end - start]
+
+    async def _fetch_blocks(self, first: int, last: int) -> None:
+        """Fetch blocks first..last (inclusive) with one Range request."""
+        start = first * self.block_size
+        end = min((last + 1) * self.block_size, self.size) - 1
+
+        if self.bytes_fetched + (end - start + 1) > self.max_bytes:
+            raise PDFTooLargeError(f"Probe of {self.url} exceeds {self.max_bytes} bytes")
+
+        response = await self.client.get(
+            self.url,
+            headers={'Range': f'bytes={start}-{end}'},
+            follow_redirects=True,
+            timeout=self.timeout
+        )
+        self.requests += 1
+
+        if response.status_code != 206:
+            raise httpx.HTTPStatusError(
+                f"Range request returned {response.status_code}",
+                request=response.request,
+                response=response
+            )
+
+        self.bytes_fetched += len(response.content)
+        self._store(start, response.content)
+
+    def read_sync(self, position: int, size: int) -> bytes:
+        """
+        Read bytes from a worker thread, fetching missing blocks on the loop.
+
+        Must not be called from the event loop thread.
+        """
+        if self._full is not None:
+            return self._full[position:position + size]
+
+        end = min(position + size, self.size)
+        if position >= end:
+            return b''
+
+        first = position // self.block_size
+        last = (end - 1) // self.block_size
+
+        # Fetch each contiguous run of missing blocks in one request
+        missing = [i for i in range(first, last + 1) if i not in self._blocks]
+        for run_first, run_last in _contiguous_runs(missing):
+            future = asyncio.run_coroutine_threadsafe(
+                self._fetch_blocks(run_first, run_last), self._loop
+            )
+            future.result(timeout=self.timeout + 5)
+
+        data = b''.join(self._blocks[i] for i in range(first, last + 1))
+        offset = position - first * self.block_size
+        return data[offset:offset + (end - position)]
+
+
+def _contiguous_runs(indexes: List[int]) -> List[Tuple[int, int]]:
+    """[1, 2, 3, 7, 8] -> [(1, 3), (7, 8)]"""
+    runs: List[Tuple[int, int]] = []
+    for index in indexes:
+        if runs and index == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], index)
+        else:
+            runs.append((index, index))
+    return runs
+
+
+class _RangedFile(io.RawIOBase):
+    """Seekable file view over a RangedPDFSource for PyPDF2."""
+
+    def __init__(self, source: RangedPDFSource):
+        self._source = source
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = self._source.size + offset
+        self._position = max(0, self._position)
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        data = self._source.read_sync(self._position, len(buffer))
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def readall(self) -> bytes:
+        return self.read(max(0, self._source.size - self._position))
+
+
+class PDFProbe:
+    """
+    Per-validation PDF reader with a per-URL byte and parse cache.
+
+    Usage:
+        probe = PDFProbe(http_client)
+        title = await probe.get_title(url)
+        text = await probe.extract_first_pages(url, max_pages=2)  # no refetch
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        timeout: float = 30.0
+    ):
+        self.http_client = http_client
+        self.block_size = block_size
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+        self._sources: Dict[str, RangedPDFSource] = {}
+        self._readers: Dict[str, "PyPDF2.PdfReader"] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def _with_reader(self, url: str, fn):
+        """
+        Run fn(reader) in a worker thread, opening the PDF on first use.
+
+        Calls for the same URL are serialized - PdfReader is not thread-safe.
+        """
+        lock = self._locks.setdefault(url, asyncio.Lock())
+        async with lock:
+            if url not in self._readers:
+                source = RangedPDFSource(
+                    self.http_client,
+                    url,
+                    block_size=self.block_size,
+                    max_bytes=self.max_bytes,
+                    timeout=self.timeout
+                )
+                self._sources[url] = source
+                await source.open()
+                self._readers[url] = await asyncio.to_thread(PyPDF2.PdfReader, _RangedFile(source))
+
+            return await asyncio.to_thread(fn, self._readers[url])
+
+    async def get_title(self, url: str) -> Optional[str]:
+        """Return the document title from PDF metadata, or None."""
+        def read_title(reader):
+            metadata = reader.metadata
+            return metadata.title if metadata and metadata.title else None
+
+        return await self._with_reader(url, read_title)
+
+    async def extract_first_pages(self, url: str, max_pages: int = 2) -> str:
+        """Return text of the first max_pages pages."""
+        def read_pages(reader):
+            text = ""
+            for i in range(min(max_pages, len(reader.pages))):
+                text += reader.pages[i].extract_text() + "\n\n"
+            return text.strip()
+
+        return await self._with_reader(url, read_pages)
+
+    def stats(self) -> Dict[str, int]:
+        """Transfer counters across all URLs probed."""
+        return {
+            'pdf_probe_urls': len(self._sources),
+            'pdf_probe_requests': sum(s.requests for s in self._sources.values()),
+            'pdf_probe_bytes': sum(s.bytes_fetched for s in self._sources.values()),
+            'pdf_probe_ranged': sum(1 for s in self._sources.values() if s.supports_range),
+        }
+
+
+__all__ = [
+    "PDFProbe",
+    "PDFTooLargeError",
+    "RangedPDFSource",
+    "PDF_AVAILABLE",
+]
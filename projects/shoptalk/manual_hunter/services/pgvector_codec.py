@@ -0,0 +1,112 @@
+"""
+pgvector Binary Codec for asyncpg
+
+Sends and receives pgvector `vector` values in pgvector's binary wire format
+(int16 dim, int16 unused, dim x float32 big-endian) instead of formatting a
+'[0.1,0.2,...]' text literal in Python and having Postgres re-parse it.
+
+Register on every pool connection:
+
+    pool = await asyncpg.create_pool(dsn, init=register_vector_codec)
+
+Services detect the codec once per pool (supports_binary_vectors) and fall
+back to text literals on pools created without it.
+"""
+
+import logging
+import struct
+import sys
+from array import array
+from typing import Any, Sequence, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+_HEADER = struct.Struct('>HH')
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+VectorLike = Union[Sequence[float], array, str]
+
+
+def vector_literal(values: Sequence[float]) -> str:
+    """Text form for a `$n::vector` parameter (pools without the binary codec)."""
+    return f"[{','.join(str(x) for x in values)}]"
+
+
+def encode_vector(value: Any) -> bytes:
+    """
+    Encode a vector in pgvector binary format.
+
+    Accepts array('f'), a 1-D NumPy array, any float sequence, or a text
+    literal '[1,2,3]' (so text-building callers keep working).
+    """
+    if isinstance(value, str):
+        body = value.strip().strip('[]').strip()
+        value = [float(x) for x in body.split(',')] if body else []
+
+    if NUMPY_AVAILABLE and isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value, dtype='>f4').reshape(-1)
+        return _HEADER.pack(data.shape[0], 0) + data.tobytes()
+
+    # array(...) copies, so the caller's array is never byteswapped in place
+    values = array('f', value)
+    if _LITTLE_ENDIAN:
+        values.byteswap()
+    return _HEADER.pack(len(values), 0) + values.tobytes()
+
+
+def decode_vector(data: bytes) -> array:
+    """Decode pgvector binary format into array('f')."""
+    dim, _unused = _HEADER.unpack_from(data)
+    values = array('f')
+    values.frombytes(memoryview(data)[_HEADER.size:_HEADER.size + 4 * dim])
+    if _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+async def register_vector_codec(conn, schema: str = 'public') -> None:
+    """
+    Register the binary vector codec on an asyncpg connection.
+
+    Use as asyncpg.create_pool(..., init=register_vector_codec).
+    """
+    await conn.set_type_codec(
+        'vector',
+        schema=schema,
+        encoder=encode_vector,
+        decoder=decode_vector,
+        format='binary'
+    )
+
+
+async def supports_binary_vectors(db_pool) -> bool:
+    """
+    Whether the pool's connections have the binary vector codec registered.
+
+    Without it asyncpg only accepts str for `vector` parameters, so encoding
+    an array('f') fails client-side.
+    """
+    try:
+        async with db_pool.acquire() as conn:
+            await conn.fetchval("SELECT $1::vector IS NOT NULL", array('f', [0.0]))
+        return True
+    except Exception as e:
+        logger.info(f"Binary pgvector codec not registered; using text vectors ({e})")
+        return False
+
+
+__all__ = [
+    "encode_vector",
+    "decode_vector",
+    "register_vector_codec",
+    "supports_binary_vectors",
+    "vector_literal",
+    "NUMPY_AVAILABLE",
+]
@@ -0,0 +1,155 @@
+"""
+Provider Rate Limiter
+
+Token-bucket rate limiting per external provider (Tavily, Groq, DeepSeek,
+Claude, n8n). Replaces fixed sleeps between calls: callers wait only as
+long as needed to stay under each provider's budget, and bursts up to the
+bucket capacity go through immediately.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# provider -> (requests per minute, burst capacity)
+DEFAULT_PROVIDER_RATES: Dict[str, Tuple[float, int]] = {
+    'tavily': (60, 5),
+    'n8n': (30, 3),
+    'groq': (30, 5),
+    'deepseek': (60, 5),
+    'claude': (50, 5),
+}
+
+# Limiter for the current task (and tasks it spawns); see use_rate_limiter()
+_active_limiter: ContextVar[Optional["ProviderRateLimiter"]] = ContextVar('active_rate_limiter', default=None)
+
+
+class TokenBucket:
+    """Async token bucket. Waiters are served in FIFO order."""
+
+    def __init__(self, rate_per_minute: float, capacity: int):
+        """
+        Initialize bucket (starts full).
+
+        Args:
+            rate_per_minute: Sustained refill rate
+            capacity: Maximum burst size
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting if the bucket is empty.
+
+        Returns:
+            Seconds spent waiting
+        """
+        async with self._lock:
+            waited = 0.0
+            self._refill()
+
+            while self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+
+            self._tokens -= 1
+            self.acquired += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += waited
+
+            return waited
+
+
+class ProviderRateLimiter:
+    """
+    Registry of token buckets keyed by provider name.
+
+    Providers without a configured rate are not limited.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, Tuple[float, int]]] = None):
+        """
+        Initialize limiter.
+
+        Args:
+            rates: provider -> (requests per minute, burst). Defaults to
+                DEFAULT_PROVIDER_RATES.
+        """
+        rates = DEFAULT_PROVIDER_RATES if rates is None else rates
+        self._buckets = {
+            provider: TokenBucket(rate, burst)
+            for provider, (rate, burst) in rates.items()
+        }
+
+    async def acquire(self, provider: str) -> float:
+        """Wait for a token for provider. Returns seconds waited."""
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            return 0.0
+
+        waited = await bucket.acquire()
+        if waited > 1:
+            logger.debug(f"Rate limited | provider={provider} | waited={waited:.1f}s")
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-provider request and wait counters."""
+        return {
+            provider: {
+                'acquired': bucket.acquired,
+                'waits': bucket.waits,
+                'wait_seconds': round(bucket.wait_seconds, 2),
+            }
+            for provider, bucket in self._buckets.items()
+        }
+
+
+def current_rate_limiter() -> Optional[ProviderRateLimiter]:
+    """Limiter set by use_rate_limiter() for the running task, if any."""
+    return _active_limiter.get()
+
+
+@contextmanager
+def use_rate_limiter(limiter: Optional[ProviderRateLimiter]) -> Iterator[None]:
+    """
+    Rate-limit external calls made inside this block.
+
+    Scoped to the current asyncio task, so a shared ManualService throttles
+    batch callers (ManualRetryWorker) without slowing interactive lookups.
+    """
+    token = _active_limiter.set(limiter)
+    try:
+        yield
+    finally:
+        _active_limiter.reset(token)
+
+
+__all__ = [
+    "TokenBucket",
+    "ProviderRateLimiter",
+    "current_rate_limiter",
+    "use_rate_limiter",
+    "DEFAULT_PROVIDER_RATES",
+]
@@ -0,0 +1,221 @@
+"""
+Manual Retry Worker
+
+Drains equipment_manual_searches rows scheduled for retry.
+
+- Claims rows with FOR UPDATE SKIP LOCKED, so several workers (processes or
+  hosts) can run side by side without double-processing a row
+- Processes claimed rows concurrently under a configurable limit
+- Rate-limits each external provider with a token bucket (rate_limiter)
+  instead of a fixed sleep between rows
+- Reports throughput and queue depth
+
+Usage:
+    matcher = ManualMatcherService(db)
+    worker = ManualRetryWorker(matcher, concurrency=8)
+    await worker.run_forever()      # or: await worker.run_once()
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from .rate_limiter import ProviderRateLimiter, use_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class ManualRetryWorker:
+    """
+    Concurrent, multi-worker-safe processor for scheduled manual retries.
+
+    A claimed row is moved to search_status = 'searching' with a fresh
+    search_started_at. Rows left in 'searching' longer than claim_timeout
+    (worker crashed mid-search) become claimable again.
+    """
+
+    def __init__(
+        self,
+        matcher,
+        concurrency: int = 4,
+        batch_size: int = 20,
+        claim_timeout_seconds: int = 900,
+        rate_limiter: Optional[ProviderRateLimiter] = None
+    ):
+        """
+        Initialize retry worker.
+
+        Args:
+            matcher: ManualMatcherService used to re-run each search
+            concurrency: Rows processed at the same time
+            batch_size: Rows claimed per database round-trip
+            claim_timeout_seconds: Age after which an unfinished claim is retaken
+            rate_limiter: Provider token buckets (default: DEFAULT_PROVIDER_RATES)
+        """
+        self.matcher = matcher
+        self.db = matcher.db
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.rate_limiter = rate_limiter or ProviderRateLimiter()
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._stopping = False
+
+        self.claimed = 0
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+    async def claim_batch(self, limit: Optional[int] = None) -> List[Any]:
+        """
+        Atomically claim due retry rows.
+
+        Returns:
+            Claimed rows (equipment_id, manufacturer, model_number,
+            equipment_type, telegram_chat_id, retry_count)
+        """
+        rows = await self.db.fetch("""
+            WITH claimable AS (
+                SELECT equipment_id
+                FROM equipment_manual_searches
+                WHERE (search_status = 'retrying' AND next_retry_at < NOW())
+                   OR (search_status = 'searching'
+                       AND search_started_at < NOW() - make_interval(secs => $2))
+                ORDER BY next_retry_at ASC NULLS LAST
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE equipment_manual_searches ems
+            SET search_status = 'searching',
+                search_started_at = NOW()
+            FROM claimable c, cmms_equipment e
+            WHERE ems.equipment_id = c.equipment_id
+              AND e.id = ems.equipment_id
+            RETURNING ems.equipment_id, e.manufacturer, e.model_number,
+                      e.equipment_type, ems.telegram_chat_id, ems.retry_count
+        """, limit or self.batch_size, float(self.claim_timeout_seconds))
+
+        self.claimed += len(rows)
+        return rows
+
+    async def _process(self, record) -> bool:
+        """Re-run one search. Returns True on success."""
+        async with self._semaphore:
+            try:
+                logger.info(
+                    f"Processing retry | equipment_id={record['equipment_id']} | "
+                    f"attempt={record['retry_count']}"
+                )
+
+                # Only this retry's external calls go through the token buckets;
+                # the matcher's ManualService is shared with live lookups
+                with use_rate_limiter(self.rate_limiter):
+                    await self.matcher.search_and_validate_manual(
+                        equipment_id=record['equipment_id'],
+                        manufacturer=record['manufacturer'],
+                        model=record['model_number'],
+                        equipment_type=record['equipment_type'],
+                        telegram_chat_id=record['telegram_chat_id']
+                    )
+
+                self.processed += 1
+                return True
+
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Retry failed for {record['equipment_id']}: {e}")
+                return False
+
+    async def run_once(self, max_rows: Optional[int] = None) -> int:
+        """
+        Claim and process due rows until the queue is drained (or max_rows).
+
+        Returns:
+            Number of rows processed successfully
+        """
+        start = time.monotonic()
+        done = 0
+        remaining = max_rows
+
+        try:
+            while not self._stopping:
+                limit = self.batch_size if remaining is None else min(self.batch_size, remaining)
+                if limit <= 0:
+                    break
+
+                batch = await self.claim_batch(limit)
+                if not batch:
+                    break
+
+                results = await asyncio.gather(*(self._process(r) for r in batch))
+                done += sum(results)
+
+                if remaining is not None:
+                    remaining -= len(batch)
+
+        finally:
+            self.busy_seconds += time.monotonic() - start
+
+        if done:
+            logger.info(f"Retry batch complete | processed={done} | {self.throughput_per_minute():.1f}/min")
+
+        return done
+
+    async def run_forever(self, poll_interval: float = 30.0) -> None:
+        """Drain the queue, sleep, repeat until stop() is called."""
+        self._stopping = False
+        while not self._stopping:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Retry worker cycle failed: {e}", exc_info=True)
+
+            if not self._stopping:
+                await asyncio.sleep(poll_interval)
+
+    def stop(self) -> None:
+        """Finish in-flight rows and exit run_forever/run_once."""
+        self._stopping = True
+
+    def throughput_per_minute(self) -> float:
+        """Rows processed per minute of active (non-idle) worker time."""
+        if self.busy_seconds <= 0:
+            return 0.0
+        return self.processed * 60.0 / self.busy_seconds
+
+    async def queue_depth(self) -> Dict[str, int]:
+        """Count retry rows that are due now, scheduled later, or in progress."""
+        row = await self.db.fetchrow("""
+            SELECT
+                COUNT(*) FILTER (WHERE search_status = 'retrying' AND next_retry_at < NOW()) AS due,
+                COUNT(*) FILTER (WHERE search_status = 'retrying') AS scheduled,
+                COUNT(*) FILTER (WHERE search_status = 'searching') AS in_progress
+            FROM equipment_manual_searches
+        """)
+        return dict(row) if row else {'due': 0, 'scheduled': 0, 'in_progress': 0}
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Throughput, queue depth and per-provider rate-limit counters."""
+        stats: Dict[str, Any] = {
+            'claimed': self.claimed,
+            'processed': self.processed,
+            'failed': self.failed,
+            'concurrency': self.concurrency,
+            'throughput_per_minute': round(self.throughput_per_minute(), 2),
+            'rate_limits': self.rate_limiter.stats(),
+        }
+
+        try:
+            stats['queue'] = await self.queue_depth()
+        except Exception as e:
+            logger.error(f"Failed to read retry queue depth: {e}")
+            stats['queue'] = {}
+
+        return stats
+
+
+__all__ = [
+    "ManualRetryWorker",
+]
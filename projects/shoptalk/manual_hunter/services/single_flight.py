@@ -0,0 +1,85 @@
+"""
+Single-Flight Request Coalescing
+
+Collapses concurrent calls for the same key into one in-flight coroutine.
+The first caller (leader) starts the work; callers arriving while it is
+running (followers) await the same task and receive the same result.
+
+Used by ManualService so an alarm storm of identical manual searches
+triggers one Tavily/n8n search and one round of LLM URL validation.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Per-key in-flight deduplication for async work.
+
+    The shared work runs in its own task and callers await it through
+    asyncio.shield, so a leader being cancelled (e.g. a Telegram handler
+    timing out) does not cancel the search for everyone else.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        self.flights = 0
+        self.coalesced = 0
+
+    async def run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run factory() once per key at a time.
+
+        Args:
+            key: Deduplication key
+            factory: Zero-argument callable returning the coroutine to run
+
+        Returns:
+            (result, shared) where shared is True if this caller joined a
+            flight started by another caller
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+
+        if shared:
+            self.coalesced += 1
+            logger.debug(f"Joined in-flight request | key={key}")
+        else:
+            self.flights += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._forget(k, _t))
+
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished flight so the next caller starts fresh."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # Retrieve the exception so an all-callers-cancelled flight doesn't log
+        # "Task exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Return flight counters for reporting."""
+        return {
+            'singleflight_inflight': len(self._inflight),
+            'singleflight_flights': self.flights,
+            'singleflight_coalesced': self.coalesced,
+        }
+
+
+__all__ = [
+    "SingleFlight",
+]
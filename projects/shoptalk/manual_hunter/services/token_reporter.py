@@ -0,0 +1,95 @@
+"""
+Token Usage Reporter
+
+Write-behind reporting of prompt-context token counts to the Watchman's
+daily token budget (POST /tokens on the Watchman).
+
+Per-query counts are accumulated in memory and sent as one request every
+flush_interval seconds, so a query never waits on the Watchman and a
+Watchman outage only delays the numbers (they are kept and re-sent).
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+from .http_pool import get_http_client
+from .write_behind import WriteBehindBuffer
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_WATCHMAN_URL = "http://localhost:8094"
+
+
+class TokenUsageReporter(WriteBehindBuffer):
+    """
+    Accumulates tokens used / saved and flushes them to the Watchman.
+
+    Usage:
+        reporter = TokenUsageReporter(service="manual_hunter")
+        reporter.record(tokens_used=850, tokens_saved=240)
+        ...
+        await reporter.close()  # final flush on shutdown
+    """
+
+    name = "Token report"
+
+    def __init__(
+        self,
+        service: str = "manual_hunter",
+        watchman_url: str = DEFAULT_WATCHMAN_URL,
+        flush_interval: float = 30.0,
+        timeout: float = 5.0
+    ):
+        """
+        Initialize reporter.
+
+        Args:
+            service: Name the Watchman records the usage under
+            watchman_url: Base URL of the Watchman
+            flush_interval: Seconds between background flushes
+            timeout: Per-request timeout for the report
+        """
+        # Buffered as service -> (tokens_used, tokens_saved, queries)
+        super().__init__(flush_interval=flush_interval)
+        self.service = service
+        self.watchman_url = watchman_url.rstrip('/')
+        self.timeout = timeout
+
+    def record(self, tokens_used: int, tokens_saved: int = 0) -> None:
+        """Record one query's context tokens. Never waits on the network."""
+        self._add(self.service, (tokens_used, tokens_saved, 1))
+
+    def _merge(self, old: Tuple[int, int, int], new: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        return (old[0] + new[0], old[1] + new[1], old[2] + new[2])
+
+    async def _write_batch(self, batch: List[Tuple[str, Tuple[int, int, int]]]) -> None:
+        """POST the accumulated counts to {watchman_url}/tokens."""
+        for service, (used, saved, queries) in batch:
+            response = await get_http_client().post(
+                f"{self.watchman_url}/tokens",
+                json={
+                    "service": service,
+                    "tokens_used": used,
+                    "tokens_saved": saved,
+                    "queries": queries,
+                },
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            logger.debug(f"Token report | used={used} | saved={saved} | queries={queries}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return report counters."""
+        pending = self._pending.get(self.service)
+        return {
+            'token_report_pending_queries': pending[2] if pending else 0,
+            'token_report_flushes': self.flushes,
+            'token_report_errors': self.flush_errors,
+        }
+
+
+__all__ = [
+    "TokenUsageReporter",
+    "DEFAULT_WATCHMAN_URL",
+]
@@ -0,0 +1,274 @@
+"""
+Vector Index Planning for manual_chunks
+
+Shared by ManualRAGService (query building, per-query ANN settings, plan
+self-check) and scripts/migrate_vector_indexes.py (index DDL):
+
+- ANN index DDL: HNSW (default) or IVFFlat on embedding (cosine ops)
+- manual_chunks.manufacturer_id: denormalized from manuals ->
+  equipment_models, kept current by a BEFORE INSERT trigger, so the
+  manufacturer filter is one indexed equality instead of a three-table join
+- Vector search SQL for the three scopes (manual / manufacturer / global)
+- SET LOCAL statements for hnsw.ef_search / ivfflat.probes
+- EXPLAIN (FORMAT JSON) walker that reports sequential scans
+
+No database driver is imported here: callers run the SQL with asyncpg or
+psycopg2.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+ANN_METHODS = ('hnsw', 'ivfflat')
+HNSW_INDEX = 'idx_manual_chunks_embedding_hnsw'
+IVFFLAT_INDEX = 'idx_manual_chunks_embedding_ivfflat'
+
+DEFAULT_HNSW_M = 16
+DEFAULT_HNSW_EF_CONSTRUCTION = 64
+DEFAULT_EF_SEARCH = 40  # pgvector default; raised to top_k when smaller
+
+
+CHUNK_COLUMNS = """
+    mc.id as chunk_id,
+    mc.manual_id,
+    mc.content,
+    mc.page_number,
+    mc.section_title,
+    mc.keywords,
+    mc.chunk_index
+"""
+
+# Legacy manufacturer filter (before manufacturer_id was denormalized)
+MANUFACTURER_JOIN = """
+    JOIN manuals m ON mc.manual_id = m.id
+    JOIN equipment_models em ON m.equipment_model_id = em.id
+    JOIN manufacturers mfr ON em.manufacturer_id = mfr.id
+"""
+
+
+def manufacturer_scope(param: str, denormalized: bool) -> Dict[str, str]:
+    """
+    JOIN and WHERE fragments filtering manual_chunks mc by manufacturer name.
+
+    Args:
+        param: Placeholder holding the name, e.g. "$2"
+        denormalized: manual_chunks.manufacturer_id exists
+    """
+    if denormalized:
+        return {
+            'join': "",
+            'where': (
+                f"mc.manufacturer_id = ANY(ARRAY("
+                f"SELECT id FROM manufacturers WHERE LOWER(name) = LOWER({param})))"
+            ),
+        }
+    return {'join': MANUFACTURER_JOIN, 'where': f"LOWER(mfr.name) = LOWER({param})"}
+
+
+def vector_search_sql(scope: str, denormalized: bool = False) -> str:
+    """
+    Nearest-neighbour query for a scope.
+
+    Parameters: $1 query vector, then the scope value (manual_id or
+    manufacturer name) if any, then LIMIT.
+
+    Args:
+        scope: 'manual', 'manufacturer' or 'global'
+        denormalized: Filter manufacturers via manual_chunks.manufacturer_id
+    """
+    join, filters, limit = "", ["mc.embedding IS NOT NULL"], "$2"
+
+    if scope == 'manual':
+        filters.insert(0, "mc.manual_id = $2")
+        limit = "$3"
+    elif scope == 'manufacturer':
+        fragments = manufacturer_scope("$2", denormalized)
+        join = fragments['join']
+        filters.insert(0, fragments['where'])
+        limit = "$3"
+    elif scope != 'global':
+        raise ValueError(f"Unknown vector search scope: {scope}")
+
+    return f"""
+        SELECT
+            {CHUNK_COLUMNS},
+            1 - (mc.embedding <=> $1::vector) as similarity
+        FROM manual_chunks mc
+        {join}
+        WHERE {' AND '.join(filters)}
+        ORDER BY mc.embedding <=> $1::vector
+        LIMIT {limit}
+    """
+
+
+def search_settings(top_k: int, ef_search: int, ivfflat_probes: Optional[int] = None) -> List[str]:
+    """
+    SET LOCAL statements to run in the search transaction.
+
+    HNSW returns at most ef_search candidates, so it is never set below top_k.
+    """
+    statements = [f"SET LOCAL hnsw.ef_search = {max(int(ef_search), int(top_k))}"]
+    if ivfflat_probes:
+        statements.append(f"SET LOCAL ivfflat.probes = {int(ivfflat_probes)}")
+    return statements
+
+
+def ann_index_sql(
+    method: str = 'hnsw',
+    m: int = DEFAULT_HNSW_M,
+    ef_construction: int = DEFAULT_HNSW_EF_CONSTRUCTION,
+    lists: int = 100,
+    concurrently: bool = True
+) -> str:
+    """
+    CREATE INDEX statement for the embedding ANN index.
+
+    IVFFlat lists should be about rows / 1000 (sqrt(rows) above 1M rows) and
+    the index built after the table is loaded; HNSW has no such requirement.
+    """
+    if method not in ANN_METHODS:
+        raise ValueError(f"Unknown ANN method: {method} (expected one of {ANN_METHODS})")
+
+    mode = "CONCURRENTLY " if concurrently else ""
+    if method == 'hnsw':
+        return (
+            f"CREATE INDEX {mode}IF NOT EXISTS {HNSW_INDEX} "
+            f"ON manual_chunks USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+        )
+    return (
+        f"CREATE INDEX {mode}IF NOT EXISTS {IVFFLAT_INDEX} "
+        f"ON manual_chunks USING ivfflat (embedding vector_cosine_ops) "
+        f"WITH (lists = {max(1, int(lists))})"
+    )
+
+
+def ivfflat_lists_for(rows: int) -> int:
+    """pgvector's recommended IVFFlat list count for a row count."""
+    if rows > 1_000_000:
+        return int(rows ** 0.5)
+    return max(10, rows // 1000)
+
+
+# Denormalize manufacturer_id onto manual_chunks (idempotent)
+MANUFACTURER_ID_MIGRATION = [
+    # Same type as equipment_models.manufacturer_id
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'manual_chunks' AND column_name = 'manufacturer_id'
+        ) THEN
+            EXECUTE format(
+                'ALTER TABLE manual_chunks ADD COLUMN manufacturer_id %s',
+                (SELECT format_type(atttypid, atttypmod)
+                 FROM pg_attribute
+                 WHERE attrelid = 'equipment_models'::regclass
+                   AND attname = 'manufacturer_id')
+            );
+        END IF;
+    END $$;
+    """,
+    """
+    UPDATE manual_chunks mc
+    SET manufacturer_id = em.manufacturer_id
+    FROM manuals m
+    JOIN equipment_models em ON m.equipment_model_id = em.id
+    WHERE mc.manual_id = m.id
+      AND mc.manufacturer_id IS DISTINCT FROM em.manufacturer_id
+    """,
+    """
+    CREATE OR REPLACE FUNCTION manual_chunks_set_manufacturer_id() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.manufacturer_id IS NULL THEN
+            SELECT em.manufacturer_id INTO NEW.manufacturer_id
+            FROM manuals m
+            JOIN equipment_models em ON m.equipment_model_id = em.id
+            WHERE m.id = NEW.manual_id;
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_manual_chunks_manufacturer_id ON manual_chunks",
+    """
+    CREATE TRIGGER trg_manual_chunks_manufacturer_id
+        BEFORE INSERT ON manual_chunks
+        FOR EACH ROW EXECUTE FUNCTION manual_chunks_set_manufacturer_id()
+    """,
+]
+
+# Supporting B-tree indexes for filtered searches
+FILTER_INDEXES = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_manual_chunks_manufacturer_id "
+    "ON manual_chunks(manufacturer_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_manual_chunks_manual_chunk "
+    "ON manual_chunks(manual_id, chunk_index)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_manufacturers_lower_name "
+    "ON manufacturers(LOWER(name))",
+]
+
+HAS_MANUFACTURER_ID_SQL = """
+    SELECT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'manual_chunks' AND column_name = 'manufacturer_id'
+    )
+"""
+
+# One real row to EXPLAIN the three scopes with realistic parameters
+PLAN_SAMPLE_SQL = """
+    SELECT mc.embedding::text AS embedding, mc.manual_id, mfr.name AS manufacturer
+    FROM manual_chunks mc
+    LEFT JOIN manuals m ON mc.manual_id = m.id
+    LEFT JOIN equipment_models em ON m.equipment_model_id = em.id
+    LEFT JOIN manufacturers mfr ON em.manufacturer_id = mfr.id
+    WHERE mc.embedding IS NOT NULL
+    LIMIT 1
+"""
+
+
+def find_seq_scans(plan: Any, relation: str = 'manual_chunks') -> List[str]:
+    """
+    Sequential scans of relation in an EXPLAIN (FORMAT JSON) plan.
+
+    Returns:
+        One description per Seq Scan node, e.g.
+        "Seq Scan on manual_chunks (~12000 rows)"
+    """
+    found: List[str] = []
+
+    def walk(node: Dict[str, Any]) -> None:
+        if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') == relation:
+            found.append(f"Seq Scan on {relation} (~{node.get('Plan Rows', '?')} rows)")
+        for child in node.get('Plans', []):
+            walk(child)
+
+    # EXPLAIN (FORMAT JSON) yields [{"Plan": {...}}]
+    for entry in plan if isinstance(plan, list) else [plan]:
+        walk(entry.get('Plan', entry))
+
+    return found
+
+
+__all__ = [
+    "ANN_METHODS",
+    "DEFAULT_EF_SEARCH",
+    "DEFAULT_HNSW_EF_CONSTRUCTION",
+    "DEFAULT_HNSW_M",
+    "FILTER_INDEXES",
+    "HAS_MANUFACTURER_ID_SQL",
+    "HNSW_INDEX",
+    "IVFFLAT_INDEX",
+    "MANUFACTURER_ID_MIGRATION",
+    "PLAN_SAMPLE_SQL",
+    "ann_index_sql",
+    "find_seq_scans",
+    "ivfflat_lists_for",
+    "manufacturer_scope",
+    "search_settings",
+    "vector_search_sql",
+]
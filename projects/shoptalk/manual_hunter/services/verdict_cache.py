@@ -0,0 +1,207 @@
+"""
+URL Verdict Cache
+
+Content-addressed cache of LLM URL-validation verdicts, so a URL judged for
+a manufacturer/model is not sent to Groq/DeepSeek/Claude again until its
+verdict expires.
+
+Tiers:
+1. In-process LRU (ManualLookupCache)
+2. Postgres table manual_url_verdicts (shared across processes/restarts)
+
+Keyed on sha256(prompt_version, url, manufacturer, model); bump the prompt
+version whenever the validation prompt changes so stale verdicts miss.
+Positive and negative verdicts have separate TTLs.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from .manual_lookup_cache import ManualLookupCache, MISSING, normalize_key
+
+logger = logging.getLogger(__name__)
+
+
+def verdict_key(url: str, manufacturer: str, model: str, prompt_version: str) -> str:
+    """Build the content-addressed cache key."""
+    mfr_key, model_key = normalize_key(manufacturer, model)
+    raw = "\x1f".join([prompt_version, url.strip(), mfr_key, model_key])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def is_positive_verdict(verdict: Dict[str, Any], threshold: float = 0.7) -> bool:
+    """Whether a verdict accepts the URL (drives which TTL applies)."""
+    return bool(verdict.get('is_direct_pdf')) and (verdict.get('confidence') or 0.0) >= threshold
+
+
+class VerdictCache:
+    """
+    Two-tier verdict cache (memory, then Postgres).
+
+    Database errors are logged and treated as misses - the cache must never
+    make URL validation fail.
+    """
+
+    def __init__(
+        self,
+        db,
+        positive_ttl_seconds: float = 7 * 24 * 3600,
+        negative_ttl_seconds: float = 24 * 3600,
+        memory_entries: int = 4096,
+        use_database: bool = True
+    ):
+        """
+        Initialize verdict cache.
+
+        Args:
+            db: Database connection pool
+            positive_ttl_seconds: Lifetime of accepted-URL verdicts
+            negative_ttl_seconds: Lifetime of rejected-URL verdicts
+            memory_entries: In-process LRU capacity
+            use_database: Also read/write the manual_url_verdicts table
+        """
+        self.db = db
+        self.positive_ttl_seconds = positive_ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.use_database = use_database
+
+        self._memory = ManualLookupCache(
+            max_entries=memory_entries,
+            ttl_seconds=positive_ttl_seconds,
+            negative_ttl_seconds=negative_ttl_seconds
+        )
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    async def get(
+        self,
+        url: str,
+        manufacturer: str,
+        model: str,
+        prompt_version: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached verdict.
+
+        Returns:
+            Verdict dict, or None if not cached / expired
+        """
+        key = verdict_key(url, manufacturer, model, prompt_version)
+
+        verdict = self._memory.get(key)
+        if verdict is not MISSING and verdict is not None:
+            self.memory_hits += 1
+            return verdict
+
+        if self.use_database:
+            try:
+                row = await self.db.fetchrow(
+                    """
+                    SELECT verdict,
+                           EXTRACT(EPOCH FROM (expires_at - NOW())) AS ttl_remaining
+                    FROM manual_url_verdicts
+                    WHERE cache_key = $1
+                      AND expires_at > NOW()
+                    """,
+                    key
+                )
+
+                if row:
+                    verdict = row['verdict']
+                    if isinstance(verdict, str):
+                        verdict = json.loads(verdict)
+
+                    # Never let the memory copy outlive the database row
+                    self._memory.set(key, verdict, ttl=float(row['ttl_remaining']))
+                    self.db_hits += 1
+                    return dict(verdict)
+
+            except Exception as e:
+                logger.warning(f"Verdict cache read failed | url={url[:80]} | error={e}")
+
+        self.misses += 1
+        return None
+
+    async def set(
+        self,
+        url: str,
+        manufacturer: str,
+        model: str,
+        prompt_version: str,
+        verdict: Dict[str, Any]
+    ) -> None:
+        """Store a verdict in both tiers."""
+        key = verdict_key(url, manufacturer, model, prompt_version)
+        positive = is_positive_verdict(verdict)
+        ttl = self.positive_ttl_seconds if positive else self.negative_ttl_seconds
+
+        self._memory.set(key, verdict, ttl=ttl)
+        self.stores += 1
+
+        if not self.use_database:
+            return
+
+        try:
+            await self.db.execute(
+                """
+                INSERT INTO manual_url_verdicts
+                    (cache_key, url, manufacturer, model, prompt_version,
+                     verdict, is_positive, expires_at)
+                VALUES ($1, $2, $3, $4, $5, $6::jsonb, $7, NOW() + make_interval(secs => $8))
+                ON CONFLICT (cache_key)
+                DO UPDATE SET
+                    verdict = EXCLUDED.verdict,
+                    is_positive = EXCLUDED.is_positive,
+                    created_at = NOW(),
+                    expires_at = EXCLUDED.expires_at
+                """,
+                key,
+                url,
+                manufacturer,
+                model,
+                prompt_version,
+                json.dumps(verdict),
+                positive,
+                float(ttl)
+            )
+
+        except Exception as e:
+            logger.warning(f"Verdict cache write failed | url={url[:80]} | error={e}")
+
+    async def purge_expired(self) -> int:
+        """Delete expired rows. Returns rows removed."""
+        try:
+            result = await self.db.execute(
+                "DELETE FROM manual_url_verdicts WHERE expires_at <= NOW()"
+            )
+            # asyncpg returns a status string like "DELETE 12"
+            return int(str(result).split()[-1]) if result else 0
+
+        except Exception as e:
+            logger.warning(f"Verdict cache purge failed | error={e}")
+            return 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit ratio and saved LLM call counters."""
+        hits = self.memory_hits + self.db_hits
+        lookups = hits + self.misses
+        return {
+            'verdict_memory_hits': self.memory_hits,
+            'verdict_db_hits': self.db_hits,
+            'verdict_misses': self.misses,
+            'verdict_stores': self.stores,
+            'verdict_llm_calls_saved': hits,
+            'verdict_hit_rate_pct': int(100 * hits / lookups) if lookups else 0,
+        }
+
+
+__all__ = [
+    "VerdictCache",
+    "verdict_key",
+    "is_positive_verdict",
+]
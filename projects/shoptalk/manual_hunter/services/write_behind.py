@@ -0,0 +1,166 @@
+"""
+Write-Behind Buffer
+
+Shared base for counters that are accumulated in memory and written out in
+batches (AccessTracker, TokenUsageReporter):
+
+- record path never waits on I/O: values are merged per key into a buffer
+- a background loop flushes every flush_interval seconds (started on first
+  use), early once max_pending keys are buffered, and once more on close()
+- a batch whose write fails is merged back into the buffer for the next
+  flush; counters only include batches that were actually written
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Per-key buffer flushed in batches by a background task.
+
+    Subclasses implement _merge and _write_batch, and may override _batches
+    (how buffered items are grouped per write) and _written (extra counters).
+    """
+
+    # Label used in log lines
+    name = "write-behind"
+
+    def __init__(
+        self,
+        flush_interval: float = 10.0,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Initialize buffer.
+
+        Args:
+            flush_interval: Seconds between background flushes
+            max_pending: Flush early once this many distinct keys are pending
+        """
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._pending: Dict[Hashable, Any] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._closed = False
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_errors = 0
+
+    # ----- Subclass hooks -----
+
+    def _merge(self, old: Any, new: Any) -> Any:
+        """Combine a buffered value with a new one for the same key."""
+        raise NotImplementedError
+
+    def _batches(self, items: List[Tuple[Hashable, Any]]) -> Iterator[List[Tuple[Hashable, Any]]]:
+        """Group buffered (key, value) items into writes. Default: one write."""
+        yield items
+
+    async def _write_batch(self, batch: List[Tuple[Hashable, Any]]) -> None:
+        """Write one batch; raise to have it requeued."""
+        raise NotImplementedError
+
+    def _written(self, batch: List[Tuple[Hashable, Any]]) -> None:
+        """Called after a batch was written (for subclass counters)."""
+
+    # ----- Buffer -----
+
+    def _add(self, key: Hashable, value: Any) -> None:
+        """Merge a value into the buffer. Never waits on I/O."""
+        entry = self._pending.get(key)
+        self._pending[key] = value if entry is None else self._merge(entry, value)
+
+        if self._closed:
+            return
+
+        self._ensure_flush_task()
+
+        if (
+            self.max_pending is not None
+            and len(self._pending) >= self.max_pending
+            and not self._flush_lock.locked()
+        ):
+            asyncio.get_running_loop().create_task(self.flush())
+
+    @property
+    def pending(self) -> int:
+        """Distinct keys waiting for the next flush."""
+        return len(self._pending)
+
+    def _ensure_flush_task(self) -> None:
+        """Start the periodic flush loop on first use."""
+        if self._flush_task and not self._flush_task.done():
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop - flush() must be called explicitly
+
+        self._flush_task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Flush pending values every flush_interval seconds."""
+        while not self._closed:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write all pending values.
+
+        Returns:
+            Number of keys written
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            # Swap out the buffer so recording keeps accumulating during the await
+            pending, self._pending = self._pending, {}
+
+            written = 0
+            for batch in self._batches(list(pending.items())):
+                try:
+                    await self._write_batch(batch)
+                except Exception as e:
+                    self.flush_errors += 1
+                    logger.error(f"{self.name} flush failed | rows={len(batch)} | error={e}")
+                    for key, value in batch:
+                        self._add(key, value)
+                    continue
+                written += len(batch)
+                self._written(batch)
+
+            # Requeued batches are counted when they are actually written
+            if written:
+                self.flushes += 1
+                self.rows_written += written
+
+            logger.debug(f"{self.name} flush | rows={written}")
+            return written
+
+    async def close(self) -> None:
+        """Stop the background loop and flush whatever is pending."""
+        self._closed = True
+
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+
+        await self.flush()
+
+
+__all__ = [
+    "WriteBehindBuffer",
+]
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Sandbox Sync - Incremental source -> sandbox copy for the Cartographer
+
+Replaces rmtree + copytree of every project on every /sync:
+
+- Quick check per file: same size and mtime as the source -> skipped
+  (copies keep the source mtime, like rsync)
+- Same size but different mtime: content hashes compared before copying
+  (touched or re-checked-out files are not copied again)
+- verify_hash=True also hashes quick-check matches; source hashes are
+  cached in the manifest by (size, mtime) so unchanged sources are hashed once
+- Files and directories removed from the source are deleted from the
+  copy, and a path that changed between file and directory is replaced
+- Copies are reflinked (copy-on-write clone) where the filesystem
+  supports it - btrfs, XFS - and byte-copied otherwise
+- VCS metadata, caches and virtualenvs (SYNC_EXCLUDE) are never copied,
+  and are removed from the copy if an earlier full copy left them there
+
+Each destination keeps a manifest of what the last sync left there.
+
+5-Second Test:
+python3 sandbox_sync.py <src_dir> <dest_dir>
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from state_store import atomic_write_json
+
+# Directory names never synced into the sandbox
+SYNC_EXCLUDE = {".git", ".hg", ".svn", "__pycache__", ".pytest_cache", ".mypy_cache", "node_modules", ".venv", "venv"}
+
+# ioctl(dest_fd, FICLONE, src_fd): clone extents (linux/fs.h)
+FICLONE = 0x40049409
+
+HASH_CHUNK = 1 << 20
+
+
+def file_hash(path: Path) -> str:
+    h = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _walk(root: Path) -> Tuple[Dict[str, os.stat_result], Set[str], List[str]]:
+    """
+    Walk root, pruning SYNC_EXCLUDE.
+
+    Returns:
+        (relative path -> stat for every file (symlinked files followed),
+         relative directory paths, relative paths of excluded directories)
+    """
+    files = {}
+    dirs: Set[str] = set()
+    excluded: List[str] = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            rel = os.path.relpath(entry.path, root)
+            if entry.name in SYNC_EXCLUDE:
+                if entry.is_dir(follow_symlinks=False):
+                    excluded.append(rel)
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                dirs.add(rel)
+                stack.append(Path(entry.path))
+            elif entry.is_file():
+                files[rel] = entry.stat()
+    return files, dirs, excluded
+
+
+def walk_files(root: Path) -> Dict[str, os.stat_result]:
+    """Relative path -> stat for every file under root (symlinked files followed), pruning SYNC_EXCLUDE."""
+    return _walk(root)[0]
+
+
+def _remove(path: Path) -> None:
+    """Delete a file, symlink or directory tree."""
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+
+def clone_file(src: Path, dest: Path) -> bool:
+    """
+    Copy src to dest (with metadata), reflinking if possible.
+
+    Returns:
+        True if the data was reflinked rather than copied
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.sync")
+    reflinked = False
+    try:
+        with open(src, 'rb') as fsrc, open(tmp, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                reflinked = True
+            except OSError:
+                shutil.copyfileobj(fsrc, fdst, HASH_CHUNK)
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return reflinked
+
+
+def _load_manifest(path: Path) -> dict:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def sync_tree(src: Path, dest: Path, manifest_path: Path, verify_hash: bool = False) -> dict:
+    """
+    Make dest an exact copy of src (minus SYNC_EXCLUDE), copying only what changed.
+
+    Args:
+        src: Source directory
+        dest: Destination directory (created if missing)
+        manifest_path: Where to keep the manifest for this destination
+        verify_hash: Also compare content of files whose size and mtime match
+
+    Returns:
+        Counts of files copied / skipped / deleted, bytes copied vs skipped
+    """
+    src, dest = Path(src), Path(dest)
+    started = time.perf_counter()
+    dest.mkdir(parents=True, exist_ok=True)
+
+    old_manifest = _load_manifest(manifest_path)
+    manifest: Dict[str, list] = {}
+
+    def src_hash(rel: str, st: os.stat_result) -> str:
+        # Cached while the source's (size, mtime) is unchanged
+        cached = old_manifest.get(rel)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns and cached[2]:
+            return cached[2]
+        return file_hash(src / rel)
+
+    report = {
+        "files_copied": 0, "files_skipped": 0, "files_deleted": 0, "files_reflinked": 0,
+        "dirs_removed": 0, "bytes_copied": 0, "bytes_skipped": 0,
+    }
+
+    src_files, src_dirs, _ = _walk(src)
+    dest_files, dest_dirs, dest_excluded = _walk(dest)
+
+    # Left by the old full copytree (.git, __pycache__, ...)
+    for rel in dest_excluded:
+        _remove(dest / rel)
+        report["dirs_removed"] += 1
+
+    # Removed from the source, or now a directory there
+    for rel in dest_files.keys() - src_files.keys():
+        _remove(dest / rel)
+        report["files_deleted"] += 1
+
+    # Directories gone from the source, or now a file there; deepest first
+    for rel in sorted(dest_dirs - src_dirs, key=len, reverse=True):
+        if os.path.lexists(dest / rel):
+            _remove(dest / rel)
+            report["dirs_removed"] += 1
+
+    for rel, st in src_files.items():
+        dst = dest_files.get(rel)
+        digest: Optional[str] = None
+
+        if dst is not None and dst.st_size == st.st_size:
+            if dst.st_mtime_ns == st.st_mtime_ns and not verify_hash:
+                same = True
+            else:
+                digest = src_hash(rel, st)
+                same = digest == file_hash(dest / rel)
+                if same and dst.st_mtime_ns != st.st_mtime_ns:
+                    shutil.copystat(src / rel, dest / rel)
+        else:
+            same = False
+
+        if same:
+            report["files_skipped"] += 1
+            report["bytes_skipped"] += st.st_size
+        else:
+            if clone_file(src / rel, dest / rel):
+                report["files_reflinked"] += 1
+            report["files_copied"] += 1
+            report["bytes_copied"] += st.st_size
+
+        if digest is None:
+            cached = old_manifest.get(rel)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                digest = cached[2]
+        manifest[rel] = [st.st_size, st.st_mtime_ns, digest]
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_json(manifest_path, manifest)
+
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
+
+
+__all__ = [
+    "SYNC_EXCLUDE",
+    "clone_file",
+    "file_hash",
+    "sync_tree",
+    "walk_files",
+]
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    if len(sys.argv) != 3:
+        print("Usage: python3 sandbox_sync.py <src_dir> <dest_dir>")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / "manifest.json"
+        for label in ("first", "second"):
+            print(f"{label}: {sync_tree(Path(sys.argv[1]), Path(sys.argv[2]), manifest)}")
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Service Runtime - Shared HTTP server for the ShopTalk Automatons
+
+Drop-in replacement for HTTPServer + BaseHTTPRequestHandler:
+
+    from service_runtime import ServiceHandler, ServiceServer
+
+    class WatchmanHandler(ServiceHandler):
+        def do_GET(self): ...          # unchanged handler code
+
+    server = ServiceServer(('0.0.0.0', port), WatchmanHandler)
+    server.serve_forever()
+
+- Concurrent: one thread per connection; handler work is bounded by
+  MAX_CONCURRENT slots, waiting at most QUEUE_TIMEOUT before a 503
+- Fast path: GET /health and GET /metrics skip the slots, so a 30-second
+  /test or a slow /triage never makes a service look DOWN
+- Keep-alive: HTTP/1.1 with Content-Length filled in from the buffered
+  response, so handlers that only send Content-Type keep working
+- Timeouts: REQUEST_TIMEOUT on socket reads/writes (slow clients and idle
+  keep-alive connections are dropped)
+- Streaming: send_stream() writes chunked responses straight to the
+  socket for large bodies (e.g. diffs)
+- GET /metrics: per-route count, errors, avg/max latency
+
+5-Second Test:
+curl http://localhost:<port>/metrics
+"""
+
+import io
+import json
+import os
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+# Config
+MAX_CONCURRENT = int(os.environ.get("SHOPTALK_MAX_CONCURRENT", "8"))
+QUEUE_TIMEOUT = float(os.environ.get("SHOPTALK_QUEUE_TIMEOUT", "10"))
+REQUEST_TIMEOUT = float(os.environ.get("SHOPTALK_REQUEST_TIMEOUT", "30"))
+
+# Answered without waiting for a slot
+FAST_PATHS = {"/health", "/metrics"}
+
+
+class RouteMetrics:
+    """Thread-safe per-route request counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, dict] = {}
+        self.in_flight = 0
+
+    def record(self, route: str, status: int, elapsed_ms: float) -> None:
+        with self._lock:
+            stats = self._routes.setdefault(route, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            if status >= 500:
+                stats["errors"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "routes": {
+                    route: {
+                        "count": s["count"],
+                        "errors": s["errors"],
+                        "avg_ms": round(s["total_ms"] / s["count"], 2),
+                        "max_ms": round(s["max_ms"], 2),
+                    }
+                    for route, s in sorted(self._routes.items())
+                },
+            }
+
+
+def route_key(command: str, path: str) -> str:
+    """Metrics key: method + first path segment ("/approve/abc123" -> "GET /approve/*")."""
+    path = path.split("?", 1)[0]
+    parts = path.strip("/").split("/", 1)
+    route = "/" + parts[0]
+    if len(parts) > 1:
+        route += "/*"
+    return f"{command} {route}"
+
+
+class ServiceServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer with bounded handler concurrency and route metrics."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, max_concurrent: int = MAX_CONCURRENT,
+                 queue_timeout: float = QUEUE_TIMEOUT):
+        super().__init__(server_address, handler_class)
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.queue_timeout = queue_timeout
+        self.metrics = RouteMetrics()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    BaseHTTPRequestHandler for ServiceServer.
+
+    Subclasses implement do_GET / do_POST exactly as before; responses are
+    buffered and sent with Content-Length so connections can be reused.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = REQUEST_TIMEOUT
+
+    def handle_one_request(self):
+        # BaseHTTPRequestHandler.handle_one_request, dispatching via _dispatch
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+            if len(self.raw_requestline) > 65536:
+                self.requestline = ''
+                self.request_version = ''
+                self.command = ''
+                self.send_error(HTTPStatus.REQUEST_URI_TOO_LONG)
+                return
+            if not self.raw_requestline:
+                self.close_connection = True
+                return
+            if not self.parse_request():
+                return
+            mname = 'do_' + self.command
+            if not hasattr(self, mname):
+                self.send_error(HTTPStatus.NOT_IMPLEMENTED, "Unsupported method (%r)" % self.command)
+                return
+            self._dispatch(getattr(self, mname))
+        except TimeoutError as e:
+            self.log_error("Request timed out: %r", e)
+            self.close_connection = True
+
+    def _dispatch(self, method):
+        server = self.server
+        metrics = getattr(server, "metrics", None)
+        route = route_key(self.command, self.path)
+        fast = self.command == "GET" and self.path.split("?", 1)[0] in FAST_PATHS
+        start = time.perf_counter()
+
+        if fast and self.path.startswith("/metrics") and metrics is not None:
+            self._send_buffered_json(metrics.snapshot())
+            return
+
+        slots = getattr(server, "slots", None)
+        if slots is not None and not fast and not slots.acquire(timeout=server.queue_timeout):
+            # The request body was never read, so the connection can't be reused
+            self._send_buffered_json({"error": "Service busy, retry shortly"}, 503, close=True)
+            metrics.record(route, 503, (time.perf_counter() - start) * 1000)
+            return
+
+        real_wfile, self.wfile = self.wfile, io.BytesIO()
+        self._real_wfile, self._streamed = real_wfile, False
+        failed_stream = False
+        if metrics is not None:
+            with metrics._lock:
+                metrics.in_flight += 1
+        try:
+            method()
+        except Exception as e:
+            self.log_error("Unhandled error on %s: %r", route, e)
+            self.wfile = io.BytesIO()
+            self.close_connection = True
+            if self._streamed:
+                failed_stream = True  # Headers already sent; just drop the connection
+            else:
+                self._headers_buffer = []
+                self._send_buffered_json({"error": str(e)}, 500, close=True)
+        finally:
+            if metrics is not None:
+                with metrics._lock:
+                    metrics.in_flight -= 1
+            if slots is not None and not fast:
+                slots.release()
+            response, self.wfile = self.wfile.getvalue(), real_wfile
+
+        if failed_stream:
+            status = 500
+        elif self._streamed:
+            status = 200
+        else:
+            status = self._write_response(response)
+        if metrics is not None:
+            metrics.record(route, status, (time.perf_counter() - start) * 1000)
+
+    def send_stream(self, chunks, content_type='text/plain; charset=utf-8', status=200, chunk_size=65536):
+        """
+        Send an iterable of str/bytes with chunked transfer encoding.
+
+        Bypasses the response buffer, so memory stays flat however large
+        the body is. Call at most once per request, instead of send_response.
+        """
+        self.wfile = self._real_wfile
+        self._streamed = True
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        pending, size = [], 0
+        for chunk in chunks:
+            data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+            pending.append(data)
+            size += len(data)
+            if size >= chunk_size:
+                self._write_chunk(b"".join(pending))
+                pending, size = [], 0
+        if pending:
+            self._write_chunk(b"".join(pending))
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        self.wfile = io.BytesIO()
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def _send_buffered_json(self, data, status=200, close=False):
+        body = json.dumps(data, indent=2).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if close:
+            self.send_header('Connection', 'close')  # Also sets close_connection
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+
+    def _write_response(self, response: bytes) -> int:
+        """Send a buffered response, adding Content-Length if the handler didn't. Returns the status."""
+        if not response:
+            self.close_connection = True
+            return 500
+
+        head, sep, body = response.partition(b"\r\n\r\n")
+        if sep and b"\r\ncontent-length:" not in head.lower():
+            head += b"\r\nContent-Length: " + str(len(body)).encode()
+
+        self.wfile.write(head + sep + body)
+        self.wfile.flush()
+
+        try:
+            return int(head.split(b" ", 2)[1])
+        except (IndexError, ValueError):
+            return 500
+
+
+__all__ = [
+    "ServiceHandler",
+    "ServiceServer",
+    "RouteMetrics",
+    "route_key",
+]
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+State Store - Shared persistence for the ShopTalk Automatons
+
+Replaces "json.load the whole file, edit, json.dump the whole file" on
+every request:
+
+- StateFile: one JSON document (watchman_state.json, priority_matrix.json, ...)
+  cached in memory, written atomically (temp file + fsync + rename) and
+  updated under a lock, so concurrent handlers never lose an update and a
+  crash never leaves a half-written file
+- RecordLog: an id-numbered collection (maintenance tickets, workflow
+  proposals) stored as the usual {"tickets": [...], "next_id": N} snapshot
+  plus an append-only journal. add/update append one line (O(1)); the
+  journal is folded into the snapshot every `compact_every` entries,
+  `compact_interval` seconds after an uncompacted write, and at exit
+- SqliteRecordLog: same interface on SQLite (SHOPTALK_STATE_BACKEND=sqlite)
+
+Each file is owned by one automaton process (the one that writes it);
+locks are per process. Nothing touches the disk until a store is first
+used, so the automaton modules can be imported anywhere (helpers, tests)
+without their state directories existing. The snapshot files keep their
+existing format; the snapshot plus its journal is the source of truth, and
+anything reading the snapshot directly may lag by up to compact_interval.
+
+5-Second Test:
+python3 state_store.py
+"""
+
+import atexit
+import copy
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Journal entries between compactions
+COMPACT_EVERY = 200
+
+# Max seconds a journal entry waits before being folded into the snapshot
+COMPACT_INTERVAL = float(os.environ.get("SHOPTALK_COMPACT_INTERVAL", "60"))
+
+STATE_BACKEND = os.environ.get("SHOPTALK_STATE_BACKEND", "journal")  # journal | sqlite
+
+
+def atomic_write_json(path: Path, data: Any) -> None:
+    """Write JSON to a temp file in the same directory, fsync, then rename over path."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class StateFile:
+    """
+    A JSON document cached in memory with atomic, serialized writes.
+
+    The file is created from default on first use, not at construction.
+    """
+
+    def __init__(self, path: Path, default: Optional[dict] = None):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._data: Optional[dict] = None
+        self._stamp = None
+        self._default = default if default is not None else {}
+        self._checked = False
+
+    def _file_stamp(self):
+        try:
+            st = self.path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def _current(self) -> dict:
+        if not self._checked:
+            if not self.path.exists():
+                self.save(self._default)
+            self._checked = True
+
+        # Re-read only if the file changed behind our back (manual edit, other process)
+        stamp = self._file_stamp()
+        if self._data is None or stamp != self._stamp:
+            with open(self.path, 'r') as f:
+                self._data = json.load(f)
+            self._stamp = stamp
+        return self._data
+
+    def load(self) -> dict:
+        """Return a copy of the document."""
+        with self._lock:
+            return copy.deepcopy(self._current())
+
+    def save(self, data: dict) -> None:
+        """Replace the whole document."""
+        with self._lock:
+            atomic_write_json(self.path, data)
+            self._data = copy.deepcopy(data)
+            self._stamp = self._file_stamp()
+
+    def update(self, fn: Callable[[dict], Any]) -> Any:
+        """
+        Read-modify-write under the lock: fn mutates the document in place.
+
+        Returns whatever fn returns. Nothing is written if fn raises.
+        """
+        with self._lock:
+            data = copy.deepcopy(self._current())
+            result = fn(data)
+            self.save(data)
+            return result
+
+
+class RecordLog:
+    """
+    Id-numbered records: JSON snapshot + append-only journal.
+
+    Journal lines are {"op": "add", "record": {...}} or
+    {"op": "set", "id": N, "fields": {...}}; both are idempotent, so a crash
+    between writing a snapshot and truncating the journal is harmless.
+
+    Files are loaded (or created) on first use.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        collection: str,
+        compact_every: int = COMPACT_EVERY,
+        compact_interval: float = COMPACT_INTERVAL
+    ):
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + ".journal")
+        self.collection = collection
+        self.compact_every = compact_every
+        self.compact_interval = compact_interval
+
+        self._lock = threading.RLock()
+        self._records: Dict[int, dict] = {}
+        self._next_id = 1
+        self._journal_entries = 0
+        self._journal = None
+        self._timer: Optional[threading.Timer] = None
+
+    def _open(self) -> None:
+        if self._journal is None:
+            self._load()
+            self._journal = open(self.journal_path, 'a')
+            atexit.register(self.close)
+
+    def _load(self) -> None:
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                snapshot = json.load(f)
+            for record in snapshot.get(self.collection, []):
+                self._records[record["id"]] = record
+            self._next_id = snapshot.get("next_id", 1)
+        else:
+            atomic_write_json(self.path, {self.collection: [], "next_id": 1})
+
+        if self.journal_path.exists():
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line from a crash mid-append
+                    self._apply(entry)
+                    self._journal_entries += 1
+
+        self._next_id = max([self._next_id] + [rid + 1 for rid in self._records])
+
+    def _apply(self, entry: dict) -> None:
+        if entry.get("op") == "add":
+            record = entry["record"]
+            self._records[record["id"]] = record
+        elif entry.get("op") == "set" and entry.get("id") in self._records:
+            self._records[entry["id"]].update(entry["fields"])
+
+    def _append(self, entry: dict) -> None:
+        self._journal.write(json.dumps(entry) + "\n")
+        self._journal.flush()
+        self._journal_entries += 1
+        if self._journal_entries >= self.compact_every:
+            self.compact()
+        elif self._timer is None:
+            # Quiet logs still reach the snapshot within compact_interval
+            self._timer = threading.Timer(self.compact_interval, self.compact)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def add(self, record: dict) -> dict:
+        """Assign the next id, store the record, return it."""
+        with self._lock:
+            self._open()
+            record = dict(record, id=self._next_id)
+            self._next_id += 1
+            self._records[record["id"]] = record
+            self._append({"op": "add", "record": record})
+            return copy.deepcopy(record)
+
+    def update(self, record_id: int, fields: dict) -> Optional[dict]:
+        """Merge fields into a record; None if the id is unknown."""
+        with self._lock:
+            self._open()
+            record = self._records.get(record_id)
+            if record is None:
+                return None
+            record.update(fields)
+            self._append({"op": "set", "id": record_id, "fields": fields})
+            return copy.deepcopy(record)
+
+    def get(self, record_id: int) -> Optional[dict]:
+        with self._lock:
+            self._open()
+            record = self._records.get(record_id)
+            return copy.deepcopy(record) if record is not None else None
+
+    def all(self, where: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+        """Records in id order, optionally filtered."""
+        with self._lock:
+            self._open()
+            return [
+                copy.deepcopy(r) for _, r in sorted(self._records.items())
+                if where is None or where(r)
+            ]
+
+    def snapshot(self) -> dict:
+        """The collection in its file format: {collection: [...], "next_id": N}."""
+        with self._lock:
+            self._open()
+            return {self.collection: self.all(), "next_id": self._next_id}
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot file and truncate the journal."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._journal is None or self._journal_entries == 0:
+                return
+            atomic_write_json(self.path, self.snapshot())
+            self._journal.close()
+            self._journal = open(self.journal_path, 'w')
+            self._journal_entries = 0
+
+    def close(self) -> None:
+        """Compact and close the journal (registered with atexit on first use)."""
+        with self._lock:
+            self.compact()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+@contextmanager
+def _transaction(db: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """BEGIN/COMMIT on an autocommit connection; ROLLBACK if the block raises."""
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield db
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+
+class SqliteRecordLog:
+    """RecordLog interface on SQLite (one row per record, JSON body). Connects on first use."""
+
+    def __init__(self, path: Path, collection: str):
+        # The collection is the table name and is formatted into the SQL
+        if not _IDENTIFIER.fullmatch(collection):
+            raise ValueError(f"Invalid collection name: {collection!r}")
+        self.path = Path(path)
+        self.collection = collection
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            return self._conn
+
+    def _connect(self) -> sqlite3.Connection:
+        collection = self.collection
+        db = sqlite3.connect(str(self.path.with_suffix(".sqlite3")), check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            f"CREATE TABLE IF NOT EXISTS {collection} (id INTEGER PRIMARY KEY AUTOINCREMENT, body TEXT NOT NULL)"
+        )
+
+        # First run: import the existing JSON snapshot
+        empty = db.execute(f"SELECT COUNT(*) FROM {collection}").fetchone()[0] == 0
+        if empty and self.path.exists():
+            with open(self.path, 'r') as f:
+                records = json.load(f).get(collection, [])
+            with _transaction(db):
+                db.executemany(
+                    f"INSERT INTO {collection} (id, body) VALUES (?, ?)",
+                    [(record["id"], json.dumps(record)) for record in records]
+                )
+        return db
+
+    def add(self, record: dict) -> dict:
+        with self._lock, _transaction(self._db) as db:
+            # The id is only known after the INSERT; commit row and body together
+            cur = db.execute(f"INSERT INTO {self.collection} (body) VALUES ('{{}}')")
+            record = dict(record, id=cur.lastrowid)
+            db.execute(
+                f"UPDATE {self.collection} SET body = ? WHERE id = ?",
+                (json.dumps(record), record["id"])
+            )
+            return record
+
+    def update(self, record_id: int, fields: dict) -> Optional[dict]:
+        with self._lock:
+            record = self.get(record_id)
+            if record is None:
+                return None
+            record.update(fields)
+            self._db.execute(
+                f"UPDATE {self.collection} SET body = ? WHERE id = ?",
+                (json.dumps(record), record_id)
+            )
+            return record
+
+    def get(self, record_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT body FROM {self.collection} WHERE id = ?", (record_id,)
+            ).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def all(self, where: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+        with self._lock:
+            rows = self._db.execute(f"SELECT body FROM {self.collection} ORDER BY id").fetchall()
+        records = [json.loads(body) for (body,) in rows]
+        return [r for r in records if where is None or where(r)]
+
+    def snapshot(self) -> dict:
+        records = self.all()
+        return {self.collection: records, "next_id": (records[-1]["id"] + 1) if records else 1}
+
+    def compact(self) -> None:
+        """Write the JSON snapshot (for tools that read the file directly)."""
+        atomic_write_json(self.path, self.snapshot())
+
+
+def open_record_log(path: Path, collection: str, backend: Optional[str] = None):
+    """RecordLog or SqliteRecordLog, per SHOPTALK_STATE_BACKEND."""
+    if (backend or STATE_BACKEND) == "sqlite":
+        return SqliteRecordLog(path, collection)
+    return RecordLog(path, collection)
+
+
+if __name__ == "__main__":
+    import time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("journal", "sqlite"):
+            tickets = open_record_log(Path(tmp) / f"tickets_{backend}.json", "tickets", backend)
+
+            start = time.perf_counter()
+            threads = [
+                threading.Thread(target=lambda: [tickets.add({"title": "t"}) for _ in range(250)])
+                for _ in range(8)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+
+            ids = [t["id"] for t in tickets.all()]
+            assert ids == list(range(1, 2001)), "lost or duplicated tickets"
+            print(f"{backend}: 2000 concurrent tickets in {elapsed:.2f}s, ids 1..2000 intact")
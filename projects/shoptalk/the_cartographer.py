@@ -17,27 +17,35 @@ They only work within the sandbox. This protects production.
 curl http://localhost:8095/status
 curl http://localhost:8095/scan
 curl http://localhost:8095/map/shoptalk
+curl http://localhost:8095/compare/shoptalk
 """
 
 import os
 import ast
 import json
-import shutil
 import hashlib
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 from typing import Dict, List, Optional
 import re
 
+from state_store import StateFile, open_record_log
+from code_index import CodeIndex
+from sandbox_sync import sync_tree
+from tree_diff import DigestCache, compare_trees, iter_unified_diff
+from service_runtime import ServiceHandler, ServiceServer
+
 # Config
 SANDBOX_ROOT = Path("/root/jarvis-workspace/sandbox")
 WORKING_DIR = SANDBOX_ROOT / "working"
 PRISTINE_DIR = SANDBOX_ROOT / "pristine"
+MANIFEST_DIR = SANDBOX_ROOT / ".manifests"
 SOURCE_DIR = Path("/root/jarvis-workspace/projects")
 
 CARTOGRAPHER_STATE = Path("/root/jarvis-workspace/projects/shoptalk/cartographer_state.json")
 WORKFLOW_PROPOSALS = Path("/root/jarvis-workspace/projects/shoptalk/workflow_proposals.json")
+CODE_INDEX = Path("/root/jarvis-workspace/projects/shoptalk/cartographer_index.json")
+DIGEST_CACHE = Path("/root/jarvis-workspace/projects/shoptalk/cartographer_digests.json")
 
 # Initialize state
 def init_sandbox():
@@ -45,43 +53,49 @@ def init_sandbox():
     SANDBOX_ROOT.mkdir(parents=True, exist_ok=True)
     WORKING_DIR.mkdir(parents=True, exist_ok=True)
     PRISTINE_DIR.mkdir(parents=True, exist_ok=True)
-    
-    if not CARTOGRAPHER_STATE.exists():
-        initial_state = {
-            "initialized": datetime.now().isoformat(),
-            "last_scan": None,
-            "projects_mapped": [],
-            "total_files": 0,
-            "total_lines": 0,
-            "total_functions": 0,
-            "sandbox_synced": False
-        }
-        with open(CARTOGRAPHER_STATE, 'w') as f:
-            json.dump(initial_state, f, indent=2)
-    
-    if not WORKFLOW_PROPOSALS.exists():
-        with open(WORKFLOW_PROPOSALS, 'w') as f:
-            json.dump({"proposals": [], "next_id": 1}, f, indent=2)
 
 init_sandbox()
 
-def load_state():
-    with open(CARTOGRAPHER_STATE, 'r') as f:
-        return json.load(f)
+STATE = StateFile(CARTOGRAPHER_STATE, default={
+    "initialized": datetime.now().isoformat(),
+    "last_scan": None,
+    "projects_mapped": [],
+    "total_files": 0,
+    "total_lines": 0,
+    "total_functions": 0,
+    "sandbox_synced": False
+})
 
-def save_state(state):
-    with open(CARTOGRAPHER_STATE, 'w') as f:
-        json.dump(state, f, indent=2)
+# Append-only: each proposal writes one journal line
+PROPOSALS = open_record_log(WORKFLOW_PROPOSALS, "proposals")
 
-def sync_to_sandbox(project_name: str = None) -> dict:
+def load_state():
+    return STATE.load()
+
+def sync_to_sandbox(project_name: str = None, verify_hash: bool = False) -> dict:
     """
     Sync source code to sandbox (PRISTINE first, then WORKING).
     NEVER syncs TO GitHub. Only FROM source TO sandbox.
+
+    Incremental: only new or changed files are copied, removed files are
+    deleted, and WORKING files the Automata edited are reset to source.
     """
-    results = {"synced": [], "errors": []}
+    results = {"synced": [], "errors": [], "stats": {}, "bytes_copied": 0, "bytes_skipped": 0}
     
     projects = [project_name] if project_name else [p.name for p in SOURCE_DIR.iterdir() if p.is_dir()]
     
+    def sync(level: str, src: Path, dest: Path):
+        label = f"{level}/{src.name}"
+        try:
+            report = sync_tree(src, dest, MANIFEST_DIR / f"{level.lower()}_{src.name}.json", verify_hash)
+        except Exception as e:
+            results["errors"].append(f"{label}: {str(e)}")
+            return
+        results["synced"].append(label)
+        results["stats"][label] = report
+        results["bytes_copied"] += report["bytes_copied"]
+        results["bytes_skipped"] += report["bytes_skipped"]
+    
     for proj in projects:
         src = SOURCE_DIR / proj
         if not src.exists():
@@ -91,32 +105,21 @@ def sync_to_sandbox(project_name: str = None) -> dict:
         # Sync to PRISTINE (baseline - only if not exists)
         pristine_dest = PRISTINE_DIR / proj
         if not pristine_dest.exists():
-            try:
-                shutil.copytree(src, pristine_dest, dirs_exist_ok=True)
-                results["synced"].append(f"PRISTINE/{proj}")
-            except Exception as e:
-                results["errors"].append(f"PRISTINE/{proj}: {str(e)}")
+            sync("PRISTINE", src, pristine_dest)
         
         # Sync to WORKING (where Automata make changes)
-        working_dest = WORKING_DIR / proj
-        try:
-            if working_dest.exists():
-                shutil.rmtree(working_dest)
-            shutil.copytree(src, working_dest, dirs_exist_ok=True)
-            results["synced"].append(f"WORKING/{proj}")
-        except Exception as e:
-            results["errors"].append(f"WORKING/{proj}: {str(e)}")
+        sync("WORKING", src, WORKING_DIR / proj)
     
     # Update state
-    state = load_state()
-    state["sandbox_synced"] = True
-    state["last_sync"] = datetime.now().isoformat()
-    save_state(state)
+    def record_sync(state):
+        state["sandbox_synced"] = True
+        state["last_sync"] = datetime.now().isoformat()
+    STATE.update(record_sync)
     
     return results
 
-def analyze_python_file(filepath: Path) -> dict:
-    """Analyze a single Python file and extract structure."""
+def analyze_python_file(filepath: Path, digest: Optional[str] = None) -> dict:
+    """Analyze a single Python file and extract structure. digest: md5 the caller already computed."""
     result = {
         "file": str(filepath),
         "lines": 0,
@@ -134,10 +137,10 @@ def analyze_python_file(filepath: Path) -> dict:
     try:
         content = filepath.read_text(encoding='utf-8', errors='ignore')
         result["lines"] = len(content.splitlines())
-        result["hash"] = hashlib.md5(content.encode()).hexdigest()[:12]
+        result["hash"] = (digest or hashlib.md5(content.encode()).hexdigest())[:12]
         
         # Check for service indicators
-        result["is_service"] = "HTTPServer" in content or "BaseHTTPRequestHandler" in content
+        result["is_service"] = "HTTPServer" in content or "BaseHTTPRequestHandler" in content or "ServiceServer(" in content
         
         # Extract port
         port_match = re.search(r'port\s*=\s*(\d+)', content)
@@ -193,6 +196,9 @@ def analyze_python_file(filepath: Path) -> dict:
     
     return result
 
+# Per-file analyses, re-analyzed only when a file changes
+INDEX = CodeIndex(CODE_INDEX, analyze_python_file)
+
 def scan_project(project_name: str, use_working: bool = True) -> dict:
     """
     Scan a project in the sandbox and build a complete map.
@@ -217,11 +223,9 @@ def scan_project(project_name: str, use_working: bool = True) -> dict:
         "files": []
     }
     
-    for py_file in project_dir.rglob("*.py"):
-        if "__pycache__" in str(py_file):
-            continue
-            
-        file_analysis = analyze_python_file(py_file)
+    indexed, result["index"] = INDEX.scan(project_dir)
+    
+    for py_file, file_analysis in indexed:
         file_analysis["relative_path"] = str(py_file.relative_to(project_dir))
         
         result["files"].append(file_analysis)
@@ -238,17 +242,20 @@ def scan_project(project_name: str, use_working: bool = True) -> dict:
             })
     
     # Update state
-    state = load_state()
-    state["last_scan"] = datetime.now().isoformat()
-    if project_name not in state["projects_mapped"]:
-        state["projects_mapped"].append(project_name)
-    state["total_files"] = result["total_files"]
-    state["total_lines"] = result["total_lines"]
-    state["total_functions"] = result["total_functions"]
-    save_state(state)
+    def record_scan(state):
+        state["last_scan"] = datetime.now().isoformat()
+        if project_name not in state["projects_mapped"]:
+            state["projects_mapped"].append(project_name)
+        state["total_files"] = result["total_files"]
+        state["total_lines"] = result["total_lines"]
+        state["total_functions"] = result["total_functions"]
+    STATE.update(record_scan)
     
     return result
 
+# File digests for WORKING vs PRISTINE, re-hashed only when a file's stat changes
+DIGESTS = DigestCache(DIGEST_CACHE)
+
 def compare_working_vs_pristine(project_name: str) -> dict:
     """
     Compare WORKING copy against PRISTINE copy.
@@ -262,45 +269,28 @@ def compare_working_vs_pristine(project_name: str) -> dict:
     
     changes = {
         "project": project_name,
-        "compared_at": datetime.now().isoformat(),
-        "modified": [],
-        "added": [],
-        "deleted": [],
-        "unchanged": 0
+        "compared_at": datetime.now().isoformat()
     }
+    changes.update(compare_trees(working_dir, pristine_dir, DIGESTS))
     
-    # Get all files in both
-    working_files = {str(f.relative_to(working_dir)): f for f in working_dir.rglob("*.py") if "__pycache__" not in str(f)}
-    pristine_files = {str(f.relative_to(pristine_dir)): f for f in pristine_dir.rglob("*.py") if "__pycache__" not in str(f)}
-    
-    # Find changes
-    for rel_path, working_file in working_files.items():
-        if rel_path not in pristine_files:
-            changes["added"].append(rel_path)
-        else:
-            working_hash = hashlib.md5(working_file.read_bytes()).hexdigest()
-            pristine_hash = hashlib.md5(pristine_files[rel_path].read_bytes()).hexdigest()
-            if working_hash != pristine_hash:
-                changes["modified"].append(rel_path)
-            else:
-                changes["unchanged"] += 1
+    return changes
+
+def diff_working_vs_pristine(project_name: str, rel_path: Optional[str] = None):
+    """Unified diff lines PRISTINE -> WORKING (whole project or one file), or None if not synced."""
+    working_dir = WORKING_DIR / project_name
+    pristine_dir = PRISTINE_DIR / project_name
     
-    for rel_path in pristine_files:
-        if rel_path not in working_files:
-            changes["deleted"].append(rel_path)
+    if not working_dir.exists() or not pristine_dir.exists():
+        return None
     
-    return changes
+    return iter_unified_diff(working_dir, pristine_dir, DIGESTS, rel_path)
 
 def propose_workflow(project_name: str, file_path: str, description: str) -> dict:
     """
     Propose a file/module to be converted into a workflow.
     This feeds to Automaton 1 (Spec-Maker).
     """
-    with open(WORKFLOW_PROPOSALS, 'r') as f:
-        proposals = json.load(f)
-    
-    proposal = {
-        "id": proposals["next_id"],
+    return PROPOSALS.add({
         "project": project_name,
         "file": file_path,
         "description": description,
@@ -309,15 +299,7 @@ def propose_workflow(project_name: str, file_path: str, description: str) -> dic
         "assigned_to": "Automaton 1 (Spec-Maker)",
         "sandbox_only": True,  # NEVER touches GitHub
         "proven": False
-    }
-    
-    proposals["proposals"].append(proposal)
-    proposals["next_id"] += 1
-    
-    with open(WORKFLOW_PROPOSALS, 'w') as f:
-        json.dump(proposals, f, indent=2)
-    
-    return proposal
+    })
 
 def get_cartographer_status() -> dict:
     """Get full Cartographer status."""
@@ -343,7 +325,7 @@ def get_cartographer_status() -> dict:
         "total_functions": state.get("total_functions", 0)
     }
 
-class CartographerHandler(BaseHTTPRequestHandler):
+class CartographerHandler(ServiceHandler):
     def do_POST(self):
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length).decode('utf-8')
@@ -394,14 +376,22 @@ class CartographerHandler(BaseHTTPRequestHandler):
             result = scan_project(project)
             self.send_json(result)
             
+        elif self.path.startswith("/diff/"):
+            # /diff/{project} or /diff/{project}/{file}
+            project, _, rel_path = self.path.split("/diff/")[1].partition("/")
+            lines = diff_working_vs_pristine(project, rel_path or None)
+            if lines is None:
+                self.send_json({"error": "Both WORKING and PRISTINE copies must exist. Run /sync first."}, 404)
+            else:
+                self.send_stream(lines, 'text/x-diff; charset=utf-8')
+            
         elif self.path.startswith("/compare/"):
             project = self.path.split("/compare/")[1]
             result = compare_working_vs_pristine(project)
             self.send_json(result)
             
         elif self.path == "/proposals":
-            with open(WORKFLOW_PROPOSALS, 'r') as f:
-                self.send_json(json.load(f))
+            self.send_json(PROPOSALS.snapshot())
                 
         elif self.path == "/safety":
             # Explicit safety check
@@ -425,6 +415,7 @@ class CartographerHandler(BaseHTTPRequestHandler):
 <li>GET /scan - Scan all projects in sandbox</li>
 <li>GET /map/{project} - Map a specific project</li>
 <li>GET /compare/{project} - Compare WORKING vs PRISTINE</li>
+<li>GET /diff/{project}[/{file}] - Unified diff WORKING vs PRISTINE (streamed)</li>
 <li>GET /proposals - View workflow proposals</li>
 <li>GET /safety - Verify safety constraints</li>
 <li>POST /propose - Propose a workflow conversion</li>
@@ -454,7 +445,7 @@ if __name__ == "__main__":
     print(f"✅ Synced: {len(sync_result['synced'])} items")
     
     port = 8095
-    server = HTTPServer(('0.0.0.0', port), CartographerHandler)
+    server = ServiceServer(('0.0.0.0', port), CartographerHandler)
     print(f"🗺️ The Cartographer running on http://localhost:{port}")
     print(f"Test: curl http://localhost:{port}/status")
     server.serve_forever()
@@ -21,12 +21,16 @@ curl http://localhost:8096/next
 import os
 import json
 import hashlib
+import time
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from state_store import StateFile
+from service_runtime import ServiceHandler, ServiceServer
+
 # Config
 CONDUCTOR_STATE = Path("/root/jarvis-workspace/projects/shoptalk/conductor_state.json")
 APPROVAL_QUEUE = Path("/root/jarvis-workspace/projects/shoptalk/approval_queue.json")
@@ -65,47 +69,38 @@ DEMO_KEYWORDS = [
     "diagnostic", "alarm", "fault", "triage", "manual", "checklist"
 ]
 
-def init_files():
-    """Initialize conductor files."""
-    if not CONDUCTOR_STATE.exists():
-        state = {
-            "started": datetime.now().isoformat(),
-            "cycles_completed": 0,
-            "workflows_approved": 0,
-            "workflows_rejected": 0,
-            "current_priority": None,
-            "auto_mode": False  # Human approval required until Mike trusts the system
-        }
-        with open(CONDUCTOR_STATE, 'w') as f:
-            json.dump(state, f, indent=2)
-    
-    if not APPROVAL_QUEUE.exists():
-        with open(APPROVAL_QUEUE, 'w') as f:
-            json.dump({"pending": [], "approved": [], "rejected": []}, f, indent=2)
-    
-    if not PRIORITY_MATRIX.exists():
-        with open(PRIORITY_MATRIX, 'w') as f:
-            json.dump({"items": [], "last_calculated": None}, f, indent=2)
-
-init_files()
+# Matrix build: concurrent /map fetches, retried with backoff
+MAP_WORKERS = 4
+MAP_RETRIES = 2
+RETRY_BACKOFF = 1.0  # seconds, doubled per attempt
 
-def load_state():
-    with open(CONDUCTOR_STATE, 'r') as f:
-        return json.load(f)
+# Changes whenever the scoring rules do, invalidating cached scores
+SCORING_VERSION = hashlib.md5(
+    json.dumps([PRIORITY_WEIGHTS, HIGH_PRIORITY_KEYWORDS, DEMO_KEYWORDS]).encode()
+).hexdigest()[:12]
 
-def save_state(state):
-    with open(CONDUCTOR_STATE, 'w') as f:
-        json.dump(state, f, indent=2)
+# Conductor files (created on first use; atomic writes; read-modify-write via .update)
+STATE = StateFile(CONDUCTOR_STATE, default={
+    "started": datetime.now().isoformat(),
+    "cycles_completed": 0,
+    "workflows_approved": 0,
+    "workflows_rejected": 0,
+    "current_priority": None,
+    "auto_mode": False  # Human approval required until Mike trusts the system
+})
+QUEUE = StateFile(APPROVAL_QUEUE, default={"pending": [], "approved": [], "rejected": []})
+MATRIX = StateFile(PRIORITY_MATRIX, default={"items": [], "last_calculated": None})
+
+def load_state():
+    return STATE.load()
 
 def load_queue():
-    with open(APPROVAL_QUEUE, 'r') as f:
-        return json.load(f)
+    return QUEUE.load()
 
-def save_queue(queue):
-    with open(APPROVAL_QUEUE, 'w') as f:
-        json.dump(queue, f, indent=2)
+def load_matrix():
+    return MATRIX.load()
 
-def call_service(service: str, path: str, data: dict = None) -> dict:
+def call_service(service: str, path: str, data: dict = None, timeout: float = 30) -> dict:
     """Call an Automaton service."""
     try:
         url = f"{SERVICES[service]}{path}"
@@ -117,7 +112,7 @@ def call_service(service: str, path: str, data: dict = None) -> dict:
             )
         else:
             req = urllib.request.Request(url)
-        resp = urllib.request.urlopen(req, timeout=30)
+        resp = urllib.request.urlopen(req, timeout=timeout)
         return json.loads(resp.read().decode())
     except Exception as e:
         return {"error": str(e)}
@@ -155,19 +150,60 @@ def calculate_priority_score(file_info: dict) -> int:
     
     return score
 
+def call_service_with_retry(service: str, path: str, retries: int = MAP_RETRIES) -> dict:
+    """call_service, retrying errors with exponential backoff."""
+    result = call_service(service, path)
+    for attempt in range(retries):
+        if "error" not in result:
+            break
+        time.sleep(RETRY_BACKOFF * (2 ** attempt))
+        result = call_service(service, path)
+    return result
+
+def fetch_project_maps(projects: List[str]) -> Dict[str, dict]:
+    """Fetch /map/{project} for every project concurrently (bounded pool)."""
+    if not projects:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(MAP_WORKERS, len(projects))) as pool:
+        maps = pool.map(lambda p: call_service_with_retry("cartographer", f"/map/{p}"), projects)
+        return dict(zip(projects, maps))
+
 def build_priority_matrix() -> dict:
-    """Scan all projects and build priority matrix."""
-    matrix = {"items": [], "last_calculated": datetime.now().isoformat()}
+    """
+    Scan all projects and build priority matrix.
+
+    Incremental: a file whose Cartographer hash is unchanged keeps its
+    cached score (a changed file is rescored), and every item keeps its
+    pending/approved status.
+    Projects whose map could not be fetched keep their previous items.
+    """
+    previous = load_matrix()
+    if previous.get("scoring_version") != SCORING_VERSION:
+        previous["scores"] = {}
+    old_scores = previous.get("scores", {})
     
     # Get all mapped projects from Cartographer
     scan_result = call_service("cartographer", "/scan")
     if "error" in scan_result:
         return {"error": scan_result["error"]}
     
-    for project in scan_result.get("projects", []):
-        # Get detailed map of project
-        project_map = call_service("cartographer", f"/map/{project}")
+    projects = scan_result.get("projects", [])
+    started = time.time()
+    project_maps = fetch_project_maps(projects)
+    fetch_seconds = round(time.time() - started, 2)
+    
+    items = []
+    scores = {}
+    errors = {}
+    rescored = 0
+    
+    for project in projects:
+        project_map = project_maps[project]
         if "error" in project_map:
+            errors[project] = project_map["error"]
+            # Keep what we knew about this project
+            items.extend(i for i in previous.get("items", []) if i.get("project") == project)
+            scores.update({k: v for k, v in old_scores.items() if k.startswith(f"{project}/")})
             continue
         
         for file_info in project_map.get("files", []):
@@ -177,32 +213,55 @@ def build_priority_matrix() -> dict:
             if "test_" in file_info.get("relative_path", ""):
                 continue
             
-            score = calculate_priority_score(file_info)
+            key = f"{project}/{file_info.get('relative_path')}"
+            cached = old_scores.get(key)
+            if cached and file_info.get("hash") and cached["hash"] == file_info["hash"]:
+                score = cached["score"]
+            else:
+                score = calculate_priority_score(file_info)
+                rescored += 1
+            scores[key] = {"hash": file_info.get("hash"), "score": score}
             
             if score > 0:  # Only include items with some priority
-                matrix["items"].append({
+                items.append({
                     "project": project,
                     "file": file_info.get("relative_path"),
                     "lines": file_info.get("lines", 0),
                     "functions": len(file_info.get("functions", [])),
                     "is_service": file_info.get("is_service", False),
                     "priority_score": score,
+                    "hash": file_info.get("hash"),
                     "status": "pending"
                 })
     
     # Sort by priority score (highest first)
-    matrix["items"].sort(key=lambda x: x["priority_score"], reverse=True)
-    
-    # Save matrix
-    with open(PRIORITY_MATRIX, 'w') as f:
-        json.dump(matrix, f, indent=2)
-    
-    return matrix
+    items.sort(key=lambda x: x["priority_score"], reverse=True)
+    
+    def replace_items(matrix):
+        # Statuses read at write time, so an approval during the build is kept.
+        # The Automata edit the files they work on, so a changed hash alone
+        # doesn't make an approved item pending again.
+        statuses = {(i.get("project"), i.get("file")): i.get("status") for i in matrix.get("items", [])}
+        for item in items:
+            item["status"] = statuses.get((item["project"], item["file"])) or item["status"]
+        
+        matrix.update({
+            "items": items,
+            "last_calculated": datetime.now().isoformat(),
+            "scoring_version": SCORING_VERSION,
+            "scores": scores,
+            "rescored": rescored,
+            "reused": len(scores) - rescored,
+            "fetch_seconds": fetch_seconds,
+            "errors": errors
+        })
+        return dict(matrix)
+    
+    return MATRIX.update(replace_items)
 
 def get_next_priority() -> dict:
     """Get the next highest-priority item to implement."""
-    with open(PRIORITY_MATRIX, 'r') as f:
-        matrix = json.load(f)
+    matrix = load_matrix()
     
     # Find first pending item
     for item in matrix.get("items", []):
@@ -211,6 +270,17 @@ def get_next_priority() -> dict:
     
     return {"message": "No pending items. All workflows processed or matrix empty."}
 
+def get_change_summary(project: str, file: str) -> str:
+    """Size of the Automata's edits to a file (Cartographer /compare), with a diff link."""
+    result = call_service("cartographer", f"/compare/{project}", timeout=10)
+    if "error" in result:
+        return f"unavailable ({result['error']})"
+    stats = result.get("line_stats", {}).get(file)
+    if not stats:
+        return "unchanged"
+    diff_url = f"http://{VPS_IP}:8095/diff/{project}/{file}"
+    return f"+{stats['added']} / -{stats['removed']} lines (<a href=\"{diff_url}\">diff</a>)"
+
 def generate_approval_token(workflow_id: str) -> str:
     """Generate unique approval token."""
     timestamp = datetime.now().isoformat()
@@ -219,8 +289,6 @@ def generate_approval_token(workflow_id: str) -> str:
 
 def create_approval_request(workflow_data: dict) -> dict:
     """Create an approval request with a unique link for Mike."""
-    queue = load_queue()
-    
     # Generate unique token
     workflow_id = f"{workflow_data.get('project', 'unknown')}_{workflow_data.get('file', 'unknown')}"
     token = generate_approval_token(workflow_id)
@@ -240,77 +308,71 @@ def create_approval_request(workflow_data: dict) -> dict:
         "proof": workflow_data.get("proof", "No proof provided")
     }
     
-    queue["pending"].append(approval_request)
-    save_queue(queue)
+    QUEUE.update(lambda queue: queue["pending"].append(approval_request))
     
     return approval_request
 
+def _resolve_pending(token: str, status: str, fields: dict) -> Optional[dict]:
+    """Move a pending request to approved/rejected in one atomic queue update."""
+    def resolve(queue):
+        for i, req in enumerate(queue["pending"]):
+            if req["id"] == token:
+                req["status"] = status.upper()
+                req.update(fields)
+                queue[status].append(req)
+                queue["pending"].pop(i)
+                return req
+        return None
+    return QUEUE.update(resolve)
+
 def approve_workflow(token: str) -> dict:
     """Approve a workflow (human-in-the-loop verification)."""
-    queue = load_queue()
-    state = load_state()
-    
-    # Find the pending request
-    for i, req in enumerate(queue["pending"]):
-        if req["id"] == token:
-            req["status"] = "APPROVED"
-            req["approved_at"] = datetime.now().isoformat()
-            req["approved_by"] = "Mike (Master of Puppets)"
-            
-            # Move to approved
-            queue["approved"].append(req)
-            queue["pending"].pop(i)
-            save_queue(queue)
-            
-            # Update state
-            state["workflows_approved"] += 1
-            state["cycles_completed"] += 1
-            save_state(state)
-            
-            # Update priority matrix
-            with open(PRIORITY_MATRIX, 'r') as f:
-                matrix = json.load(f)
-            for item in matrix["items"]:
-                if item.get("file") == req.get("file") and item.get("project") == req.get("project"):
-                    item["status"] = "approved"
-            with open(PRIORITY_MATRIX, 'w') as f:
-                json.dump(matrix, f, indent=2)
-            
-            return {
-                "status": "APPROVED",
-                "workflow": req["workflow_id"],
-                "message": "Workflow approved! Proceeding to next priority.",
-                "next": get_next_priority()
-            }
+    req = _resolve_pending(token, "approved", {
+        "approved_at": datetime.now().isoformat(),
+        "approved_by": "Mike (Master of Puppets)"
+    })
+    if req is None:
+        return {"error": "Approval token not found"}
+    
+    # Update state
+    def count(state):
+        state["workflows_approved"] += 1
+        state["cycles_completed"] += 1
+    STATE.update(count)
+    
+    # Update priority matrix
+    def mark_approved(matrix):
+        for item in matrix["items"]:
+            if item.get("file") == req.get("file") and item.get("project") == req.get("project"):
+                item["status"] = "approved"
+    MATRIX.update(mark_approved)
     
-    return {"error": "Approval token not found"}
+    return {
+        "status": "APPROVED",
+        "workflow": req["workflow_id"],
+        "message": "Workflow approved! Proceeding to next priority.",
+        "next": get_next_priority()
+    }
 
 def reject_workflow(token: str, reason: str = "") -> dict:
     """Reject a workflow."""
-    queue = load_queue()
-    state = load_state()
+    req = _resolve_pending(token, "rejected", {
+        "rejected_at": datetime.now().isoformat(),
+        "rejection_reason": reason
+    })
+    if req is None:
+        return {"error": "Rejection token not found"}
     
-    for i, req in enumerate(queue["pending"]):
-        if req["id"] == token:
-            req["status"] = "REJECTED"
-            req["rejected_at"] = datetime.now().isoformat()
-            req["rejection_reason"] = reason
-            
-            queue["rejected"].append(req)
-            queue["pending"].pop(i)
-            save_queue(queue)
-            
-            state["workflows_rejected"] += 1
-            save_state(state)
-            
-            return {
-                "status": "REJECTED",
-                "workflow": req["workflow_id"],
-                "reason": reason,
-                "message": "Workflow rejected. Moving to next priority."
-            }
+    def count(state):
+        state["workflows_rejected"] += 1
+    STATE.update(count)
     
-    return {"error": "Rejection token not found"}
+    return {
+        "status": "REJECTED",
+        "workflow": req["workflow_id"],
+        "reason": reason,
+        "message": "Workflow rejected. Moving to next priority."
+    }
 
 def trigger_next_cycle() -> dict:
     """
@@ -344,9 +406,7 @@ def get_conductor_status() -> dict:
     """Get full Conductor status."""
     state = load_state()
     queue = load_queue()
-    
-    with open(PRIORITY_MATRIX, 'r') as f:
-        matrix = json.load(f)
+    matrix = load_matrix()
     
     pending_count = len([i for i in matrix.get("items", []) if i.get("status") == "pending"])
     
@@ -362,7 +422,7 @@ def get_conductor_status() -> dict:
         "current_priority": get_next_priority()
     }
 
-class ConductorHandler(BaseHTTPRequestHandler):
+class ConductorHandler(ServiceHandler):
     def do_POST(self):
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length).decode('utf-8')
@@ -378,7 +438,14 @@ class ConductorHandler(BaseHTTPRequestHandler):
             elif self.path == "/build-matrix":
                 # Build priority matrix
                 result = build_priority_matrix()
-                self.send_json({"items": len(result.get("items", [])), "calculated": result.get("last_calculated")})
+                self.send_json({
+                    "items": len(result.get("items", [])),
+                    "calculated": result.get("last_calculated"),
+                    "rescored": result.get("rescored", 0),
+                    "reused": result.get("reused", 0),
+                    "fetch_seconds": result.get("fetch_seconds"),
+                    "errors": result.get("errors") or result.get("error")
+                })
                 
             elif self.path == "/verified":
                 # Receive verified workflow output (trigger for next)
@@ -405,8 +472,7 @@ class ConductorHandler(BaseHTTPRequestHandler):
             self.send_json(get_next_priority())
             
         elif self.path == "/matrix":
-            with open(PRIORITY_MATRIX, 'r') as f:
-                matrix = json.load(f)
+            matrix = load_matrix()
             # Return top 10 for readability
             top_10 = matrix.get("items", [])[:10]
             self.send_json({"top_10_priorities": top_10, "total": len(matrix.get("items", []))})
@@ -447,6 +513,7 @@ class ConductorHandler(BaseHTTPRequestHandler):
                     req = r
                     break
             if req:
+                changes = get_change_summary(req.get('project'), req.get('file'))
                 self.send_html(f"""
 <html><body style="font-family: Arial; padding: 40px;">
 <h1>📋 WORKFLOW APPROVAL REQUEST</h1>
@@ -456,6 +523,7 @@ class ConductorHandler(BaseHTTPRequestHandler):
 <tr><td><b>Priority Score</b></td><td>{req.get('priority_score')}</td></tr>
 <tr><td><b>Created</b></td><td>{req.get('created')}</td></tr>
 <tr><td><b>Status</b></td><td>{req.get('status')}</td></tr>
+<tr><td><b>Changes vs PRISTINE</b></td><td>{changes}</td></tr>
 </table>
 <br>
 <h2>Actions:</h2>
@@ -507,8 +575,7 @@ if __name__ == "__main__":
     # Only build matrix if it doesn't exist or is empty
     # This prevents blocking on startup
     try:
-        with open(PRIORITY_MATRIX, 'r') as f:
-            matrix = json.load(f)
+        matrix = load_matrix()
         item_count = len(matrix.get('items', []))
         if item_count > 0:
             print(f"📊 Using existing priority matrix ({item_count} items)")
@@ -518,7 +585,7 @@ if __name__ == "__main__":
         print("📊 No matrix found, will build on first /build-matrix call")
     
     port = CONDUCTOR_PORT
-    server = HTTPServer(('0.0.0.0', port), ConductorHandler)
+    server = ServiceServer(('0.0.0.0', port), ConductorHandler)
     print(f"🎼 The Conductor running on http://localhost:{port}")
     print(f"Test: curl http://localhost:{port}/status")
     server.serve_forever()
@@ -21,9 +21,11 @@ import time
 import threading
 import urllib.request
 from datetime import datetime, timedelta
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 
+from state_store import StateFile
+from service_runtime import ServiceHandler, ServiceServer
+
 # Config
 MONKEY_STATE = Path("/root/jarvis-workspace/projects/shoptalk/monkey_state.json")
 MONKEY_PORT = 8097
@@ -47,43 +49,32 @@ SERVICES = {
 HEALTH_CHECK_INTERVAL = 300  # 5 minutes
 CRANK_INTERVAL = 60  # 1 minute between crank turns
 
-def init_state():
-    if not MONKEY_STATE.exists():
-        state = {
-            "started": datetime.now().isoformat(),
-            "cranks_today": 0,
-            "tokens_used_today": 0,
-            "daily_reset": datetime.now().date().isoformat(),
-            "last_health_check": None,
-            "last_crank": None,
-            "running": True,
-            "paused": False,
-            "pause_reason": None
-        }
-        with open(MONKEY_STATE, 'w') as f:
-            json.dump(state, f, indent=2)
-
-init_state()
+STATE = StateFile(MONKEY_STATE, default={
+    "started": datetime.now().isoformat(),
+    "cranks_today": 0,
+    "tokens_used_today": 0,
+    "daily_reset": datetime.now().date().isoformat(),
+    "last_health_check": None,
+    "last_crank": None,
+    "running": True,
+    "paused": False,
+    "pause_reason": None
+})
 
 def load_state():
-    with open(MONKEY_STATE, 'r') as f:
-        return json.load(f)
-
-def save_state(state):
-    with open(MONKEY_STATE, 'w') as f:
-        json.dump(state, f, indent=2)
+    return STATE.load()
 
 def check_budget() -> dict:
     """Check if we have token budget for another crank."""
-    state = load_state()
-    
     # Reset daily if new day
     today = datetime.now().date().isoformat()
-    if state.get("daily_reset") != today:
-        state["cranks_today"] = 0
-        state["tokens_used_today"] = 0
-        state["daily_reset"] = today
-        save_state(state)
+    def reset_daily(state):
+        if state.get("daily_reset") != today:
+            state["cranks_today"] = 0
+            state["tokens_used_today"] = 0
+            state["daily_reset"] = today
+        return state
+    state = STATE.update(reset_daily)
     
     remaining = DAILY_TOKEN_BUDGET - state.get("tokens_used_today", 0)
     can_crank = remaining >= TOKENS_PER_CRANK
@@ -120,9 +111,7 @@ def run_health_check() -> dict:
     results["summary"] = f"{healthy_count}/{len(SERVICES)} services healthy"
     
     # Update state
-    state = load_state()
-    state["last_health_check"] = results["timestamp"]
-    save_state(state)
+    STATE.update(lambda state: state.update(last_health_check=results["timestamp"]))
     
     return results
 
@@ -149,11 +138,13 @@ def turn_crank() -> dict:
         resp = urllib.request.urlopen(req, timeout=30)
         result = json.loads(resp.read().decode())
         
-        # Update state
-        state["cranks_today"] = state.get("cranks_today", 0) + 1
-        state["tokens_used_today"] = state.get("tokens_used_today", 0) + TOKENS_PER_CRANK
-        state["last_crank"] = datetime.now().isoformat()
-        save_state(state)
+        # Update state (re-read: check_budget may have reset the day)
+        def record_crank(state):
+            state["cranks_today"] = state.get("cranks_today", 0) + 1
+            state["tokens_used_today"] = state.get("tokens_used_today", 0) + TOKENS_PER_CRANK
+            state["last_crank"] = datetime.now().isoformat()
+            return state
+        state = STATE.update(record_crank)
         
         return {
             "cranked": True,
@@ -167,17 +158,11 @@ def turn_crank() -> dict:
 
 def pause_monkey(reason: str = "Manual pause"):
     """Pause the monkey."""
-    state = load_state()
-    state["paused"] = True
-    state["pause_reason"] = reason
-    save_state(state)
+    STATE.update(lambda state: state.update(paused=True, pause_reason=reason))
 
 def resume_monkey():
     """Resume the monkey."""
-    state = load_state()
-    state["paused"] = False
-    state["pause_reason"] = None
-    save_state(state)
+    STATE.update(lambda state: state.update(paused=False, pause_reason=None))
 
 def get_status() -> dict:
     """Get full Monkey status."""
@@ -204,7 +189,7 @@ def get_status() -> dict:
         }
     }
 
-class MonkeyHandler(BaseHTTPRequestHandler):
+class MonkeyHandler(ServiceHandler):
     def do_POST(self):
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length).decode('utf-8')
@@ -268,7 +253,7 @@ if __name__ == "__main__":
     print(f"📊 {health['summary']}")
     
     port = MONKEY_PORT
-    server = HTTPServer(('0.0.0.0', port), MonkeyHandler)
+    server = ServiceServer(('0.0.0.0', port), MonkeyHandler)
     print(f"🐵 The Monkey running on http://localhost:{port}")
     print(f"🔧 Crank interval: {CRANK_INTERVAL}s | Health check: {HEALTH_CHECK_INTERVAL}s")
     print(f"💰 Daily budget: {DAILY_TOKEN_BUDGET} tokens")
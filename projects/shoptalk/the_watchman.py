@@ -17,6 +17,7 @@ Keeps products durable, safe, and economically sensible.
 curl http://localhost:8094/status
 curl http://localhost:8094/health-check
 curl http://localhost:8094/tickets
+curl -X POST http://localhost:8094/tokens -d '{"service": "manual_hunter", "tokens_used": 850, "tokens_saved": 240}'
 """
 
 import os
@@ -24,10 +25,12 @@ import json
 import time
 import urllib.request
 from datetime import datetime, timedelta
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 from collections import defaultdict
 
+from state_store import StateFile, open_record_log
+from service_runtime import ServiceHandler, ServiceServer
+
 # Config
 WATCHMAN_STATE = Path("/root/jarvis-workspace/projects/shoptalk/watchman_state.json")
 TICKETS_FILE = Path("/root/jarvis-workspace/projects/shoptalk/maintenance_tickets.json")
@@ -46,41 +49,26 @@ LATENCY_THRESHOLD_MS = 5000  # 5 seconds max
 ERROR_RATE_THRESHOLD = 0.1  # 10% error rate triggers alert
 HALLUCINATION_KEYWORDS = ["might be", "possibly", "i think", "maybe", "not sure", "could be"]
 
-# Initialize state
-def init_state():
-    if not WATCHMAN_STATE.exists():
-        initial_state = {
-            "started": datetime.now().isoformat(),
-            "checks_run": 0,
-            "services": {},
-            "daily_tokens": 0,
-            "daily_reset": datetime.now().date().isoformat(),
-            "alerts": []
-        }
-        with open(WATCHMAN_STATE, 'w') as f:
-            json.dump(initial_state, f, indent=2)
-    
-    if not TICKETS_FILE.exists():
-        with open(TICKETS_FILE, 'w') as f:
-            json.dump({"tickets": [], "next_id": 1}, f, indent=2)
+# State (file created on first use)
+STATE = StateFile(WATCHMAN_STATE, default={
+    "started": datetime.now().isoformat(),
+    "checks_run": 0,
+    "services": {},
+    "daily_tokens": 0,
+    "daily_tokens_saved": 0,
+    "daily_by_service": {},
+    "daily_reset": datetime.now().date().isoformat(),
+    "alerts": []
+})
 
-init_state()
+# Append-only: creating or closing a ticket writes one journal line
+TICKETS = open_record_log(TICKETS_FILE, "tickets")
 
 def load_state():
-    with open(WATCHMAN_STATE, 'r') as f:
-        return json.load(f)
-
-def save_state(state):
-    with open(WATCHMAN_STATE, 'w') as f:
-        json.dump(state, f, indent=2)
+    return STATE.load()
 
 def load_tickets():
-    with open(TICKETS_FILE, 'r') as f:
-        return json.load(f)
-
-def save_tickets(tickets_data):
-    with open(TICKETS_FILE, 'w') as f:
-        json.dump(tickets_data, f, indent=2)
+    return TICKETS.snapshot()
 
 def check_service_health(name: str, config: dict) -> dict:
     """Check a single service's health."""
@@ -137,10 +125,7 @@ def detect_hallucination_risk(text: str) -> dict:
 
 def create_ticket(title: str, severity: str, source: str, details: dict) -> dict:
     """Create a maintenance ticket."""
-    tickets_data = load_tickets()
-    
-    ticket = {
-        "id": tickets_data["next_id"],
+    return TICKETS.add({
         "title": title,
         "severity": severity,  # CRITICAL, HIGH, MEDIUM, LOW
         "source": source,  # Which automaton detected it
@@ -148,17 +133,10 @@ def create_ticket(title: str, severity: str, source: str, details: dict) -> dict
         "created": datetime.now().isoformat(),
         "details": details,
         "assigned_to": "Automaton 1 & 2"  # For spec & weaver to fix
-    }
-    
-    tickets_data["tickets"].append(ticket)
-    tickets_data["next_id"] += 1
-    save_tickets(tickets_data)
-    
-    return ticket
+    })
 
 def run_health_checks() -> dict:
     """Run health checks on all services."""
-    state = load_state()
     results = {
         "timestamp": datetime.now().isoformat(),
         "services": {},
@@ -192,37 +170,59 @@ def run_health_checks() -> dict:
             )
     
     # Update state
-    state["checks_run"] += 1
-    state["services"] = results["services"]
-    state["alerts"] = results["alerts"]
-    save_state(state)
+    def record(state):
+        state["checks_run"] += 1
+        state["services"] = results["services"]
+        state["alerts"] = results["alerts"]
+    STATE.update(record)
     
     return results
 
-def check_token_budget() -> dict:
-    """Check if we're within token budget."""
-    state = load_state()
-    
-    # Reset daily if new day
+def reset_daily(state: dict) -> dict:
+    """Zero the daily token counters on the first update of a new day."""
     today = datetime.now().date().isoformat()
     if state.get("daily_reset") != today:
         state["daily_tokens"] = 0
+        state["daily_tokens_saved"] = 0
+        state["daily_by_service"] = {}
         state["daily_reset"] = today
-        save_state(state)
+    return state
+
+def record_tokens(service: str, tokens_used: int, tokens_saved: int = 0) -> dict:
+    """Add a service's reported token usage (and tokens it avoided sending) to today's budget."""
+    def add(state):
+        reset_daily(state)
+        state["daily_tokens"] = state.get("daily_tokens", 0) + tokens_used
+        state["daily_tokens_saved"] = state.get("daily_tokens_saved", 0) + tokens_saved
+        totals = state.setdefault("daily_by_service", {}).setdefault(service, {"used": 0, "saved": 0})
+        totals["used"] += tokens_used
+        totals["saved"] += tokens_saved
+        return {
+            "daily_tokens": state["daily_tokens"],
+            "daily_tokens_saved": state["daily_tokens_saved"]
+        }
+    return STATE.update(add)
+
+def check_token_budget() -> dict:
+    """Check if we're within token budget."""
+    state = STATE.update(reset_daily)
     
-    # Try to get actual token usage from workflow tracker
+    # Workflow tracker usage plus what services reported today (POST /tokens)
+    reported_tokens = state.get("daily_tokens", 0)
     try:
         req = urllib.request.urlopen("http://localhost:8092/report", timeout=5)
         data = json.loads(req.read().decode())
-        total_tokens = data.get("total_tokens_used", 0)
+        total_tokens = data.get("total_tokens_used", 0) + reported_tokens
     except:
-        total_tokens = state.get("daily_tokens", 0)
+        total_tokens = reported_tokens
     
     budget_used = (total_tokens / TOKEN_BUDGET_DAILY) * 100
     
     result = {
         "daily_budget": TOKEN_BUDGET_DAILY,
         "tokens_used": total_tokens,
+        "tokens_saved": state.get("daily_tokens_saved", 0),
+        "by_service": state.get("daily_by_service", {}),
         "budget_used_percent": round(budget_used, 1),
         "status": "OK" if budget_used < 80 else "WARNING" if budget_used < 100 else "EXCEEDED"
     }
@@ -299,9 +299,7 @@ def test_workflow_grounding() -> dict:
 def get_watchman_status() -> dict:
     """Get full Watchman status."""
     state = load_state()
-    tickets_data = load_tickets()
-    
-    open_tickets = [t for t in tickets_data["tickets"] if t["status"] == "OPEN"]
+    open_tickets = TICKETS.all(lambda t: t["status"] == "OPEN")
     
     return {
         "watchman": "THE WATCHMAN (Automaton 4)",
@@ -309,6 +307,7 @@ def get_watchman_status() -> dict:
         "started": state.get("started"),
         "checks_run": state.get("checks_run", 0),
         "daily_budget": f"{state.get('daily_tokens', 0)}/{TOKEN_BUDGET_DAILY} tokens",
+        "daily_tokens_saved": state.get("daily_tokens_saved", 0),
         "open_tickets": len(open_tickets),
         "services_monitored": len(SERVICES),
         "thresholds": {
@@ -318,7 +317,7 @@ def get_watchman_status() -> dict:
         }
     }
 
-class WatchmanHandler(BaseHTTPRequestHandler):
+class WatchmanHandler(ServiceHandler):
     def do_POST(self):
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length).decode('utf-8')
@@ -340,14 +339,20 @@ class WatchmanHandler(BaseHTTPRequestHandler):
                 )
                 self.send_json(ticket)
                 
+            elif self.path == "/tokens":
+                result = record_tokens(
+                    service=data.get("service", "unknown"),
+                    tokens_used=int(data.get("tokens_used", 0)),
+                    tokens_saved=int(data.get("tokens_saved", 0))
+                )
+                self.send_json(result)
+                
             elif self.path == "/close-ticket":
                 ticket_id = data.get("id")
-                tickets_data = load_tickets()
-                for t in tickets_data["tickets"]:
-                    if t["id"] == ticket_id:
-                        t["status"] = "CLOSED"
-                        t["closed"] = datetime.now().isoformat()
-                save_tickets(tickets_data)
+                TICKETS.update(ticket_id, {
+                    "status": "CLOSED",
+                    "closed": datetime.now().isoformat()
+                })
                 self.send_json({"status": "closed", "id": ticket_id})
                 
             else:
@@ -374,8 +379,7 @@ class WatchmanHandler(BaseHTTPRequestHandler):
             self.send_json(test_workflow_grounding())
             
         elif self.path == "/tickets":
-            tickets_data = load_tickets()
-            open_tickets = [t for t in tickets_data["tickets"] if t["status"] == "OPEN"]
+            open_tickets = TICKETS.all(lambda t: t["status"] == "OPEN")
             self.send_json({"open": len(open_tickets), "tickets": open_tickets})
             
         elif self.path == "/all-tickets":
@@ -396,6 +400,7 @@ class WatchmanHandler(BaseHTTPRequestHandler):
 <li>GET /tickets - View open maintenance tickets</li>
 <li>POST /check-hallucination - Check text for hallucination risk</li>
 <li>POST /create-ticket - Create maintenance ticket</li>
+<li>POST /tokens - Report token usage (service, tokens_used, tokens_saved)</li>
 </ul>
             """)
     
@@ -417,7 +422,7 @@ if __name__ == "__main__":
     print(f"📊 {healthy}/{len(SERVICES)} services healthy")
     
     port = 8094
-    server = HTTPServer(('0.0.0.0', port), WatchmanHandler)
+    server = ServiceServer(('0.0.0.0', port), WatchmanHandler)
     print(f"👁️ The Watchman running on http://localhost:{port}")
     print(f"Test: curl http://localhost:{port}/status")
     server.serve_forever()
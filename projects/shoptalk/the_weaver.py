@@ -23,10 +23,12 @@ import os
 import json
 import subprocess
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 import hashlib
 
+from state_store import StateFile
+from service_runtime import ServiceHandler, ServiceServer
+
 # Config
 REPO_PATH = Path("/root/jarvis-workspace")
 WEAVER_STATE = Path("/root/jarvis-workspace/projects/shoptalk/weaver_state.json")
@@ -39,18 +41,15 @@ SERVICES = {
     "workflow_tracker": "http://localhost:8092/track"
 }
 
-# Initialize state
-if not WEAVER_STATE.exists():
-    initial_state = {
-        "last_sync": None,
-        "last_commit": None,
-        "workflow_map": {},
-        "products": [],
-        "test_results": [],
-        "sync_count": 0
-    }
-    with open(WEAVER_STATE, 'w') as f:
-        json.dump(initial_state, f, indent=2)
+# State (file created on first use)
+STATE = StateFile(WEAVER_STATE, default={
+    "last_sync": None,
+    "last_commit": None,
+    "workflow_map": {},
+    "products": [],
+    "test_results": [],
+    "sync_count": 0
+})
 
 def run_cmd(cmd: list, cwd: str = None) -> tuple:
     """Run a command and return (success, output)."""
@@ -69,16 +68,13 @@ def sync_github() -> dict:
     success, commit = run_cmd(["git", "rev-parse", "HEAD"])
     success, branch = run_cmd(["git", "branch", "--show-current"])
     
-    # Load state
-    with open(WEAVER_STATE, 'r') as f:
-        state = json.load(f)
-    
-    state["last_sync"] = datetime.now().isoformat()
-    state["last_commit"] = commit
-    state["sync_count"] += 1
-    
-    with open(WEAVER_STATE, 'w') as f:
-        json.dump(state, f, indent=2)
+    # Update state
+    def record_sync(state):
+        state["last_sync"] = datetime.now().isoformat()
+        state["last_commit"] = commit
+        state["sync_count"] += 1
+        return state
+    state = STATE.update(record_sync)
     
     return {
         "status": "synced",
@@ -97,7 +93,7 @@ def map_workflows() -> dict:
         content = py_file.read_text()
         
         # Detect if it's a workflow service
-        if "HTTPServer" in content or "BaseHTTPRequestHandler" in content:
+        if "HTTPServer" in content or "BaseHTTPRequestHandler" in content or "ServiceServer(" in content:
             # Extract port
             import re
             port_match = re.search(r'port\s*=\s*(\d+)', content)
@@ -133,11 +129,7 @@ def map_workflows() -> dict:
         }
     
     # Update state
-    with open(WEAVER_STATE, 'r') as f:
-        state = json.load(f)
-    state["workflow_map"] = workflow_map
-    with open(WEAVER_STATE, 'w') as f:
-        json.dump(state, f, indent=2)
+    STATE.update(lambda state: state.update(workflow_map=workflow_map))
     
     return workflow_map
 
@@ -281,8 +273,7 @@ def run_e2e_test(question: str, context: str = "") -> dict:
 
 def get_weaver_status() -> dict:
     """Get full Weaver status."""
-    with open(WEAVER_STATE, 'r') as f:
-        state = json.load(f)
+    state = STATE.load()
     
     # Check service health
     service_status = {}
@@ -300,7 +291,7 @@ def get_weaver_status() -> dict:
         "cron": "Hourly (Big Ben tick) + webhook on commit"
     }
 
-class WeaverHandler(BaseHTTPRequestHandler):
+class WeaverHandler(ServiceHandler):
     def do_POST(self):
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length).decode('utf-8')
@@ -345,9 +336,7 @@ class WeaverHandler(BaseHTTPRequestHandler):
             self.send_json(get_weaver_status())
             
         elif self.path == "/map":
-            with open(WEAVER_STATE, 'r') as f:
-                state = json.load(f)
-            self.send_json(state.get("workflow_map", {}))
+            self.send_json(STATE.load().get("workflow_map", {}))
             
         else:
             self.send_response(200)
@@ -382,7 +371,7 @@ if __name__ == "__main__":
     print(f"📍 Mapped {len(workflows)} workflows")
     
     port = 8093
-    server = HTTPServer(('0.0.0.0', port), WeaverHandler)
+    server = ServiceServer(('0.0.0.0', port), WeaverHandler)
     print(f"🕸️ The Weaver running on http://localhost:{port}")
     print(f"Test: curl http://localhost:{port}/status")
     server.serve_forever()
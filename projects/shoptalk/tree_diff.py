@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Tree Diff - WORKING vs PRISTINE comparison for the Cartographer
+
+- Per-file MD5 digests cached on disk keyed on (path, mtime, size): a
+  compare re-hashes only files whose stat changed
+- Line-level +/- counts for changed files, cached per (working digest,
+  pristine digest) pair, so an unchanged modification isn't re-diffed
+- Unified diff hunks on demand, as a generator (streamed by /diff)
+
+5-Second Test:
+python3 tree_diff.py /root/jarvis-workspace/sandbox/working/shoptalk /root/jarvis-workspace/sandbox/pristine/shoptalk
+"""
+
+import difflib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from code_index import python_files
+from sandbox_sync import file_hash
+from state_store import atomic_write_json
+
+# Cached line counts kept (oldest dropped first)
+MAX_LINE_STATS = 5000
+
+
+class DigestCache:
+    """File digests on disk, valid while (mtime, size) is unchanged."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._digests: Dict[str, list] = {}
+        self._line_stats: Dict[str, list] = {}
+        self._dirty = False
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                self._digests = data.get("digests", {})
+                self._line_stats = data.get("line_stats", {})
+            except ValueError:
+                pass  # Corrupt cache: rebuilt as files are hashed
+
+    def digest(self, path: Path) -> Tuple[str, bool]:
+        """
+        Content digest of path.
+
+        Returns:
+            (digest, True if it had to be computed)
+        """
+        st = path.stat()
+        key = str(path)
+        with self._lock:
+            entry = self._digests.get(key)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                return entry[2], False
+
+        digest = file_hash(path)
+        with self._lock:
+            self._digests[key] = [st.st_mtime_ns, st.st_size, digest]
+            self._dirty = True
+        return digest, True
+
+    def line_stats(
+        self,
+        working: Optional[Path],
+        pristine: Optional[Path],
+        working_digest: str = "",
+        pristine_digest: str = ""
+    ) -> List[int]:
+        """[lines added, lines removed] from pristine to working (None = file absent)."""
+        key = f"{working_digest}:{pristine_digest}"
+        with self._lock:
+            stats = self._line_stats.pop(key, None)
+            if stats is not None:
+                self._line_stats[key] = stats  # Most recently used last
+                return stats
+
+        stats = [0, 0]
+        old = read_lines(pristine) if pristine else []
+        new = read_lines(working) if working else []
+        for line in difflib.unified_diff(old, new, n=0):
+            if line.startswith("+") and not line.startswith("+++"):
+                stats[0] += 1
+            elif line.startswith("-") and not line.startswith("---"):
+                stats[1] += 1
+
+        with self._lock:
+            self._line_stats[key] = stats
+            while len(self._line_stats) > MAX_LINE_STATS:
+                del self._line_stats[next(iter(self._line_stats))]
+            self._dirty = True
+        return stats
+
+    def prune(self, root: Path, present: set) -> None:
+        """Forget digests of files under root that no longer exist."""
+        prefix = str(root).rstrip(os.sep) + os.sep
+        with self._lock:
+            gone = [k for k in self._digests if k.startswith(prefix) and k not in present]
+            for key in gone:
+                del self._digests[key]
+            self._dirty = self._dirty or bool(gone)
+
+    def save(self) -> None:
+        """Write the cache if anything changed."""
+        with self._lock:
+            if self._dirty:
+                atomic_write_json(self.path, {"digests": self._digests, "line_stats": self._line_stats})
+                self._dirty = False
+
+
+def read_lines(path: Path) -> List[str]:
+    return path.read_text(encoding='utf-8', errors='replace').splitlines(keepends=True)
+
+
+def relative_files(root: Path) -> Dict[str, Path]:
+    return {str(p.relative_to(root)): p for p in python_files(root)}
+
+
+def compare_trees(working_dir: Path, pristine_dir: Path, cache: DigestCache) -> dict:
+    """
+    Classify .py files as modified / added / deleted / unchanged, with line counts.
+
+    Returns:
+        {"modified", "added", "deleted", "unchanged", "line_stats",
+         "lines_added", "lines_removed", "files_hashed"}
+    """
+    working_files = relative_files(working_dir)
+    pristine_files = relative_files(pristine_dir)
+
+    changes = {
+        "modified": [],
+        "added": [],
+        "deleted": [],
+        "unchanged": 0,
+        "line_stats": {},
+        "lines_added": 0,
+        "lines_removed": 0,
+        "files_hashed": 0
+    }
+
+    for rel_path, working_file in sorted(working_files.items()):
+        pristine_file = pristine_files.get(rel_path)
+        if pristine_file is None:
+            working_digest, hashed = cache.digest(working_file)
+            changes["files_hashed"] += hashed
+            added, removed = cache.line_stats(working_file, None, working_digest)
+            changes["added"].append(rel_path)
+            changes["line_stats"][rel_path] = {"added": added, "removed": removed}
+            continue
+
+        working_digest, hashed_w = cache.digest(working_file)
+        pristine_digest, hashed_p = cache.digest(pristine_file)
+        changes["files_hashed"] += hashed_w + hashed_p
+
+        if working_digest == pristine_digest:
+            changes["unchanged"] += 1
+            continue
+
+        added, removed = cache.line_stats(working_file, pristine_file, working_digest, pristine_digest)
+        changes["modified"].append(rel_path)
+        changes["line_stats"][rel_path] = {"added": added, "removed": removed}
+
+    for rel_path, pristine_file in sorted(pristine_files.items()):
+        if rel_path not in working_files:
+            pristine_digest, hashed = cache.digest(pristine_file)
+            changes["files_hashed"] += hashed
+            added, removed = cache.line_stats(None, pristine_file, "", pristine_digest)
+            changes["deleted"].append(rel_path)
+            changes["line_stats"][rel_path] = {"added": added, "removed": removed}
+
+    for stats in changes["line_stats"].values():
+        changes["lines_added"] += stats["added"]
+        changes["lines_removed"] += stats["removed"]
+
+    cache.prune(working_dir, {str(p) for p in working_files.values()})
+    cache.prune(pristine_dir, {str(p) for p in pristine_files.values()})
+    cache.save()
+
+    return changes
+
+
+def iter_unified_diff(
+    working_dir: Path,
+    pristine_dir: Path,
+    cache: DigestCache,
+    rel_path: Optional[str] = None,
+    context: int = 3
+) -> Iterator[str]:
+    """
+    Unified diff lines, PRISTINE -> WORKING, one file at a time.
+
+    Only files whose digests differ are read. rel_path limits the diff to
+    one file.
+    """
+    working_files = relative_files(working_dir)
+    pristine_files = relative_files(pristine_dir)
+
+    paths = sorted(working_files.keys() | pristine_files.keys())
+    if rel_path is not None:
+        paths = [p for p in paths if p == rel_path]
+
+    for path in paths:
+        working_file = working_files.get(path)
+        pristine_file = pristine_files.get(path)
+
+        if working_file and pristine_file and cache.digest(working_file)[0] == cache.digest(pristine_file)[0]:
+            continue
+
+        old = read_lines(pristine_file) if pristine_file else []
+        new = read_lines(working_file) if working_file else []
+        for line in difflib.unified_diff(
+            old, new,
+            fromfile=f"pristine/{path}" if pristine_file else "/dev/null",
+            tofile=f"working/{path}" if working_file else "/dev/null",
+            n=context
+        ):
+            yield line if line.endswith("\n") else line + "\n\\ No newline at end of file\n"
+
+    cache.save()
+
+
+__all__ = [
+    "DigestCache",
+    "compare_trees",
+    "iter_unified_diff",
+]
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    working, pristine = Path(sys.argv[1]), Path(sys.argv[2])
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DigestCache(Path(tmp) / "digests.json")
+        for label in ("cold", "warm"):
+            result = compare_trees(working, pristine, cache)
+            print(f"{label}: hashed={result['files_hashed']} modified={len(result['modified'])} "
+                  f"+{result['lines_added']} -{result['lines_removed']}")
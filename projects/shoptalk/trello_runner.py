@@ -20,9 +20,10 @@ import os
 import json
 import time
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from trello import TrelloClient
 
+from service_runtime import ServiceHandler, ServiceServer
+
 # Trello setup
 TRELLO_API_KEY = os.environ.get('TRELLO_API_KEY')
 TRELLO_TOKEN = os.environ.get('TRELLO_TOKEN')
@@ -215,7 +216,7 @@ def run_session(hours=8):
     }
 
 
-class RunnerHandler(BaseHTTPRequestHandler):
+class RunnerHandler(ServiceHandler):
     def do_GET(self):
         if self.path == "/health":
             self.send_json({"status": "ok", "service": "Trello Runner 📋"})
@@ -284,6 +285,6 @@ if __name__ == "__main__":
     else:
         print(f"✅ Connected! Next task: {task['name']}")
     
-    server = HTTPServer(('0.0.0.0', RUNNER_PORT), RunnerHandler)
+    server = ServiceServer(('0.0.0.0', RUNNER_PORT), RunnerHandler)
     print(f"📋 Trello Runner on http://localhost:{RUNNER_PORT}")
     server.serve_forever()
@@ -21,23 +21,25 @@ import json
 import csv
 import subprocess
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 
+from state_store import StateFile
+from service_runtime import ServiceHandler, ServiceServer
+
 # Config
 WORKFLOW_LOG = Path("/root/jarvis-workspace/projects/shoptalk/workflow_registry.json")
 TOKEN_LOG = Path("/root/jarvis-workspace/projects/shoptalk/token_usage.csv")
 GITHUB_REPO = "Mikecranesync/jarvis-workspace"
 
-# Initialize files
-if not WORKFLOW_LOG.exists():
-    with open(WORKFLOW_LOG, 'w') as f:
-        json.dump({"workflows": [], "total_tokens": 0, "automaton_version": "1.0.0"}, f, indent=2)
+# State (files are created on first use)
+REGISTRY = StateFile(WORKFLOW_LOG, default={"workflows": [], "total_tokens": 0, "automaton_version": "1.0.0"})
 
-if not TOKEN_LOG.exists():
-    with open(TOKEN_LOG, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['timestamp', 'workflow_name', 'version', 'tokens_used', 'github_issue', 'github_pr', 'status'])
+def init_token_log():
+    """Create the token CSV with its header row (on first use, not at import)."""
+    if not TOKEN_LOG.exists():
+        with open(TOKEN_LOG, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp', 'workflow_name', 'version', 'tokens_used', 'github_issue', 'github_pr', 'status'])
 
 def run_git_command(cmd: list) -> str:
     """Run a git/gh command and return output."""
@@ -78,10 +80,6 @@ def track_workflow(name: str, tokens: int, version: str, description: str = "",
     """Track a new workflow in the registry."""
     timestamp = datetime.now().isoformat()
     
-    # Load existing registry
-    with open(WORKFLOW_LOG, 'r') as f:
-        registry = json.load(f)
-    
     # Check compliance
     compliance = check_constitution_compliance(name)
     
@@ -102,14 +100,13 @@ def track_workflow(name: str, tokens: int, version: str, description: str = "",
     }
     
     # Add to registry
-    registry["workflows"].append(workflow_entry)
-    registry["total_tokens"] += tokens
-    
-    # Save registry
-    with open(WORKFLOW_LOG, 'w') as f:
-        json.dump(registry, f, indent=2)
+    def add(registry):
+        registry["workflows"].append(workflow_entry)
+        registry["total_tokens"] += tokens
+    REGISTRY.update(add)
     
     # Log to CSV
+    init_token_log()
     with open(TOKEN_LOG, 'a', newline='') as f:
         writer = csv.writer(f)
         writer.writerow([timestamp, name, version, tokens, github_issue, github_pr, "TRACKED"])
@@ -118,8 +115,7 @@ def track_workflow(name: str, tokens: int, version: str, description: str = "",
 
 def get_report() -> dict:
     """Get full Automaton status report."""
-    with open(WORKFLOW_LOG, 'r') as f:
-        registry = json.load(f)
+    registry = REGISTRY.load()
     
     # Calculate stats
     total_workflows = len(registry["workflows"])
@@ -149,23 +145,21 @@ def get_report() -> dict:
 
 def mark_verified(workflow_name: str) -> dict:
     """Mark a workflow as verified by 11-year-old test."""
-    with open(WORKFLOW_LOG, 'r') as f:
-        registry = json.load(f)
-    
-    for w in registry["workflows"]:
-        if w["name"].lower() == workflow_name.lower():
-            w["eleven_yo_verified"] = True
-            w["five_second_test"] = "PASSED"
-            w["verified_at"] = datetime.now().isoformat()
-            
-            with open(WORKFLOW_LOG, 'w') as f:
-                json.dump(registry, f, indent=2)
-            
-            return {"status": "verified", "workflow": workflow_name}
+    def verify(registry):
+        for w in registry["workflows"]:
+            if w["name"].lower() == workflow_name.lower():
+                w["eleven_yo_verified"] = True
+                w["five_second_test"] = "PASSED"
+                w["verified_at"] = datetime.now().isoformat()
+                return True
+        return False
+    
+    if REGISTRY.update(verify):
+        return {"status": "verified", "workflow": workflow_name}
     
     return {"status": "not_found", "workflow": workflow_name}
 
-class TrackerHandler(BaseHTTPRequestHandler):
+class TrackerHandler(ServiceHandler):
     def do_POST(self):
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length).decode('utf-8')
@@ -220,6 +214,7 @@ class TrackerHandler(BaseHTTPRequestHandler):
             
         elif self.path == "/tokens":
             # Just token usage
+            init_token_log()
             with open(TOKEN_LOG, 'r') as f:
                 self.send_response(200)
                 self.send_header('Content-Type', 'text/plain')
@@ -248,7 +243,7 @@ if __name__ == "__main__":
         track_workflow("Alarm Triage", 10000, "1.0.0", "PLC alarm to checklist generator", "", "")
     
     port = 8092
-    server = HTTPServer(('0.0.0.0', port), TrackerHandler)
+    server = ServiceServer(('0.0.0.0', port), TrackerHandler)
     print(f"📊 Workflow Tracker running on http://localhost:{port}")
     print(f"Test: curl http://localhost:{port}/report")
     server.serve_forever()